@@ -3,7 +3,18 @@ Admin configuration for API models.
 """
 
 from django.contrib import admin
-from .models import DatasetUpload
+from django.utils.html import format_html, format_html_join
+from .models import DatasetUpload, RetentionPolicy
+
+
+def _format_bytes(value):
+    if value is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB'):
+        if abs(value) < 1024:
+            return f'{value:.0f} {unit}' if unit == 'B' else f'{value:.1f} {unit}'
+        value /= 1024
+    return f'{value:.1f} GB'
 
 
 @admin.register(DatasetUpload)
@@ -11,11 +22,63 @@ class DatasetUploadAdmin(admin.ModelAdmin):
     """
     Admin interface for DatasetUpload model.
     """
-    list_display = ['id', 'user', 'file', 'uploaded_at']
+    list_display = ['id', 'user', 'file', 'uploaded_at', 'analytics_seconds']
     list_filter = ['uploaded_at', 'user']
     search_fields = ['user__username']
-    readonly_fields = ['uploaded_at', 'summary_json']
+    readonly_fields = ['uploaded_at', 'summary_json', 'stage_breakdown']
+    exclude = ['stage_timings']
     
     def has_add_permission(self, request):
         """Prevent manual additions through admin - uploads should go through API."""
         return False
+    
+    @admin.display(description='Analytics time (s)')
+    def analytics_seconds(self, obj):
+        return obj.stage_timings.get('total_seconds', '-')
+    
+    @admin.display(description='Stage timings')
+    def stage_breakdown(self, obj):
+        """Per-stage time, memory delta and rows/bytes as a table."""
+        timings = obj.stage_timings
+        if not timings:
+            return 'Not recorded (uploaded before stage timing was added)'
+        
+        rows = format_html_join(
+            '', '<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>',
+            (
+                (
+                    entry['stage'] + (' (failed)' if entry.get('failed') else ''),
+                    f"{entry['seconds'] * 1000:.1f} ms",
+                    _format_bytes(entry['memory_delta_bytes']),
+                    '-' if entry['rows'] is None else entry['rows'],
+                    _format_bytes(entry['bytes']),
+                )
+                for entry in timings.get('stages', [])
+            )
+        )
+        memory = timings.get('memory')
+        if memory:
+            memory_line = format_html(
+                '<p>Memory: estimated {}, traced peak {}{}, budget {} &middot; {}</p>',
+                _format_bytes(memory['estimated_bytes']), _format_bytes(memory['traced_peak_bytes']),
+                ' (concurrent uploads)' if memory['concurrent'] else '',
+                _format_bytes(memory['budget_bytes']), memory['route'].replace('_', ' ')
+            )
+        else:
+            memory_line = ''
+        return format_html(
+            '<p>Engine: {} &middot; {} rows &middot; {} &middot; total {} s</p>{}'
+            '<table><thead><tr><th>Stage</th><th>Time</th><th>Memory &Delta;</th>'
+            '<th>Rows</th><th>Bytes</th></tr></thead><tbody>{}</tbody></table>',
+            timings.get('engine'), timings.get('rows'), _format_bytes(timings.get('bytes')),
+            timings.get('total_seconds'), memory_line, rows
+        )
+
+
+@admin.register(RetentionPolicy)
+class RetentionPolicyAdmin(admin.ModelAdmin):
+    """
+    Admin interface for per-user upload retention overrides.
+    """
+    list_display = ['user', 'max_uploads']
+    search_fields = ['user__username']
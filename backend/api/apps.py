@@ -3,9 +3,20 @@ Django app configuration for API module.
 """
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'Analytics API'
+    
+    def ready(self):
+        # Connect the token cache invalidation signal receivers
+        from . import authentication  # noqa: F401
+        
+        if getattr(settings, 'SQLITE_CONCURRENCY_PROFILE', False):
+            from django.db.backends.signals import connection_created
+            from .sqlite import apply_sqlite_pragmas
+            
+            connection_created.connect(apply_sqlite_pragmas, dispatch_uid='api_sqlite_pragmas')
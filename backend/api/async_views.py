@@ -0,0 +1,360 @@
+"""
+Async API Views for ASGI deployments.
+
+Async implementations of the data endpoints, used instead of the sync views
+in ``api.views`` when ``API_ASYNC_VIEWS`` is enabled and the project is
+served by an ASGI server (``uvicorn backend.asgi:application``). A request
+waiting on the database or the cache no longer holds a worker thread, so
+many slow polling clients can be served by one process.
+
+Endpoints:
+    - POST /api/upload/
+    - GET /api/summary/
+    - GET /api/distribution/
+    - GET /api/history/
+    - GET /api/dashboard/
+
+Responses, status codes, ETags and error bodies are the same as the sync
+views. Uploads compute the analytics summary on the analytics thread pool
+(``api.services.ingest``) rather than on the event loop.
+"""
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.decorators import permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .models import DatasetUpload
+from .serializers import DatasetUploadSerializer, HistorySerializer
+from .services.analytics import CSVValidationError
+from .services.ingest import aingest_dataset
+from .services.admission import AdmissionRejected, get_admission_limiter
+from .services.dataset_cache import aget_latest_dataset_snapshot, alatest_dataset_version, asnapshot_for_upload
+from .etags import snapshot_etag, history_etag, dashboard_etag
+from .pagination import HistoryKeysetPagination
+from .views import _admission_rejected_response
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose method handlers are coroutines.
+    
+    DRF 3.14 only dispatches synchronously. Here authentication, permission
+    checks and content negotiation (``initial``) run through
+    ``sync_to_async`` - token lookups may hit the cache or database - and
+    the handler is awaited on the event loop.
+    """
+    
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            
+            # OPTIONS is DRF's sync metadata handler
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_api_view(http_method_names):
+    """
+    Async counterpart of DRF's ``@api_view`` for ``async def`` views.
+    
+    Honours ``@permission_classes`` applied below it, like ``@api_view``.
+    """
+    def decorator(func):
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+        
+        allowed_methods = set(http_method_names) | {'options'}
+        attrs = {
+            'http_method_names': [method.lower() for method in allowed_methods],
+            'permission_classes': getattr(func, 'permission_classes', APIView.permission_classes),
+            '__doc__': func.__doc__,
+        }
+        attrs.update({method.lower(): handler for method in http_method_names})
+        
+        WrappedAPIView = type('WrappedAPIView', (AsyncAPIView,), attrs)
+        WrappedAPIView.__name__ = func.__name__
+        WrappedAPIView.__module__ = func.__module__
+        return WrappedAPIView.as_view()
+    
+    return decorator
+
+
+_request_data = sync_to_async(lambda request: request.data)
+
+
+# ================================
+# DATA HANDLING ENDPOINTS
+# ================================
+
+@async_api_view(['POST'])
+@permission_classes([IsAuthenticated])
+async def upload_dataset(request):
+    """
+    Upload and validate CSV dataset (async).
+    
+    Endpoint: POST /api/upload/
+    
+    The request body is parsed and the upload stored through
+    ``sync_to_async``; the summary is computed on the analytics thread
+    pool. See ``api.views.upload_dataset`` for the request format.
+    
+    Returns:
+        201: Upload successful with computed summary
+        400: Validation errors or invalid CSV format
+        429: Too many concurrent uploads (see Retry-After header)
+    """
+    try:
+        ticket = get_admission_limiter('analytics').acquire(request.user.id)
+    except AdmissionRejected as e:
+        return _admission_rejected_response(e)
+    
+    try:
+        return await _upload_dataset(request)
+    finally:
+        ticket.release()
+
+
+async def _upload_dataset(request):
+    """Validate and ingest an upload once it has been admitted."""
+    serializer = DatasetUploadSerializer(data=await _request_data(request))
+    
+    if serializer.is_valid():
+        try:
+            dataset = await aingest_dataset(request.user, serializer.validated_data['file'])
+            
+            return Response({
+                'message': 'Dataset uploaded successfully',
+                'dataset': {
+                    'id': dataset.id,
+                    'uploaded_at': dataset.uploaded_at,
+                    'summary': dataset.summary_json
+                }
+            }, status=status.HTTP_201_CREATED)
+        
+        except CSVValidationError as e:
+            return Response({
+                'error': 'CSV validation failed',
+                'details': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        except Exception as e:
+            return Response({
+                'error': 'Upload failed',
+                'details': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'error': 'Validation failed',
+        'details': serializer.errors
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@async_api_view(['GET'])
+@permission_classes([IsAuthenticated])
+async def get_summary(request):
+    """
+    Get analytics summary from the most recent dataset (async).
+    
+    Endpoint: GET /api/summary/
+    
+    Supports conditional GET (ETag / If-None-Match).
+    
+    Returns:
+        200: Summary statistics
+        304: Not modified
+        404: No datasets found
+    """
+    try:
+        latest = await aget_latest_dataset_snapshot(request.user)
+        
+        if not latest:
+            return Response({
+                'error': 'No datasets found',
+                'details': 'Please upload a dataset first'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        etag = quote_etag(snapshot_etag(latest))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        return Response(latest['summary'], status=status.HTTP_200_OK, headers={'ETag': etag})
+    
+    except Exception as e:
+        return Response({
+            'error': 'Failed to retrieve summary',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@async_api_view(['GET'])
+@permission_classes([IsAuthenticated])
+async def get_distribution(request):
+    """
+    Get equipment type distribution from the most recent dataset (async).
+    
+    Endpoint: GET /api/distribution/
+    
+    Supports conditional GET (ETag / If-None-Match).
+    
+    Returns:
+        200: Equipment type distribution
+        304: Not modified
+        404: No datasets found
+    """
+    try:
+        latest = await aget_latest_dataset_snapshot(request.user)
+        
+        if not latest:
+            return Response({
+                'error': 'No datasets found',
+                'details': 'Please upload a dataset first'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        etag = quote_etag(snapshot_etag(latest))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        return Response({
+            'distribution': latest['distribution']
+        }, status=status.HTTP_200_OK, headers={'ETag': etag})
+    
+    except Exception as e:
+        return Response({
+            'error': 'Failed to retrieve distribution',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@async_api_view(['GET'])
+@permission_classes([IsAuthenticated])
+async def get_history(request):
+    """
+    Get upload history, newest first, one page at a time (async).
+    
+    Endpoint: GET /api/history/
+    
+    Query parameters:
+        - cursor: next_cursor from the previous page (omit for the first page)
+        - page_size: Uploads per page (default HISTORY_PAGE_SIZE)
+    
+    Returns:
+        200: {history: [...], next_cursor: str or null}
+        304: Not modified
+        400: Invalid cursor or page_size
+    """
+    try:
+        paginator = HistoryKeysetPagination()
+        page = await paginator.apaginate_queryset(
+            DatasetUpload.objects
+            .filter(user=request.user)
+            .only('id', 'file', 'uploaded_at'),
+            request
+        )
+        
+        etag = quote_etag(history_etag(page, paginator.next_cursor))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = paginator.get_paginated_response(HistorySerializer(page, many=True).data)
+        response['ETag'] = etag
+        return response
+    
+    except ValidationError as e:
+        return Response({
+            'error': 'Invalid request',
+            'details': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    except Exception as e:
+        return Response({
+            'error': 'Failed to retrieve history',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@async_api_view(['GET'])
+@permission_classes([IsAuthenticated])
+async def get_dashboard(request):
+    """
+    Get summary, distribution and history in a single response (async).
+    
+    Endpoint: GET /api/dashboard/
+    
+    Same queries and ETag as ``api.views.get_dashboard``.
+    
+    Returns:
+        200: {summary, distribution, history, history_next_cursor}
+        304: Not modified
+        404: No datasets found
+    """
+    try:
+        # Read before the history, so a snapshot cached below can never
+        # outlive an upload that commits in between
+        version = await alatest_dataset_version(request.user.pk)
+        paginator = HistoryKeysetPagination()
+        history = await paginator.apaginate(
+            DatasetUpload.objects
+            .filter(user=request.user)
+            .only('id', 'file', 'uploaded_at', 'summary_hash')
+        )
+        
+        if not history:
+            return Response({
+                'error': 'No datasets found',
+                'details': 'Please upload a dataset first'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        etag = quote_etag(dashboard_etag(history, paginator.next_cursor))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        latest = await asnapshot_for_upload(request.user.pk, history[0], version)
+        if latest is None:
+            # The latest upload was deleted after the history was read
+            return Response({
+                'error': 'No datasets found',
+                'details': 'Please upload a dataset first'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'summary': latest['summary'],
+            'distribution': latest['distribution'],
+            'history': HistorySerializer(history, many=True).data,
+            'history_next_cursor': paginator.next_cursor
+        }, status=status.HTTP_200_OK, headers={'ETag': etag})
+    
+    except Exception as e:
+        return Response({
+            'error': 'Failed to retrieve dashboard',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,89 @@
+"""
+Cached Token Authentication.
+
+DRF's ``TokenAuthentication`` looks up the token and joins its user on every
+request, which for polling clients is the most frequent query the API runs.
+``CachedTokenAuthentication`` keeps the resolved user's id and flags in
+Django's cache for ``AUTH_TOKEN_CACHE_TIMEOUT`` seconds.
+
+Entries are dropped immediately when a token is deleted (logout, user
+deletion) or its user is saved (deactivation, permission changes), via the
+signal receivers below, which ``ApiConfig.ready()`` connects. Bulk
+``QuerySet.update()`` calls bypass signals; those changes take effect once
+the entry expires. Cache keys are derived from a hash of the token and
+entries hold only ``user_id``, ``is_active`` and ``is_staff``, so neither
+raw tokens nor password hashes are ever written to the cache. On a hit the
+user is rebuilt with every other field deferred; touching one (e.g.
+``username``) loads it from the database.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTH_TOKEN_CACHE_ALIAS', 'default')]
+
+
+def _cache_key(key) -> str:
+    return 'auth_token:' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+# User fields kept in the cache; everything else is deferred on a hit
+CACHED_USER_FIELDS = ('id', 'is_active', 'is_staff')
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that resolves token -> user from a TTL cache.
+    
+    Accepts the same ``Authorization: Token <key>`` header as DRF's
+    ``TokenAuthentication`` and falls back to it on a cache miss.
+    """
+    
+    def authenticate_credentials(self, key):
+        cache_key = _cache_key(key)
+        entry = _cache().get(cache_key)
+        
+        if entry is None:
+            user, token = super().authenticate_credentials(key)
+            entry = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+            _cache().set(cache_key, entry, getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 300))
+            return (user, token)
+        
+        if not entry['is_active']:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        
+        # from_db() expects the values in the model's field order
+        user_model = get_user_model()
+        field_names = [f.attname for f in user_model._meta.concrete_fields if f.attname in entry]
+        user = user_model.from_db(None, field_names, [entry[name] for name in field_names])
+        return (user, Token(key=key, user=user))
+
+
+def invalidate_token(key) -> None:
+    """Drop the cached entry for a token key."""
+    if key:
+        _cache().delete(_cache_key(key))
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='api_invalidate_deleted_token')
+def _token_deleted(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid='api_invalidate_user_tokens')
+def _user_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        invalidate_token(key)
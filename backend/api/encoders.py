@@ -0,0 +1,26 @@
+"""
+JSON encoding of analytics values.
+
+Analytics summaries are built from pandas results. ``api.services.analytics``
+converts counts and averages to Python ``int``/``float`` itself, so the
+summary has the same types everywhere it is used; as a safety net for
+NumPy scalars and arrays that are not converted, everything that encodes
+summaries understands NumPy:
+
+- ``NumpyJSONEncoder``: encoder of the ``summary_json`` column and of
+  the summary hash
+- ``api.renderers.FastJSONRenderer``: API responses (orjson, or DRF's
+  encoder, which converts NumPy values with ``tolist()``)
+"""
+
+import numpy as np
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class NumpyJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that also encodes NumPy scalars and arrays."""
+    
+    def default(self, obj):
+        if isinstance(obj, (np.generic, np.ndarray)):
+            return obj.tolist()
+        return super().default(obj)
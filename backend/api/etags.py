@@ -0,0 +1,80 @@
+"""
+ETag functions for conditional GET support.
+
+Latest-upload tags are used with Django's ``condition`` decorator; they run
+after token authentication and come from the per-user dataset cache, so
+they usually need no query at all. History and dashboard tags are computed
+by the views from the page of rows they already fetched (ids and the stored
+summary hash only - never summary_json). Either way a matching
+``If-None-Match`` is answered with 304 without decoding the summary or
+rendering anything.
+
+A function returning None (no datasets yet) disables conditional handling
+and lets the view produce its normal 404.
+"""
+
+import hashlib
+
+from .services.dataset_cache import get_latest_dataset_snapshot
+
+
+def snapshot_etag(latest):
+    """
+    ETag of a latest-dataset snapshot (see ``get_latest_dataset_snapshot``).
+    """
+    return f"{latest['id']}-{latest['summary_hash'][:16]}"
+
+
+def latest_dataset_etag(request, *args, **kwargs):
+    """
+    ETag for endpoints derived from the latest upload (summary, distribution).
+    """
+    latest = get_latest_dataset_snapshot(request.user)
+    if latest is None:
+        return None
+    return snapshot_etag(latest)
+
+
+def pdf_report_etag(request, *args, **kwargs):
+    """
+    ETag for the PDF report of the latest upload, per report variant.
+    """
+    latest = latest_dataset_etag(request)
+    if latest is None:
+        return None
+    detailed = str(request.query_params.get('detailed')).lower() in ('1', 'true', 'yes')
+    variant = 'detailed' if detailed else 'standard'
+    return f"pdf-{variant}-{latest}"
+
+
+def history_etag(page, next_cursor=None):
+    """
+    ETag for one page of the upload history, computed from fetched rows.
+    
+    Covers the ids on the page and whether more pages follow, so uploads
+    and deletions that change the page change the tag.
+    
+    Args:
+        page: Uploads on the page, newest first
+        next_cursor: Cursor of the following page, if any
+    """
+    ids = ','.join(str(dataset.pk) for dataset in page)
+    digest = hashlib.sha256(f"{ids}:{next_cursor}".encode('utf-8')).hexdigest()
+    return f"history-{digest[:16]}"
+
+
+def dashboard_etag(history, next_cursor=None):
+    """
+    ETag for the combined dashboard, computed from already-fetched rows.
+    
+    Args:
+        history: First page of the user's uploads, newest first, with id
+                 and summary_hash loaded
+        next_cursor: Cursor of the following history page, if any
+    """
+    latest = history[0]
+    ids = ','.join(str(dataset.pk) for dataset in history)
+    digest = hashlib.sha256(
+        f"{latest.summary_hash}:{ids}:{next_cursor}".encode('utf-8')
+    ).hexdigest()
+    return f"dashboard-{digest[:16]}"
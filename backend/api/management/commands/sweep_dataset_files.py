@@ -0,0 +1,69 @@
+"""
+Management command: reconcile dataset files in storage with the database.
+
+Usage:
+    python manage.py sweep_dataset_files [--grace 3600] [--batch-size 500]
+                                         [--delete-missing] [--dry-run]
+                                         [--interval 600]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.services.storage_gc import sweep_dataset_storage
+
+
+class Command(BaseCommand):
+    help = 'Delete orphaned dataset files and report uploads whose file is missing.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=None,
+            help='Keep unreferenced files younger than this many seconds '
+                 '(default: DATASET_GC_GRACE_SECONDS)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Files/rows checked per query (default: DATASET_GC_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--delete-missing', action='store_true',
+            help='Also delete uploads whose file is missing from storage'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would be reclaimed without deleting anything'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running, sweeping every N seconds (0 = sweep once)'
+        )
+    
+    def handle(self, *args, **options):
+        while True:
+            report = sweep_dataset_storage(
+                grace_seconds=options['grace'],
+                batch_size=options['batch_size'],
+                delete_missing=options['delete_missing'],
+                dry_run=options['dry_run']
+            )
+            self._print_report(report, options['dry_run'])
+            
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+    
+    def _print_report(self, report, dry_run):
+        prefix = '[dry run] ' if dry_run else ''
+        self.stdout.write(
+            f"{prefix}Scanned {report['files_scanned']} files: "
+            f"{report['orphans_deleted']} orphans reclaimed "
+            f"({report['bytes_reclaimed'] / 1024:.1f} KB), "
+            f"{report['orphans_in_grace']} within grace period"
+        )
+        if report['rows_missing_file']:
+            self.stdout.write(self.style.WARNING(
+                f"{prefix}{report['rows_missing_file']} uploads have no file in storage"
+                f" ({report['rows_deleted']} deleted)"
+            ))
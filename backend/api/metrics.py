@@ -0,0 +1,191 @@
+"""
+Request metrics in Prometheus text format.
+
+MetricsMiddleware (api.middleware) records, per URL name from ``api/urls.py``
+(e.g. ``upload``, ``summary``, ``pdf_report``) and HTTP method:
+
+- api_request_duration_seconds: latency histogram
+- api_requests_total: request count by status code
+- api_requests_in_progress: requests currently being handled
+- api_response_size_bytes: response body size histogram (as sent, i.e.
+  after compression)
+
+and, per upload analytics stage (memory_estimate, read_csv, validation,
+coercion, aggregation, chunked_scan, serialization, file_storage, database;
+see ``api.services.analytics.PipelineTimings``):
+
+- api_analytics_stage_duration_seconds: stage time histogram
+- api_analytics_stage_memory_delta_bytes: resident memory change (sum/count)
+- api_analytics_rows_total / api_analytics_bytes_total: CSV rows and bytes
+  parsed, by engine
+- api_analytics_memory_routes_total: uploads summarized in memory, chunked
+  or rejected by the memory budget
+- api_analytics_memory_estimate_ratio: traced / estimated peak memory of
+  in-memory summaries that ran alone (1.0 = exact estimate)
+
+``GET /api/metrics/`` serves them in the Prometheus text format.
+
+Multiple worker processes:
+    Set ``METRICS_MULTIPROC_DIR`` (or the ``PROMETHEUS_MULTIPROC_DIR``
+    environment variable) to a directory shared by all workers of one
+    server. Each worker writes its samples there and the metrics endpoint
+    aggregates every worker's files, whichever worker answers the scrape.
+    Empty the directory before starting the server, so counters from an
+    earlier run are not carried over.
+
+Requires prometheus_client (pip install prometheus-client); without it
+nothing is recorded and the metrics endpoint answers 503.
+"""
+
+import os
+
+from django.conf import settings
+
+
+# Must be in the environment before prometheus_client is imported
+METRICS_MULTIPROC_DIR = getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+if METRICS_MULTIPROC_DIR:
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = METRICS_MULTIPROC_DIR
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+
+# Upper bounds (seconds) of the latency buckets - reports can take a minute
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Upper bounds (bytes) of the response size buckets
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Upper bounds (seconds) of the analytics stage buckets
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets of the traced / estimated peak memory ratio
+ESTIMATE_RATIO_BUCKETS = (0.25, 0.5, 0.75, 0.9, 1.0, 1.1, 1.25, 1.5, 2.0, 4.0)
+
+# View label for requests that did not match any URL pattern
+UNMATCHED_VIEW = 'unmatched'
+
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        'api_request_duration_seconds',
+        'Time to handle a request, including streaming the response body',
+        ['view', 'method'],
+        buckets=LATENCY_BUCKETS
+    )
+    REQUESTS = prometheus_client.Counter(
+        'api_requests',
+        'Requests handled, by response status code',
+        ['view', 'method', 'status']
+    )
+    REQUESTS_IN_PROGRESS = prometheus_client.Gauge(
+        'api_requests_in_progress',
+        'Requests being handled (until the response is ready)',
+        ['view', 'method'],
+        multiprocess_mode='livesum'
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        'api_response_size_bytes',
+        'Response body size as sent',
+        ['view', 'method'],
+        buckets=SIZE_BUCKETS
+    )
+    ANALYTICS_STAGE_LATENCY = prometheus_client.Histogram(
+        'api_analytics_stage_duration_seconds',
+        'Time spent in each stage of upload analytics and storage',
+        ['stage'],
+        buckets=STAGE_BUCKETS
+    )
+    ANALYTICS_STAGE_MEMORY = prometheus_client.Summary(
+        'api_analytics_stage_memory_delta_bytes',
+        'Change in resident memory across each stage',
+        ['stage']
+    )
+    ANALYTICS_ROWS = prometheus_client.Counter(
+        'api_analytics_rows',
+        'CSV rows parsed by upload analytics',
+        ['engine']
+    )
+    ANALYTICS_BYTES = prometheus_client.Counter(
+        'api_analytics_bytes',
+        'CSV bytes parsed by upload analytics',
+        ['engine']
+    )
+    ANALYTICS_MEMORY_ROUTES = prometheus_client.Counter(
+        'api_analytics_memory_routes',
+        'Uploads by memory budget decision',
+        ['route']
+    )
+    ANALYTICS_MEMORY_ESTIMATE_RATIO = prometheus_client.Histogram(
+        'api_analytics_memory_estimate_ratio',
+        'Traced peak memory of an in-memory summary divided by its estimate',
+        buckets=ESTIMATE_RATIO_BUCKETS
+    )
+
+
+def metrics_enabled() -> bool:
+    """Whether prometheus_client is installed and metrics are recorded."""
+    return prometheus_client is not None
+
+
+def view_label(request) -> str:
+    """URL name of the matched pattern ('upload', 'summary', 'admin:index', ...)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.view_name:
+        return UNMATCHED_VIEW
+    return match.view_name
+
+
+def observe_pipeline(timings) -> None:
+    """Report an upload's PipelineTimings (no-op without prometheus_client)."""
+    if prometheus_client is None:
+        return
+    for entry in timings.stages:
+        ANALYTICS_STAGE_LATENCY.labels(entry['stage']).observe(entry['seconds'])
+        if entry['memory_delta_bytes'] is not None:
+            ANALYTICS_STAGE_MEMORY.labels(entry['stage']).observe(entry['memory_delta_bytes'])
+    if timings.rows:
+        ANALYTICS_ROWS.labels(timings.engine).inc(timings.rows)
+    if timings.bytes:
+        ANALYTICS_BYTES.labels(timings.engine).inc(timings.bytes)
+
+    memory = timings.memory
+    if memory is not None:
+        ANALYTICS_MEMORY_ROUTES.labels(memory['route']).inc()
+        if (
+            memory['route'] == 'in_memory' and memory['traced_peak_bytes'] is not None
+            and not memory['concurrent'] and memory['estimated_bytes']
+        ):
+            ANALYTICS_MEMORY_ESTIMATE_RATIO.observe(memory['traced_peak_bytes'] / memory['estimated_bytes'])
+
+
+def render_metrics():
+    """
+    Render all metrics in the Prometheus text format.
+    
+    Returns:
+        Tuple of (body bytes, content type)
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Aggregate the samples every worker wrote to the shared directory
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """
+    Drop a stopped worker's live gauges from the shared directory.
+    
+    Call from the server's worker-exit hook, e.g. in gunicorn.conf.py:
+    ``def child_exit(server, worker): mark_worker_dead(worker.pid)``.
+    """
+    if prometheus_client is not None and os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,344 @@
+"""
+HTTP middleware for the API.
+
+MetricsMiddleware records per-view request metrics (see ``api.metrics``).
+
+ProfilingMiddleware profiles single requests for staff users on demand
+(see ``api.profiling``).
+
+CompressionMiddleware compresses responses with the best encoding the client
+accepts: zstd or brotli when those libraries are installed, otherwise gzip.
+History pages, dashboards and MessagePack/JSON arrays compress several-fold,
+which matters for sites on slow links.
+
+- Responses shorter than API_COMPRESSION_MIN_BYTES are left alone (the
+  login/register responses carrying tokens stay well below it).
+- Already-compressed content (PDF reports, ZIP exports, images) is skipped.
+- Streaming responses are compressed chunk by chunk and flushed after each
+  chunk, so clients keep receiving data as it is produced.
+"""
+
+import time
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from . import metrics, profiling
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# Content types that are already compressed
+INCOMPRESSIBLE_TYPES = (
+    'application/pdf',
+    'application/zip',
+    'application/gzip',
+    'application/zstd',
+    'image/',
+    'audio/',
+    'video/',
+    'font/woff',
+)
+
+DEFAULT_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 6}
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    
+    def compress(self, data):
+        return self._compressor.compress(data)
+    
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+    
+    def compress(self, data):
+        return self._compressor.process(data)
+    
+    def flush(self):
+        return self._compressor.flush()
+    
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    
+    def compress(self, data):
+        return self._compressor.compress(data)
+    
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self):
+        return self._compressor.flush()
+
+
+def available_encodings():
+    """Encodings this server can produce, most preferred first."""
+    streams = {'zstd': zstandard, 'br': brotli, 'gzip': zlib}
+    preferred = getattr(settings, 'API_COMPRESSION_ENCODINGS', ['zstd', 'br', 'gzip'])
+    return [encoding for encoding in preferred if streams.get(encoding) is not None]
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header into {encoding: q}.
+    
+    Malformed q values count as 0 (not acceptable).
+    """
+    accepted = {}
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[encoding] = q
+    return accepted
+
+
+def negotiate_encoding(header, encodings=None):
+    """
+    Choose the encoding for a response, or None to send it uncompressed.
+    
+    The client's q values decide; ties go to the server's preference order.
+    """
+    accepted = parse_accept_encoding(header or '')
+    encodings = encodings if encodings is not None else available_encodings()
+    
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def new_stream(encoding, level=None):
+    """Start a compression stream with compress/flush/finish methods."""
+    if level is None:
+        levels = getattr(settings, 'API_COMPRESSION_LEVELS', {})
+        level = levels.get(encoding, DEFAULT_LEVELS[encoding])
+    streams = {'gzip': _GzipStream, 'br': _BrotliStream, 'zstd': _ZstdStream}
+    return streams[encoding](level)
+
+
+def compress_bytes(data, encoding, level=None):
+    """Compress a complete body in one go."""
+    stream = new_stream(encoding, level)
+    return stream.compress(data) + stream.finish()
+
+
+def _compress_chunks(chunks, encoding):
+    stream = new_stream(encoding)
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def _acompress_chunks(chunks, encoding):
+    stream = new_stream(encoding)
+    async for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def _is_incompressible(response):
+    content_type = response.get('Content-Type', '').lower()
+    return content_type.startswith(INCOMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Negotiated zstd/brotli/gzip compression of responses.
+    
+    Like Django's GZipMiddleware it adds ``Vary: Accept-Encoding`` and turns
+    strong ETags into weak ones on compressed responses; conditional GETs
+    still match because If-None-Match uses weak comparison.
+    """
+    
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or _is_incompressible(response):
+            return response
+        
+        min_bytes = getattr(settings, 'API_COMPRESSION_MIN_BYTES', 1024)
+        if not response.streaming and len(response.content) < min_bytes:
+            return response
+        
+        patch_vary_headers(response, ('Accept-Encoding',))
+        
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+        
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _acompress_chunks(response.streaming_content, encoding)
+            else:
+                response.streaming_content = _compress_chunks(response.streaming_content, encoding)
+            # The compressed size is not known until the stream ends
+            del response.headers['Content-Length']
+        else:
+            compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+        
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        
+        return response
+
+
+def _observe(labels, started_at, size):
+    metrics.REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - started_at)
+    metrics.RESPONSE_SIZE.labels(*labels).observe(size)
+
+
+def _observe_chunks(chunks, labels, started_at):
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        _observe(labels, started_at, size)
+
+
+async def _aobserve_chunks(chunks, labels, started_at):
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        _observe(labels, started_at, size)
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Per-view latency, status, in-flight and response size metrics.
+    
+    Must be first in MIDDLEWARE, so latency includes the other middleware
+    and sizes are measured after compression. Streaming responses (batch
+    report ZIPs) are observed once their body has been sent.
+    """
+    
+    def process_request(self, request):
+        request._metrics_started_at = time.perf_counter()
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if metrics.metrics_enabled():
+            labels = (metrics.view_label(request), request.method)
+            metrics.REQUESTS_IN_PROGRESS.labels(*labels).inc()
+            request._metrics_in_progress = labels
+    
+    def process_response(self, request, response):
+        started_at = getattr(request, '_metrics_started_at', None)
+        if started_at is None or not metrics.metrics_enabled():
+            return response
+        
+        in_progress = getattr(request, '_metrics_in_progress', None)
+        if in_progress is not None:
+            metrics.REQUESTS_IN_PROGRESS.labels(*in_progress).dec()
+        
+        labels = (metrics.view_label(request), request.method)
+        metrics.REQUESTS.labels(*labels, str(response.status_code)).inc()
+        
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _aobserve_chunks(response.streaming_content, labels, started_at)
+            else:
+                response.streaming_content = _observe_chunks(response.streaming_content, labels, started_at)
+        else:
+            _observe(labels, started_at, len(response.content))
+        
+        return response
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """
+    Profile one request when a staff user asks for it (see api.profiling).
+    
+    Last in MIDDLEWARE, so the profile covers the view. Requests without
+    the X-Profile header or profile query parameter are passed straight
+    through.
+    """
+    
+    def _profiled(self, request):
+        if not getattr(settings, 'PROFILING_DIR', None):
+            return None
+        return profiling.requested_profiler(request)
+    
+    def _finish(self, request, response, profiler, request_id):
+        response.headers['X-Request-ID'] = request_id
+        response.headers['X-Profile-Path'] = profiling.save_profile(profiler, request_id)
+        return response
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        
+        kind = self._profiled(request)
+        if kind is None or not profiling.is_staff_request(request):
+            return self.get_response(request)
+        
+        request_id = profiling.request_id(request)
+        profiler = profiling.new_profiler(kind)
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        return self._finish(request, response, profiler, request_id)
+    
+    async def __acall__(self, request):
+        kind = self._profiled(request)
+        if kind is None or not await sync_to_async(profiling.is_staff_request)(request):
+            return await self.get_response(request)
+        
+        request_id = profiling.request_id(request)
+        profiler = profiling.new_profiler(kind, async_mode=True)
+        profiler.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.stop()
+        return await sync_to_async(self._finish)(request, response, profiler, request_id)
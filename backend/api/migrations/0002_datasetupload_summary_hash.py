@@ -0,0 +1,33 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:28
+
+from django.db import migrations, models
+
+
+def backfill_summary_hash(apps, schema_editor):
+    from api.models import compute_summary_hash
+
+    DatasetUpload = apps.get_model("api", "DatasetUpload")
+    for dataset in DatasetUpload.objects.only("id", "summary_json").iterator():
+        DatasetUpload.objects.filter(pk=dataset.pk).update(
+            summary_hash=compute_summary_hash(dataset.summary_json)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datasetupload",
+            name="summary_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="SHA-256 of summary_json, used for ETags",
+                max_length=64,
+            ),
+        ),
+        migrations.RunPython(backfill_summary_hash, migrations.RunPython.noop),
+    ]
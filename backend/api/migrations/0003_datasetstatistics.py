@@ -0,0 +1,122 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_statistics(apps, schema_editor):
+    from api.models import summary_statistics_fields
+
+    DatasetUpload = apps.get_model("api", "DatasetUpload")
+    DatasetStatistics = apps.get_model("api", "DatasetStatistics")
+    EquipmentTypeCount = apps.get_model("api", "EquipmentTypeCount")
+
+    datasets = DatasetUpload.objects.only(
+        "id", "user_id", "uploaded_at", "summary_json"
+    )
+    for dataset in datasets.iterator():
+        fields, type_counts = summary_statistics_fields(dataset.summary_json or {})
+        statistics = DatasetStatistics.objects.create(
+            dataset_id=dataset.pk,
+            user_id=dataset.user_id,
+            uploaded_at=dataset.uploaded_at,
+            **fields
+        )
+        EquipmentTypeCount.objects.bulk_create(
+            [
+                EquipmentTypeCount(
+                    statistics=statistics, equipment_type=equipment_type, count=count
+                )
+                for equipment_type, count in type_counts
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0002_datasetupload_summary_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatasetStatistics",
+            fields=[
+                (
+                    "dataset",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="statistics",
+                        serialize=False,
+                        to="api.datasetupload",
+                    ),
+                ),
+                ("uploaded_at", models.DateTimeField()),
+                ("total_equipment", models.PositiveIntegerField(default=0)),
+                ("average_flowrate", models.FloatField(blank=True, null=True)),
+                ("average_pressure", models.FloatField(blank=True, null=True)),
+                ("average_temperature", models.FloatField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dataset_statistics",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dataset Statistics",
+                "verbose_name_plural": "Dataset Statistics",
+                "ordering": ["-uploaded_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="EquipmentTypeCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("equipment_type", models.CharField(max_length=255)),
+                ("count", models.PositiveIntegerField()),
+                (
+                    "statistics",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="type_counts",
+                        to="api.datasetstatistics",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Equipment Type Count",
+                "verbose_name_plural": "Equipment Type Counts",
+                "ordering": ["-count", "id"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="equipmenttypecount",
+            constraint=models.UniqueConstraint(
+                fields=("statistics", "equipment_type"),
+                name="api_type_count_unique_type",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="datasetstatistics",
+            index=models.Index(
+                fields=["user", "uploaded_at"], name="api_stats_user_uploaded_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0003_datasetstatistics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RetentionPolicy",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="retention_policy",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "max_uploads",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Number of uploads to keep for this user (empty = unlimited)",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Retention Policy",
+                "verbose_name_plural": "Retention Policies",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="datasetupload",
+            index=models.Index(
+                fields=["user", "uploaded_at", "id"], name="api_upload_user_history_idx"
+            ),
+        ),
+    ]
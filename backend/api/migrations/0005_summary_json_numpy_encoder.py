@@ -0,0 +1,24 @@
+# Generated by Django 4.2.9 on 2026-10-19 06:58
+
+import api.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_retentionpolicy_history_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="datasetupload",
+            name="summary_json",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                encoder=api.encoders.NumpyJSONEncoder,
+                help_text="Computed analytics summary stored as JSON",
+            ),
+        ),
+    ]
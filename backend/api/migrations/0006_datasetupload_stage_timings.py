@@ -0,0 +1,22 @@
+# Generated by Django 4.2.9 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_summary_json_numpy_encoder"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="datasetupload",
+            name="stage_timings",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Analytics pipeline stage timings recorded at upload",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.9 on 2026-10-19 08:01
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def raise_zero_limits(apps, schema_editor):
+    # A limit of 0 would prune the upload being saved; keep at least one
+    RetentionPolicy = apps.get_model("api", "RetentionPolicy")
+    RetentionPolicy.objects.filter(max_uploads=0).update(max_uploads=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_datasetupload_stage_timings"),
+    ]
+
+    operations = [
+        migrations.RunPython(raise_zero_limits, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="retentionpolicy",
+            name="max_uploads",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Number of uploads to keep for this user (empty = unlimited)",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+    ]
@@ -3,11 +3,24 @@ Database models for IIT Bombay Analytics Backend.
 
 Models:
     - DatasetUpload: Stores CSV uploads with computed analytics summary
+    - DatasetStatistics: Typed summary columns for one upload
+    - EquipmentTypeCount: Per-type equipment counts for one upload
+    - RetentionPolicy: Per-user override of the upload history limit
 """
 
-from django.db import models
+import hashlib
+import json
+import math
+from functools import partial
+
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
+
+from .encoders import NumpyJSONEncoder
+from .services.dataset_cache import invalidate_latest_dataset
+from .services.storage_gc import delete_dataset_files
 
 
 def validate_csv_file(file):
@@ -16,7 +29,7 @@ def validate_csv_file(file):
     
     Args:
         file: Uploaded file object
-        
+    
     Raises:
         ValidationError: If file is not a CSV
     """
@@ -24,18 +37,69 @@ def validate_csv_file(file):
         raise ValidationError('Only CSV files are allowed.')
 
 
+def compute_summary_hash(summary):
+    """
+    Compute a stable SHA-256 hex digest of an analytics summary.
+    
+    Used as the validator for ETags so that conditional requests can be
+    answered without loading or decoding summary_json.
+    
+    Args:
+        summary: Summary dictionary
+    
+    Returns:
+        64-character hex digest
+    """
+    encoded = json.dumps(summary, sort_keys=True, separators=(',', ':'), cls=NumpyJSONEncoder)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def summary_statistics_fields(summary):
+    """
+    Convert an analytics summary into typed DatasetStatistics values.
+    
+    Args:
+        summary: Summary dictionary as returned by compute_summary_statistics
+    
+    Returns:
+        Tuple of (field values dict, list of (equipment type, count) pairs
+        in distribution order)
+    """
+    def _average(key):
+        value = summary.get(key)
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        return float(value)
+    
+    fields = {
+        'total_equipment': int(summary.get('total_equipment') or 0),
+        'average_flowrate': _average('average_flowrate'),
+        'average_pressure': _average('average_pressure'),
+        'average_temperature': _average('average_temperature'),
+    }
+    type_counts = [
+        (str(item['type']), int(item['count']))
+        for item in summary.get('equipment_distribution', [])
+    ]
+    return fields, type_counts
+
+
 class DatasetUpload(models.Model):
     """
     Model to store CSV dataset uploads with analytics summary.
     
-    Automatically maintains only the last 5 uploads by deleting
-    the oldest record when a new one is created.
+    Automatically maintains only the last N uploads per user (the user's
+    RetentionPolicy, else MAX_DATASET_HISTORY) by bulk-deleting the oldest
+    records when a new one is created.
     
     Attributes:
         file: The uploaded CSV file
         uploaded_at: Timestamp of upload
         summary_json: JSON field containing computed analytics (equipment count,
                      averages, type distribution)
+        summary_hash: SHA-256 of summary_json, kept in sync on save
+        stage_timings: Per-stage time/memory/rows breakdown of the upload's
+                       analytics and file storage (PipelineTimings.as_dict())
         user: User who uploaded the dataset (optional for future multi-user support)
     """
     
@@ -53,9 +117,23 @@ class DatasetUpload(models.Model):
     summary_json = models.JSONField(
         default=dict,
         blank=True,
+        encoder=NumpyJSONEncoder,
         help_text='Computed analytics summary stored as JSON'
     )
     
+    summary_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text='SHA-256 of summary_json, used for ETags'
+    )
+    
+    stage_timings = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Analytics pipeline stage timings recorded at upload'
+    )
+    
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -67,6 +145,10 @@ class DatasetUpload(models.Model):
     
     class Meta:
         ordering = ['-uploaded_at']  # Most recent first
+        indexes = [
+            # Keyset pagination and retention walk (user, uploaded_at, id)
+            models.Index(fields=['user', 'uploaded_at', 'id'], name='api_upload_user_history_idx'),
+        ]
         verbose_name = 'Dataset Upload'
         verbose_name_plural = 'Dataset Uploads'
     
@@ -75,39 +157,268 @@ class DatasetUpload(models.Model):
     
     def save(self, *args, **kwargs):
         """
-        Override save to enforce 5-upload limit.
+        Save the upload and enforce the per-user history limit.
         
-        Before saving a new upload, checks if 5 records already exist.
-        If so, deletes the oldest one to maintain the limit.
+        Runs in one transaction: a single INSERT/UPDATE, the typed
+        statistics rows, then (for new uploads) one bulk delete of anything
+        beyond the user's history limit.
+        Removing pruned files from storage and invalidating the cached
+        latest dataset are deferred until the transaction commits (files
+        are left to the sweeper if DATASET_FILE_DELETION is 'sweeper').
         """
-        # Check if we need to delete old uploads (keep only last 5)
-        max_uploads = getattr(settings, 'MAX_DATASET_HISTORY', 5)
+        adding = self._state.adding
+        
+        # Keep the ETag validator in sync with the stored summary
+        self.summary_hash = compute_summary_hash(self.summary_json)
         
-        # Only enforce limit for new records (not updates)
-        if not self.pk:
-            # Count existing uploads for this user
-            existing_count = DatasetUpload.objects.filter(
-                user=self.user
-            ).count()
-            
-            if existing_count >= max_uploads:
-                # Delete the oldest upload(s) to make room
-                uploads_to_delete = DatasetUpload.objects.filter(
-                    user=self.user
-                ).order_by('uploaded_at')[:(existing_count - max_uploads + 1)]
-                
-                for upload in uploads_to_delete:
-                    # Delete the file from storage
-                    if upload.file:
-                        upload.file.delete(save=False)
-                    upload.delete()
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+            DatasetStatistics.store(self, created=adding, using=kwargs.get('using'))
+            if adding:
+                self.prune_history(self.user_id, using=kwargs.get('using'))
         
-        super().save(*args, **kwargs)
+        # The user's latest dataset (and its summary) may have changed. Move
+        # to a new snapshot version now and again on commit, so a concurrent
+        # request that re-cached the pre-commit state did so under a version
+        # nobody reads any more.
+        invalidate_latest_dataset(self.user_id)
+        transaction.on_commit(partial(invalidate_latest_dataset, self.user_id))
     
     def delete(self, *args, **kwargs):
         """
-        Override delete to also remove the file from storage.
+        Override delete to also remove the file from storage once committed
+        (or leave it to the sweeper, see DATASET_FILE_DELETION).
+        """
+        name = self.file.name if self.file else None
+        result = super().delete(*args, **kwargs)
+        if name:
+            transaction.on_commit(partial(delete_dataset_files, self.file.storage, [name]))
+        invalidate_latest_dataset(self.user_id)
+        transaction.on_commit(partial(invalidate_latest_dataset, self.user_id))
+        return result
+    
+    @classmethod
+    def prune_history(cls, user_id, keep=None, using=None):
+        """
+        Delete a user's uploads beyond the newest ``keep`` in bulk.
+        
+        Must run inside a transaction. On backends with row locks the
+        user's row is locked first, so concurrent uploads by the same user
+        cannot leave more than ``keep`` uploads behind (SQLite already
+        serializes writers).
+        
+        Args:
+            user_id: Owner of the uploads (None for anonymous uploads)
+            keep: Number of uploads to keep (default: the user's
+                  RetentionPolicy, else MAX_DATASET_HISTORY); values
+                  below 1 are treated as 1, so the upload being saved is
+                  never pruned
+            using: Database alias
+        
+        Returns:
+            Number of uploads deleted
+        """
+        if keep is None:
+            keep = RetentionPolicy.history_limit(user_id, using=using)
+            if keep is None:
+                return 0  # Unlimited history
+        keep = max(keep, 1)
+        manager = cls.objects.db_manager(using)
+        
+        if user_id is not None and transaction.get_connection(manager.db).features.has_select_for_update:
+            users = cls._meta.get_field('user').related_model._default_manager.db_manager(using)
+            list(users.select_for_update().filter(pk=user_id).values_list('pk'))
+        
+        stale = list(
+            manager.filter(user_id=user_id)
+            .order_by('-uploaded_at', '-id')
+            .values_list('pk', 'file')[keep:]
+        )
+        if not stale:
+            return 0
+        
+        # Cascades to the statistics rows; only('pk') keeps the deletion
+        # collector from loading summary_json for the rows it removes
+        manager.filter(pk__in=[pk for pk, _ in stale]).only('pk').delete()
+        
+        names = [name for _, name in stale if name]
+        storage = cls._meta.get_field('file').storage
+        transaction.on_commit(partial(delete_dataset_files, storage, names), using=manager.db)
+        return len(stale)
+
+
+class DatasetStatistics(models.Model):
+    """
+    Typed analytics summary for one dataset upload.
+    
+    Written in the same transaction as the upload and removed with it, so
+    read endpoints and cross-upload queries can filter, sort and aggregate
+    in SQL instead of decoding summary_json.
+    
+    Attributes:
+        dataset: The upload these statistics describe (also the primary key)
+        user: Owner of the upload (copied for indexed per-user queries)
+        uploaded_at: Upload timestamp (copied for indexed ordering)
+        total_equipment: Number of equipment rows
+        average_flowrate / average_pressure / average_temperature: Column
+            means (null when a column has no numeric values)
+    """
+    
+    dataset = models.OneToOneField(
+        DatasetUpload,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics'
+    )
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='dataset_statistics',
+        null=True,
+        blank=True
+    )
+    
+    uploaded_at = models.DateTimeField()
+    
+    total_equipment = models.PositiveIntegerField(default=0)
+    average_flowrate = models.FloatField(null=True, blank=True)
+    average_pressure = models.FloatField(null=True, blank=True)
+    average_temperature = models.FloatField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['user', 'uploaded_at'], name='api_stats_user_uploaded_idx'),
+        ]
+        verbose_name = 'Dataset Statistics'
+        verbose_name_plural = 'Dataset Statistics'
+    
+    def __str__(self):
+        return f"Statistics for dataset {self.dataset_id}"
+    
+    @classmethod
+    def store(cls, dataset, created=True, using=None):
+        """
+        Write the typed statistics for a dataset from its summary_json.
+        
+        New uploads cost two INSERTs (statistics and all type counts in one
+        bulk insert); updates replace the existing rows.
+        """
+        fields, type_counts = summary_statistics_fields(dataset.summary_json or {})
+        manager = cls.objects.db_manager(using)
+        
+        if created:
+            statistics = manager.create(
+                dataset=dataset,
+                user_id=dataset.user_id,
+                uploaded_at=dataset.uploaded_at,
+                **fields
+            )
+        else:
+            statistics, _ = manager.update_or_create(
+                dataset=dataset,
+                defaults={'user_id': dataset.user_id, 'uploaded_at': dataset.uploaded_at, **fields}
+            )
+            statistics.type_counts.all().delete()
+        
+        EquipmentTypeCount.objects.db_manager(using).bulk_create([
+            EquipmentTypeCount(statistics=statistics, equipment_type=equipment_type, count=count)
+            for equipment_type, count in type_counts
+        ])
+        return statistics
+    
+    def as_summary(self):
+        """
+        Return the statistics in the shape of compute_summary_statistics().
+        
+        Uses prefetched type_counts when available.
+        """
+        return {
+            'total_equipment': self.total_equipment,
+            'average_flowrate': self.average_flowrate,
+            'average_pressure': self.average_pressure,
+            'average_temperature': self.average_temperature,
+            'equipment_distribution': [
+                {'type': type_count.equipment_type, 'count': type_count.count}
+                for type_count in self.type_counts.all()
+            ]
+        }
+
+
+class EquipmentTypeCount(models.Model):
+    """
+    Number of equipment rows of one type in a dataset upload.
+    """
+    
+    statistics = models.ForeignKey(
+        DatasetStatistics,
+        on_delete=models.CASCADE,
+        related_name='type_counts'
+    )
+    
+    equipment_type = models.CharField(max_length=255)
+    count = models.PositiveIntegerField()
+    
+    class Meta:
+        # Insertion order keeps the distribution order among equal counts
+        ordering = ['-count', 'id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['statistics', 'equipment_type'],
+                name='api_type_count_unique_type'
+            ),
+        ]
+        verbose_name = 'Equipment Type Count'
+        verbose_name_plural = 'Equipment Type Counts'
+    
+    def __str__(self):
+        return f"{self.equipment_type}: {self.count}"
+
+
+class RetentionPolicy(models.Model):
+    """
+    Per-user override of how many uploads are kept.
+    
+    Users without a policy get the deployment default, MAX_DATASET_HISTORY
+    (None there means unlimited).
+    
+    Attributes:
+        user: The user the policy applies to
+        max_uploads: Uploads to keep; empty means unlimited
+    """
+    
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='retention_policy'
+    )
+    
+    max_uploads = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(1)],
+        help_text='Number of uploads to keep for this user (empty = unlimited)'
+    )
+    
+    class Meta:
+        verbose_name = 'Retention Policy'
+        verbose_name_plural = 'Retention Policies'
+    
+    def __str__(self):
+        limit = self.max_uploads if self.max_uploads is not None else 'unlimited'
+        return f"Keep {limit} uploads for {self.user}"
+    
+    @classmethod
+    def history_limit(cls, user_id, using=None):
+        """
+        Return how many uploads to keep for a user, or None for unlimited.
         """
-        if self.file:
-            self.file.delete(save=False)
-        super().delete(*args, **kwargs)
+        default = getattr(settings, 'MAX_DATASET_HISTORY', 5)
+        if user_id is None:
+            return default
+        limits = list(
+            cls.objects.db_manager(using).filter(user_id=user_id).values_list('max_uploads', flat=True)
+        )
+        return limits[0] if limits else default
@@ -0,0 +1,124 @@
+"""
+Keyset (cursor) pagination for upload history.
+
+Pages are taken newest first on (uploaded_at, id), which the
+``api_upload_user_history_idx`` index on (user, uploaded_at, id) serves
+directly, so fetching any page costs the same no matter how deep into the
+history it is - unlike OFFSET pagination. The cursor is an opaque token
+encoding the (uploaded_at, id) of the last row of the previous page.
+"""
+
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class HistoryKeysetPagination(BasePagination):
+    """
+    Paginate a DatasetUpload queryset by (uploaded_at, id), newest first.
+    
+    Query parameters:
+        - cursor: ``next_cursor`` from the previous page (omit for the first)
+        - page_size: Rows per page (default HISTORY_PAGE_SIZE, capped at
+          HISTORY_MAX_PAGE_SIZE)
+    """
+    
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    
+    def __init__(self):
+        self.next_cursor = None
+    
+    @staticmethod
+    def encode_cursor(row) -> str:
+        position = f"{row.uploaded_at.isoformat()}|{row.pk}"
+        return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Decode a cursor into (uploaded_at, id).
+        
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        try:
+            uploaded_at, pk = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            return datetime.fromisoformat(uploaded_at), int(pk)
+        except (ValueError, UnicodeError):
+            raise ValidationError({'cursor': 'Invalid cursor'})
+    
+    def get_page_size(self, request) -> int:
+        default = getattr(settings, 'HISTORY_PAGE_SIZE', 50)
+        maximum = getattr(settings, 'HISTORY_MAX_PAGE_SIZE', 500)
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, default))
+        except ValueError:
+            raise ValidationError({'page_size': 'page_size must be an integer'})
+        return max(1, min(page_size, maximum))
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor = request.query_params.get(self.cursor_query_param)
+        return self.paginate(
+            queryset,
+            cursor=self.decode_cursor(cursor) if cursor else None,
+            page_size=self.get_page_size(request)
+        )
+    
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async version of ``paginate_queryset`` for async views."""
+        cursor = request.query_params.get(self.cursor_query_param)
+        return await self.apaginate(
+            queryset,
+            cursor=self.decode_cursor(cursor) if cursor else None,
+            page_size=self.get_page_size(request)
+        )
+    
+    def paginate(self, queryset, cursor=None, page_size=None):
+        """
+        Return one page of rows and set ``next_cursor``.
+        
+        Args:
+            queryset: DatasetUpload queryset (already filtered by user)
+            cursor: Decoded (uploaded_at, id) to continue after, or None
+            page_size: Rows per page (default HISTORY_PAGE_SIZE)
+        """
+        page_size = page_size or getattr(settings, 'HISTORY_PAGE_SIZE', 50)
+        rows = list(self._page_queryset(queryset, cursor, page_size))
+        return self._take_page(rows, page_size)
+    
+    async def apaginate(self, queryset, cursor=None, page_size=None):
+        """Async version of ``paginate``, fetching the page with the async ORM."""
+        page_size = page_size or getattr(settings, 'HISTORY_PAGE_SIZE', 50)
+        rows = [row async for row in self._page_queryset(queryset, cursor, page_size)]
+        return self._take_page(rows, page_size)
+    
+    def _page_queryset(self, queryset, cursor, page_size):
+        """Queryset of the page's rows plus one, to tell whether more follow."""
+        queryset = queryset.order_by('-uploaded_at', '-id')
+        
+        if cursor is not None:
+            uploaded_at, pk = cursor
+            # The uploaded_at__lte range is what the index seeks on; the OR
+            # only breaks ties between uploads with the same timestamp
+            queryset = queryset.filter(uploaded_at__lte=uploaded_at).filter(
+                Q(uploaded_at__lt=uploaded_at) | Q(id__lt=pk)
+            )
+        
+        return queryset[:page_size + 1]
+    
+    def _take_page(self, rows, page_size):
+        page = rows[:page_size]
+        self.next_cursor = self.encode_cursor(page[-1]) if len(rows) > page_size else None
+        return page
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'history': data,
+            'next_cursor': self.next_cursor
+        })
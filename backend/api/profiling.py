@@ -0,0 +1,148 @@
+"""
+On-demand profiling of single requests.
+
+A staff user adds the ``X-Profile`` header (or the ``?profile=`` query
+parameter) to a request and ProfilingMiddleware (api.middleware) profiles
+that request only. The profile is saved in ``PROFILING_DIR`` as
+``<timestamp>_<request id>.<ext>``. Its path is returned in the
+``X-Profile-Path`` response header, next to ``X-Request-ID``.
+
+Flag values:
+    - ``1`` / ``true``: the profiler chosen by ``PROFILING_PROFILER``
+    - ``cprofile``: deterministic cProfile; writes ``.prof`` (open with
+      ``python -m pstats`` or snakeviz)
+    - ``sampling``: pyinstrument's sampling profiler, when installed;
+      writes an ``.html`` call tree
+
+``PROFILING_PROFILER = 'auto'`` uses pyinstrument when it is installed and
+cProfile otherwise. Requests from non-staff tokens (and anonymous requests)
+ignore the flag. Requests without the flag are only checked for it.
+Streaming response bodies are produced after the profile ends.
+"""
+
+import cProfile
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - optional dependency
+    pyinstrument = None
+
+
+# Incoming X-Request-ID values that are safe to reuse in a file name
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class _CProfile:
+    extension = 'prof'
+    
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+    
+    def start(self):
+        self._profiler.enable()
+    
+    def stop(self):
+        self._profiler.disable()
+    
+    def save(self, path):
+        self._profiler.dump_stats(path)
+
+
+class _SamplingProfile:
+    extension = 'html'
+    
+    def __init__(self, async_mode='disabled'):
+        self._profiler = pyinstrument.Profiler(async_mode=async_mode)
+    
+    def start(self):
+        self._profiler.start()
+    
+    def stop(self):
+        self._profiler.stop()
+    
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self._profiler.output_html())
+
+
+def requested_profiler(request):
+    """
+    Profiler kind a request asks for ('cprofile' or 'sampling'), or None.
+    
+    Only looks at the flag; the caller checks that the user is staff.
+    """
+    value = request.META.get('HTTP_X_PROFILE')
+    if value is None:
+        if 'profile' not in request.META.get('QUERY_STRING', ''):
+            return None
+        value = request.GET.get('profile')
+        if value is None:
+            return None
+    
+    value = value.strip().lower()
+    if value in ('cprofile', 'sampling'):
+        kind = value
+    elif value in ('1', 'true', 'yes'):
+        kind = getattr(settings, 'PROFILING_PROFILER', 'auto')
+    else:
+        return None
+    
+    if kind == 'auto':
+        kind = 'sampling' if pyinstrument is not None else 'cprofile'
+    if kind == 'sampling' and pyinstrument is None:
+        kind = 'cprofile'
+    return kind
+
+
+def is_staff_request(request) -> bool:
+    """
+    Whether a request is made by a staff user.
+    
+    Runs before DRF authenticates the view, so the token is checked with
+    the configured DRF authentication classes here; a session user (admin
+    site) counts too. Invalid credentials count as not staff.
+    """
+    from rest_framework.exceptions import APIException
+    from rest_framework.settings import api_settings
+    
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(request)
+        except APIException:
+            return False
+        if result is not None:
+            return result[0].is_staff
+    
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+def request_id(request) -> str:
+    """The client's X-Request-ID when it is safe to use, else a new id."""
+    value = request.META.get('HTTP_X_REQUEST_ID', '')
+    if REQUEST_ID_PATTERN.match(value):
+        return value
+    return uuid.uuid4().hex
+
+
+def new_profiler(kind, async_mode=False):
+    """Create an unstarted profiler of the given kind."""
+    if kind == 'sampling':
+        return _SamplingProfile(async_mode='enabled' if async_mode else 'disabled')
+    return _CProfile()
+
+
+def save_profile(profiler, request_id) -> str:
+    """Write a stopped profile to PROFILING_DIR and return its path."""
+    directory = settings.PROFILING_DIR
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}_{request_id}.{profiler.extension}"
+    path = os.path.join(directory, name)
+    profiler.save(path)
+    return path
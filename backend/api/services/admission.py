@@ -0,0 +1,303 @@
+"""
+Admission Control for Expensive Requests.
+
+Uploads run the Pandas analytics in the web worker, and report requests
+occupy the render pool. Without a limit, a handful of users uploading large
+CSVs at the same time can exhaust memory. Each kind of job has a limiter
+that admits a request only while:
+
+- fewer than ``max_jobs`` jobs of that kind are running on the server, and
+- the requesting user has fewer than ``max_jobs_per_user`` of them running,
+  so one user cannot take every slot (per-user fairness).
+
+Requests that are not admitted raise ``AdmissionRejected`` carrying a
+suggested ``Retry-After``; views answer 429. Nothing waits in the server,
+so rejected requests hold no memory.
+
+Slots are shared by every worker process on the host: each one is a lock
+file in ``ADMISSION_LOCK_DIR`` (one per server slot, and per user bucket up
+to the per-user limit) that an admitted job holds a non-blocking exclusive
+lock on. The operating system drops the lock when the file is closed or its
+process dies, so a crashed worker never leaks a slot. Users are mapped onto
+``USER_LOCK_BUCKETS`` buckets so the number of files stays fixed however
+many users there are; users that share a bucket share its per-user slots
+across processes. With ``ADMISSION_LOCK_DIR = None`` limits apply per
+worker process instead.
+
+Configured by ``ANALYTICS_MAX_CONCURRENT_JOBS``, ``ANALYTICS_MAX_JOBS_PER_USER``,
+``REPORT_MAX_CONCURRENT_JOBS``, ``REPORT_MAX_JOBS_PER_USER`` and
+``ADMISSION_LOCK_DIR``.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+# Assumed job duration (seconds) until one has completed
+DEFAULT_JOB_SECONDS = 1.0
+
+# Weight of the newest job in the moving average of job durations
+DURATION_SMOOTHING = 0.2
+
+# Per-user slot files are shared by users with the same id modulo this,
+# which bounds the files in ADMISSION_LOCK_DIR
+USER_LOCK_BUCKETS = 64
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a job is not admitted.
+    
+    Attributes:
+        retry_after: Suggested number of seconds before retrying
+        per_user: True if the user's own limit was reached, False if the
+                  server-wide limit was
+    """
+    
+    def __init__(self, retry_after: int, per_user: bool):
+        scope = 'per-user' if per_user else 'server'
+        super().__init__(f"Too many concurrent jobs ({scope} limit), retry in {retry_after}s")
+        self.retry_after = retry_after
+        self.per_user = per_user
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """Open and exclusively lock a slot file without waiting; None if it is held."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            # flock locks belong to the open file, so threads of one process
+            # exclude each other as well
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _unlock(fd: int) -> None:
+    try:
+        if fcntl is None:  # pragma: no cover - Windows
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+class AdmissionTicket:
+    """An admitted job. ``release()`` frees its slot; calling it again is a no-op."""
+    
+    def __init__(self, limiter: 'AdmissionLimiter', user_id: int, lock_fds: List[int]):
+        self._limiter = limiter
+        self._user_id = user_id
+        self._lock_fds = lock_fds
+        self._started_at = time.monotonic()
+        self._released = False
+    
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release(self._user_id, time.monotonic() - self._started_at, self._lock_fds)
+
+
+class AdmissionLimiter:
+    """
+    Non-blocking concurrency limit with a per-user cap.
+    
+    Thread-safe: views in different request threads share one instance.
+    With a ``lock_dir``, limiters of the same name in other processes share
+    the slots as well.
+    """
+    
+    def __init__(self, name: str, max_jobs: Optional[int], max_jobs_per_user: Optional[int],
+                 lock_dir: Optional[str] = None):
+        """
+        Args:
+            name: Job kind, used in metrics and slot file names
+            max_jobs: Jobs allowed to run at once (None = unlimited)
+            max_jobs_per_user: Jobs one user may run at once (None = unlimited)
+            lock_dir: Directory of the shared slot files (None = limits
+                      apply to this process only)
+        """
+        self.name = name
+        self.max_jobs = max_jobs
+        self.max_jobs_per_user = max_jobs_per_user
+        self.lock_dir = os.fspath(lock_dir) if lock_dir is not None else None
+        if self.lock_dir is not None:
+            os.makedirs(self.lock_dir, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._active = 0
+        self._active_per_user = Counter()
+        self._admitted = 0
+        self._rejected = 0
+        self._rejected_per_user = 0
+        self._mean_seconds = DEFAULT_JOB_SECONDS
+    
+    def acquire(self, user_id: int) -> AdmissionTicket:
+        """
+        Admit a job for a user, or fail immediately.
+        
+        Raises:
+            AdmissionRejected: If the user's or the server's limit is reached
+        """
+        with self._lock:
+            lock_fds = []
+            
+            if self.max_jobs_per_user is not None and not self._take_slot(
+                    f'user{int(user_id) % USER_LOCK_BUCKETS}', self.max_jobs_per_user, self._active_per_user[user_id], lock_fds):
+                self._rejected_per_user += 1
+                # The user's own earliest job has to finish first
+                raise AdmissionRejected(max(1, math.ceil(self._mean_seconds)), per_user=True)
+            
+            if self.max_jobs is not None and not self._take_slot('slot', self.max_jobs, self._active, lock_fds):
+                for fd in lock_fds:
+                    _unlock(fd)
+                self._rejected += 1
+                # One of the running jobs finishes after about mean / max_jobs
+                raise AdmissionRejected(max(1, math.ceil(self._mean_seconds / self.max_jobs)), per_user=False)
+            
+            self._active += 1
+            self._active_per_user[user_id] += 1
+            self._admitted += 1
+        
+        return AdmissionTicket(self, user_id, lock_fds)
+    
+    def _take_slot(self, prefix: str, limit: int, active_here: int, lock_fds: List[int]) -> bool:
+        """
+        Claim one of `limit` slots, appending its lock file descriptor (if
+        any) to `lock_fds`. Returns False when every slot is taken.
+        """
+        if active_here >= limit:
+            return False
+        if self.lock_dir is None:
+            return True
+        for index in range(limit):
+            fd = _try_lock(os.path.join(self.lock_dir, f'{self.name}-{prefix}-{index}.lock'))
+            if fd is not None:
+                lock_fds.append(fd)
+                return True
+        return False
+    
+    @contextmanager
+    def admit(self, user_id: int) -> Iterator[AdmissionTicket]:
+        """Hold a slot for the duration of a ``with`` block (see ``acquire``)."""
+        ticket = self.acquire(user_id)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+    
+    def _release(self, user_id: int, elapsed: float, lock_fds: List[int]) -> None:
+        with self._lock:
+            for fd in lock_fds:
+                _unlock(fd)
+            self._active -= 1
+            self._active_per_user[user_id] -= 1
+            if self._active_per_user[user_id] <= 0:
+                del self._active_per_user[user_id]
+            self._mean_seconds += DURATION_SMOOTHING * (elapsed - self._mean_seconds)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of limiter state and counters (``active`` counts this process's jobs)."""
+        with self._lock:
+            return {
+                'max_jobs': self.max_jobs,
+                'max_jobs_per_user': self.max_jobs_per_user,
+                'shared': self.lock_dir is not None,
+                'active': self._active,
+                'active_users': len(self._active_per_user),
+                'admitted': self._admitted,
+                'rejected': self._rejected,
+                'rejected_per_user': self._rejected_per_user,
+                'mean_job_seconds': round(self._mean_seconds, 6),
+            }
+
+
+class AdmittedStream:
+    """
+    Streaming response body that holds an admission slot until it ends.
+    
+    Django closes streaming content after the response is sent (or the
+    client disconnects), which releases the slot even if iteration never
+    started - unlike a generator's ``finally``.
+    """
+    
+    def __init__(self, chunks: Iterable[bytes], ticket: AdmissionTicket):
+        self._chunks = iter(chunks)
+        self._ticket = ticket
+    
+    def __iter__(self) -> 'AdmittedStream':
+        return self
+    
+    def __next__(self) -> bytes:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        try:
+            close = getattr(self._chunks, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            self._ticket.release()
+
+
+_limiters: Dict[str, AdmissionLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _configured_limits(name: str):
+    if name == 'analytics':
+        return (
+            getattr(settings, 'ANALYTICS_MAX_CONCURRENT_JOBS', 2),
+            getattr(settings, 'ANALYTICS_MAX_JOBS_PER_USER', 1)
+        )
+    if name == 'reports':
+        return (
+            getattr(settings, 'REPORT_MAX_CONCURRENT_JOBS', None),
+            getattr(settings, 'REPORT_MAX_JOBS_PER_USER', 2)
+        )
+    raise ValueError(f"Unknown job kind: {name}")
+
+
+def get_admission_limiter(name: str) -> AdmissionLimiter:
+    """
+    Return the shared limiter for a job kind ('analytics' or 'reports').
+    
+    Limits and the slot directory are read from settings when the limiter
+    is first used.
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                max_jobs, max_jobs_per_user = _configured_limits(name)
+                limiter = _limiters[name] = AdmissionLimiter(
+                    name, max_jobs, max_jobs_per_user, getattr(settings, 'ADMISSION_LOCK_DIR', None)
+                )
+    return limiter
+
+
+def admission_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every limiter, keyed by job kind."""
+    return {name: get_admission_limiter(name).metrics() for name in ('analytics', 'reports')}
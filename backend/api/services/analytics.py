@@ -12,11 +12,50 @@ Required CSV columns:
     - Temperature (numeric)
 """
 
+import io
+import os
+import pickle
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from django.core.exceptions import ValidationError
 
 
+# Columns every equipment CSV must contain, in report order
+REQUIRED_COLUMNS = [
+    'Equipment Name',
+    'Type',
+    'Flowrate',
+    'Pressure',
+    'Temperature'
+]
+
+NUMERIC_COLUMNS = ['Flowrate', 'Pressure', 'Temperature']
+
+# Rows read per chunk when streaming a stored dataset
+DEFAULT_CHUNK_ROWS = 50000
+
+# pandas CSV parser used for uploads
+CSV_ENGINE = 'c'
+
+# Bytes read from the start of an upload to estimate its memory needs
+MEMORY_SAMPLE_BYTES = 1024 * 1024
+
+# A chunk of the bounded-memory summary may use this share of the budget;
+# the rest covers parser buffers and the numeric copies made per chunk
+CHUNK_BUDGET_SHARE = 0.25
+
+# Chunk rows for the bounded-memory summary when no estimate is available
+FALLBACK_CHUNK_ROWS = 1000
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
 class CSVValidationError(Exception):
     """
     Custom exception for CSV validation errors.
@@ -26,6 +65,243 @@ class CSVValidationError(Exception):
     pass
 
 
+class MemoryBudgetExceeded(CSVValidationError):
+    """
+    Raised when an upload is estimated to need more memory than allowed.
+    
+    A CSVValidationError, so views reject the upload like any invalid CSV.
+    """
+    
+    def __init__(self, estimated_bytes: Optional[int], budget_bytes: int):
+        if estimated_bytes is None:
+            message = "CSV memory use could not be estimated from its first rows"
+        else:
+            message = f"CSV would need about {estimated_bytes / 2**20:.0f} MB to analyze"
+        super().__init__(f"{message}; the limit is {budget_bytes / 2**20:.0f} MB")
+        self.estimated_bytes = estimated_bytes
+        self.budget_bytes = budget_bytes
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident memory of this process (Linux), or None where unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _source_bytes(source) -> Optional[int]:
+    """Size of a CSV path or seekable file object, or None if unknown."""
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            return os.path.getsize(source)
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+        source.seek(position)
+        return size
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+class PipelineTimings:
+    """
+    Stage-by-stage record of one analytics run.
+    
+    Each stage stores its wall time, the change in process resident memory
+    (None where it cannot be read; other requests in the same process add
+    noise) and, where known, the rows and bytes it processed. ``as_dict()``
+    is what gets stored with the upload (``DatasetUpload.stage_timings``).
+    """
+    
+    def __init__(self, engine: str = CSV_ENGINE):
+        self.engine = engine
+        self.rows: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.stages: List[Dict[str, Any]] = []
+        # Estimated vs traced peak memory and the route taken (see ingest)
+        self.memory: Optional[Dict[str, Any]] = None
+    
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None, nbytes: Optional[int] = None):
+        """
+        Time the body of a ``with`` block as one stage.
+        
+        The yielded dict can be updated with rows/bytes discovered inside
+        the block. A stage that raises is recorded with ``failed: True``.
+        """
+        entry = {'stage': name, 'seconds': None, 'memory_delta_bytes': None, 'rows': rows, 'bytes': nbytes}
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        try:
+            yield entry
+        except BaseException:
+            entry['failed'] = True
+            raise
+        finally:
+            entry['seconds'] = round(time.perf_counter() - started, 6)
+            rss_after = _rss_bytes()
+            if rss_before is not None and rss_after is not None:
+                entry['memory_delta_bytes'] = rss_after - rss_before
+            self.stages.append(entry)
+    
+    @property
+    def total_seconds(self) -> float:
+        return round(sum(entry['seconds'] for entry in self.stages), 6)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        result = {
+            'engine': self.engine,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'total_seconds': self.total_seconds,
+            'stages': self.stages,
+        }
+        if self.memory is not None:
+            result['memory'] = self.memory
+        return result
+
+
+def _read_sample(source, size: int) -> bytes:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read(size)
+    position = source.tell()
+    try:
+        data = source.read(size)
+    finally:
+        source.seek(position)
+    return data.encode() if isinstance(data, str) else data
+
+
+def estimate_summary_memory(source, sample_bytes: int = MEMORY_SAMPLE_BYTES) -> Dict[str, Any]:
+    """
+    Estimate the peak memory of ``compute_summary_statistics`` on a CSV.
+    
+    Parses the complete rows within the first ``sample_bytes`` and scales
+    the parsed frame's size (strings included) by the file's size. The
+    frame dominates the summary's peak; repeated strings that pandas
+    shares are counted once per row, which errs on the high side.
+    
+    Args:
+        source: Path to the CSV file or an open file object (its position
+                is restored)
+        sample_bytes: Size of the sample read from the start of the file
+    
+    Returns:
+        Dict with estimated_bytes (None if the sample has no complete data
+        row or cannot be parsed), estimated_rows, bytes_per_row and
+        sample_rows
+    """
+    estimate = {'estimated_bytes': None, 'estimated_rows': None, 'bytes_per_row': None, 'sample_rows': 0}
+    
+    sample = _read_sample(source, sample_bytes)
+    total_bytes = _source_bytes(source) or len(sample)
+    if not sample.strip():
+        # Nothing to parse; the summary reports the empty file
+        estimate.update(estimated_bytes=0, estimated_rows=0)
+        return estimate
+    if total_bytes > len(sample):
+        # Drop the row cut off at the end of the sample
+        sample = sample[:sample.rfind(b'\n') + 1]
+    
+    header_bytes = sample.find(b'\n') + 1
+    if header_bytes == 0 or header_bytes == len(sample) and total_bytes > len(sample):
+        return estimate
+    
+    try:
+        df = pd.read_csv(io.BytesIO(sample), engine=CSV_ENGINE)
+    except (pd.errors.ParserError, UnicodeDecodeError):
+        return estimate
+    
+    rows = len(df)
+    frame_bytes = int(df.memory_usage(index=True, deep=True).sum())
+    if rows == 0:
+        estimate.update(estimated_bytes=frame_bytes, estimated_rows=0)
+        return estimate
+    
+    bytes_per_row = frame_bytes / rows
+    estimated_rows = round(rows * max(total_bytes - header_bytes, 0) / max(len(sample) - header_bytes, 1))
+    estimate.update(
+        estimated_bytes=round(bytes_per_row * max(estimated_rows, rows)),
+        estimated_rows=max(estimated_rows, rows),
+        bytes_per_row=round(bytes_per_row, 1),
+        sample_rows=rows
+    )
+    return estimate
+
+
+def chunk_rows_for_budget(estimate: Dict[str, Any], budget_bytes: int) -> int:
+    """Rows per chunk that keep one chunk of the bounded-memory summary within budget."""
+    if not estimate.get('bytes_per_row'):
+        return FALLBACK_CHUNK_ROWS
+    rows = int(budget_bytes * CHUNK_BUDGET_SHARE / estimate['bytes_per_row'])
+    return max(1, min(DEFAULT_CHUNK_ROWS, rows))
+
+
+class PeakMemoryTrace:
+    """
+    Result of ``trace_peak_memory``.
+    
+    Attributes:
+        peak_bytes: Peak traced allocations above the level at entry
+        concurrent: True if another trace overlapped, whose allocations are
+                    then included in the peak
+    """
+    
+    def __init__(self):
+        self.peak_bytes: Optional[int] = None
+        self.concurrent = False
+
+
+_trace_lock = threading.Lock()
+_active_traces = 0
+_trace_starts = 0
+_started_tracemalloc = False
+
+
+@contextmanager
+def trace_peak_memory(enabled: bool = True) -> Iterator[PeakMemoryTrace]:
+    """
+    Measure the peak Python heap (NumPy and pandas buffers included) of a block.
+    
+    tracemalloc is process-wide: it is started for the first active trace
+    and stopped after the last one. Tracing slows allocation-heavy code
+    down noticeably. With ``enabled=False`` nothing is measured.
+    """
+    global _active_traces, _trace_starts, _started_tracemalloc
+    
+    trace = PeakMemoryTrace()
+    if not enabled:
+        yield trace
+        return
+    
+    with _trace_lock:
+        if _active_traces == 0:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracemalloc = True
+            tracemalloc.reset_peak()
+        else:
+            trace.concurrent = True
+        _active_traces += 1
+        _trace_starts += 1
+        starts_at_entry = _trace_starts
+        baseline = tracemalloc.get_traced_memory()[0]
+    
+    try:
+        yield trace
+    finally:
+        with _trace_lock:
+            trace.peak_bytes = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+            if _active_traces > 1 or _trace_starts != starts_at_entry:
+                trace.concurrent = True
+            _active_traces -= 1
+            if _active_traces == 0 and _started_tracemalloc:
+                tracemalloc.stop()
+                _started_tracemalloc = False
+
+
 def validate_csv_format(df: pd.DataFrame) -> None:
     """
     Validate that CSV contains all required columns with correct data types.
@@ -36,27 +312,16 @@ def validate_csv_format(df: pd.DataFrame) -> None:
     Raises:
         CSVValidationError: If validation fails with detailed error message
     """
-    # Define required columns
-    required_columns = [
-        'Equipment Name',
-        'Type',
-        'Flowrate',
-        'Pressure',
-        'Temperature'
-    ]
-    
     # Check for missing columns
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_columns:
         raise CSVValidationError(
             f"Missing required columns: {', '.join(missing_columns)}. "
-            f"Required columns are: {', '.join(required_columns)}"
+            f"Required columns are: {', '.join(REQUIRED_COLUMNS)}"
         )
     
     # Validate numeric columns
-    numeric_columns = ['Flowrate', 'Pressure', 'Temperature']
-    
-    for col in numeric_columns:
+    for col in NUMERIC_COLUMNS:
         # Try to convert to numeric
         try:
             # Use pd.to_numeric with errors='coerce' to find non-numeric values
@@ -80,7 +345,10 @@ def validate_csv_format(df: pd.DataFrame) -> None:
             )
 
 
-def compute_summary_statistics(file_path: str) -> Dict[str, Any]:
+def compute_summary_statistics(
+    file_path: str,
+    timings: Optional[PipelineTimings] = None
+) -> Dict[str, Any]:
     """
     Compute summary statistics from uploaded CSV file.
     
@@ -90,8 +358,12 @@ def compute_summary_statistics(file_path: str) -> Dict[str, Any]:
     3. Computes all required statistics
     4. Returns clean JSON-serializable dictionary
     
+    Each step is recorded as a stage in ``timings`` when given: read_csv,
+    validation, coercion, aggregation and serialization.
+    
     Args:
-        file_path: Absolute path to the CSV file
+        file_path: Absolute path to the CSV file (or an open file object)
+        timings: Recorder for per-stage time, memory and rows/bytes
         
     Returns:
         Dictionary containing:
@@ -105,41 +377,54 @@ def compute_summary_statistics(file_path: str) -> Dict[str, Any]:
         CSVValidationError: If CSV format is invalid
         Exception: For other file/processing errors
     """
+    if timings is None:
+        timings = PipelineTimings()
+    
     try:
         # Load CSV with Pandas
-        df = pd.read_csv(file_path)
+        timings.bytes = _source_bytes(file_path)
+        with timings.stage('read_csv', nbytes=timings.bytes) as stage:
+            df = pd.read_csv(file_path, engine=timings.engine)
+            timings.rows = stage['rows'] = len(df)
         
         # Validate CSV format
-        validate_csv_format(df)
+        with timings.stage('validation', rows=timings.rows):
+            validate_csv_format(df)
         
         # Compute statistics
         total_equipment = len(df)
         
         # Convert numeric columns to proper numeric type
-        df['Flowrate'] = pd.to_numeric(df['Flowrate'], errors='coerce')
-        df['Pressure'] = pd.to_numeric(df['Pressure'], errors='coerce')
-        df['Temperature'] = pd.to_numeric(df['Temperature'], errors='coerce')
+        with timings.stage('coercion', rows=timings.rows):
+            df['Flowrate'] = pd.to_numeric(df['Flowrate'], errors='coerce')
+            df['Pressure'] = pd.to_numeric(df['Pressure'], errors='coerce')
+            df['Temperature'] = pd.to_numeric(df['Temperature'], errors='coerce')
         
-        # Compute averages (handle NaN values)
-        average_flowrate = float(df['Flowrate'].mean())
-        average_pressure = float(df['Pressure'].mean())
-        average_temperature = float(df['Temperature'].mean())
+        with timings.stage('aggregation', rows=timings.rows):
+            # Compute averages (handle NaN values)
+            average_flowrate = float(df['Flowrate'].mean())
+            average_pressure = float(df['Pressure'].mean())
+            average_temperature = float(df['Temperature'].mean())
         
-        # Compute equipment type distribution
-        type_counts = df['Type'].value_counts()
-        equipment_distribution = [
-            {'type': str(type_name), 'count': int(count)}
-            for type_name, count in type_counts.items()
-        ]
+            # Compute equipment type distribution
+            type_counts = df['Type'].value_counts()
         
-        # Return clean dictionary
-        return {
-            'total_equipment': total_equipment,
-            'average_flowrate': round(average_flowrate, 2),
-            'average_pressure': round(average_pressure, 2),
-            'average_temperature': round(average_temperature, 2),
-            'equipment_distribution': equipment_distribution
-        }
+        with timings.stage('serialization', rows=len(type_counts)):
+            equipment_distribution = [
+                {'type': str(type_name), 'count': int(count)}
+                for type_name, count in type_counts.items()
+            ]
+            
+            # Return clean dictionary
+            summary = {
+                'total_equipment': total_equipment,
+                'average_flowrate': round(average_flowrate, 2),
+                'average_pressure': round(average_pressure, 2),
+                'average_temperature': round(average_temperature, 2),
+                'equipment_distribution': equipment_distribution
+            }
+        
+        return summary
         
     except CSVValidationError:
         # Re-raise validation errors as-is
@@ -154,6 +439,115 @@ def compute_summary_statistics(file_path: str) -> Dict[str, Any]:
         raise CSVValidationError(f"Error processing CSV: {str(e)}")
 
 
+def compute_summary_statistics_chunked(
+    file_path: str,
+    timings: Optional[PipelineTimings] = None,
+    chunk_size: int = DEFAULT_CHUNK_ROWS
+) -> Dict[str, Any]:
+    """
+    Bounded-memory version of ``compute_summary_statistics``.
+    
+    Parses only the required columns, ``chunk_size`` rows at a time, and
+    keeps running sums and type counts, so memory depends on the chunk
+    size and the number of equipment types rather than on the file.
+    Accepts and rejects the same CSVs with the same messages, and returns
+    the same summary (averages may differ from the in-memory result in the
+    last digit before rounding).
+    
+    Parsing, validation and aggregation are interleaved, so they are
+    recorded as one ``chunked_scan`` stage in ``timings``, followed by
+    ``serialization``.
+    
+    Raises:
+        CSVValidationError: If CSV format is invalid
+    """
+    if timings is None:
+        timings = PipelineTimings()
+    
+    total_equipment = 0
+    sums = {col: 0.0 for col in NUMERIC_COLUMNS}
+    counts = {col: 0 for col in NUMERIC_COLUMNS}
+    has_missing = {col: False for col in NUMERIC_COLUMNS}
+    has_values = {col: False for col in NUMERIC_COLUMNS}
+    # Insertion order is first appearance, like value_counts() ties
+    type_counts: Dict[Any, int] = {}
+    
+    try:
+        timings.bytes = _source_bytes(file_path)
+        with timings.stage('chunked_scan', nbytes=timings.bytes) as stage:
+            reader = pd.read_csv(
+                file_path,
+                engine=timings.engine,
+                usecols=lambda column: column in REQUIRED_COLUMNS,
+                chunksize=chunk_size
+            )
+            columns_checked = False
+            for chunk in reader:
+                if not columns_checked:
+                    # Missing columns (a header-only file still yields one empty chunk)
+                    validate_csv_format(chunk.head(0))
+                    columns_checked = True
+                
+                for col in NUMERIC_COLUMNS:
+                    raw = chunk[col]
+                    converted = pd.to_numeric(raw, errors='coerce')
+                    invalid_mask = converted.isna() & raw.notna()
+                    if invalid_mask.any():
+                        raise CSVValidationError(
+                            f"Column '{col}' must contain only numeric values. "
+                            f"Found invalid values: {raw[invalid_mask].head(3).tolist()}"
+                        )
+                    has_missing[col] = has_missing[col] or bool(raw.isna().any())
+                    has_values[col] = has_values[col] or bool(raw.notna().any())
+                    sums[col] += float(converted.sum())
+                    counts[col] += int(converted.count())
+                
+                for type_name, count in chunk['Type'].value_counts(sort=False).items():
+                    type_counts[type_name] = type_counts.get(type_name, 0) + int(count)
+                total_equipment += len(chunk)
+            
+            # As in validate_csv_format, missing values are only allowed in a
+            # column that is entirely empty
+            for col in NUMERIC_COLUMNS:
+                if has_missing[col] and has_values[col]:
+                    raise CSVValidationError(
+                        f"Column '{col}' must contain only numeric values. "
+                        f"Found invalid values: []"
+                    )
+            timings.rows = stage['rows'] = total_equipment
+        
+        with timings.stage('serialization', rows=len(type_counts)):
+            equipment_distribution = [
+                {'type': str(type_name), 'count': count}
+                for type_name, count in sorted(type_counts.items(), key=lambda item: item[1], reverse=True)
+            ]
+            
+            averages = {
+                col: round(sums[col] / counts[col], 2) if counts[col] else float('nan')
+                for col in NUMERIC_COLUMNS
+            }
+            summary = {
+                'total_equipment': total_equipment,
+                'average_flowrate': averages['Flowrate'],
+                'average_pressure': averages['Pressure'],
+                'average_temperature': averages['Temperature'],
+                'equipment_distribution': equipment_distribution
+            }
+        
+        return summary
+    
+    except CSVValidationError:
+        raise
+    except FileNotFoundError:
+        raise CSVValidationError(f"File not found: {file_path}")
+    except pd.errors.EmptyDataError:
+        raise CSVValidationError("CSV file is empty")
+    except pd.errors.ParserError as e:
+        raise CSVValidationError(f"Error parsing CSV file: {str(e)}")
+    except Exception as e:
+        raise CSVValidationError(f"Error processing CSV: {str(e)}")
+
+
 def get_equipment_distribution(file_path: str) -> List[Dict[str, Any]]:
     """
     Get equipment type distribution from CSV file.
@@ -183,3 +577,162 @@ def get_equipment_distribution(file_path: str) -> List[Dict[str, Any]]:
         raise
     except Exception as e:
         raise CSVValidationError(f"Error processing CSV: {str(e)}")
+
+
+def iter_equipment_rows(
+    file_path: str,
+    equipment_type: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[Tuple]:
+    """
+    Stream equipment rows from a stored CSV file in bounded-size chunks.
+    
+    Only one chunk is held in memory at a time, so this is safe to use on
+    datasets of any size.
+    
+    Args:
+        file_path: Absolute path to the CSV file
+        equipment_type: If given, only rows of this type are yielded
+        chunk_size: Number of CSV rows parsed per chunk
+        
+    Yields:
+        Tuples of (Equipment Name, Type, Flowrate, Pressure, Temperature)
+    """
+    reader = pd.read_csv(file_path, usecols=REQUIRED_COLUMNS, chunksize=chunk_size)
+    
+    for chunk in reader:
+        chunk = chunk[REQUIRED_COLUMNS]
+        
+        if equipment_type is not None:
+            chunk = chunk[chunk['Type'].astype(str) == equipment_type]
+        
+        for col in NUMERIC_COLUMNS:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+        
+        yield from chunk.itertuples(index=False, name=None)
+
+
+class EquipmentRowPartition:
+    """
+    Equipment rows of a stored CSV grouped by type, for the detailed report.
+    
+    The file is read once in bounded-size chunks. Each chunk's rows are
+    split by type and spilled to one temporary file, remembering where each
+    type's batches start. ``iter_rows(type)`` then reads back only that
+    type's batches, so the cost is one parse regardless of the number of
+    types, and memory holds one chunk at a time. The same pass accumulates
+    the per-type counts and averages (``type_statistics()``).
+    
+    Types are matched as strings, like ``compute_type_statistics``. Call
+    ``close()`` (or use as a context manager) to delete the spill file.
+    """
+    
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_ROWS):
+        self._spill = tempfile.TemporaryFile()
+        self._batches: Dict[str, List[int]] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+        
+        try:
+            reader = pd.read_csv(file_path, usecols=REQUIRED_COLUMNS, chunksize=chunk_size)
+            for chunk in reader:
+                chunk = chunk[REQUIRED_COLUMNS]
+                for col in NUMERIC_COLUMNS:
+                    chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+                
+                grouped = chunk.groupby(chunk['Type'].astype(str))
+                _add_type_totals(self._totals, grouped)
+                for type_name, group in grouped:
+                    self._batches.setdefault(type_name, []).append(self._spill.tell())
+                    pickle.dump(
+                        list(group.itertuples(index=False, name=None)),
+                        self._spill,
+                        protocol=pickle.HIGHEST_PROTOCOL
+                    )
+        except BaseException:
+            self.close()
+            raise
+    
+    def type_statistics(self) -> List[Dict[str, Any]]:
+        """Per-type counts and averages, as returned by ``compute_type_statistics``."""
+        return _type_statistics(self._totals)
+    
+    def iter_rows(self, equipment_type: str) -> Iterator[Tuple]:
+        """
+        Yield one type's rows in file order.
+        
+        Iterators of different types may be consumed interleaved.
+        
+        Yields:
+            Tuples of (Equipment Name, Type, Flowrate, Pressure, Temperature)
+        """
+        for offset in self._batches.get(equipment_type, []):
+            self._spill.seek(offset)
+            yield from pickle.load(self._spill)
+    
+    def close(self) -> None:
+        self._spill.close()
+    
+    def __enter__(self) -> 'EquipmentRowPartition':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def compute_type_statistics(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_ROWS
+) -> List[Dict[str, Any]]:
+    """
+    Compute per-type counts and averages in a single chunked pass.
+    
+    Memory is proportional to the number of equipment types, not rows.
+    
+    Args:
+        file_path: Absolute path to the CSV file
+        chunk_size: Number of CSV rows parsed per chunk
+        
+    Returns:
+        List of dicts with 'type', 'count' and 'average_<column>' keys,
+        ordered by descending count
+    """
+    totals: Dict[str, Dict[str, float]] = {}
+    
+    reader = pd.read_csv(file_path, usecols=REQUIRED_COLUMNS, chunksize=chunk_size)
+    
+    for chunk in reader:
+        chunk['Type'] = chunk['Type'].astype(str)
+        for col in NUMERIC_COLUMNS:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+        
+        _add_type_totals(totals, chunk.groupby('Type'))
+        
+    return _type_statistics(totals)
+    
+
+def _add_type_totals(totals: Dict[str, Dict[str, float]], grouped) -> None:
+    """Add one chunk's per-type row counts, sums and non-null counts to `totals`."""
+    sizes = grouped.size()
+    sums = grouped[NUMERIC_COLUMNS].sum()
+    counts = grouped[NUMERIC_COLUMNS].count()
+    
+    for type_name, size in sizes.items():
+        entry = totals.setdefault(type_name, {'count': 0})
+        entry['count'] += int(size)
+        for col in NUMERIC_COLUMNS:
+            entry[f'{col}_sum'] = entry.get(f'{col}_sum', 0.0) + float(sums.at[type_name, col])
+            entry[f'{col}_n'] = entry.get(f'{col}_n', 0) + int(counts.at[type_name, col])
+
+
+def _type_statistics(totals: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+    """Turn accumulated totals into per-type stats, ordered by descending count."""
+    statistics = []
+    for type_name, entry in totals.items():
+        stats = {'type': type_name, 'count': entry['count']}
+        for col in NUMERIC_COLUMNS:
+            n = entry[f'{col}_n']
+            stats[f'average_{col.lower()}'] = round(entry[f'{col}_sum'] / n, 2) if n else None
+        statistics.append(stats)
+    
+    statistics.sort(key=lambda item: item['count'], reverse=True)
+    return statistics
@@ -0,0 +1,233 @@
+"""
+Per-User Latest Dataset Cache.
+
+Read endpoints only need a handful of numbers from the user's most recent
+upload. This module keeps a small snapshot of the latest upload per user in
+Django's cache framework; on a miss it is rebuilt from the typed
+``DatasetStatistics`` / ``EquipmentTypeCount`` rows (indexed on user and
+upload time) rather than by decoding the summary_json blob. The dashboard,
+which already has the latest upload from its history query, rebuilds it
+from that upload's stored summary instead (``snapshot_for_upload``).
+
+The snapshot is invalidated by ``DatasetUpload.save()`` / ``delete()``
+(retention pruning only removes the oldest uploads, never the latest), and
+expires after ``LATEST_DATASET_CACHE_TIMEOUT`` seconds as a safety net.
+The cache alias is ``LATEST_DATASET_CACHE_ALIAS``; it must be shared
+between worker processes (e.g. file-based) for invalidation to be seen by
+every worker.
+
+Snapshots are stored under a per-user version, and invalidation replaces
+the version instead of deleting the snapshot. A request that read the
+database before an upload committed may still write its stale snapshot
+after the invalidation, but under the old version, where no later request
+looks - so a stale snapshot (and the stale 304s it would produce) never
+outlives the invalidation.
+"""
+
+import uuid
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+# Cached in place of a snapshot when the user has no uploads
+_NO_DATASET = {'id': None}
+
+
+def _cache():
+    return caches[getattr(settings, 'LATEST_DATASET_CACHE_ALIAS', 'default')]
+
+
+def _version_key(user_id) -> str:
+    return f'latest_dataset_version:{user_id}'
+
+
+def _cache_key(user_id, version) -> str:
+    return f'latest_dataset:{user_id}:{version}'
+
+
+def _new_version() -> str:
+    # Random rather than a counter, so an evicted version key can never
+    # bring back snapshots cached under an earlier one
+    return uuid.uuid4().hex
+
+
+def _current_version(user_id) -> str:
+    version_key = _version_key(user_id)
+    version = _cache().get(version_key)
+    if version is None:
+        _cache().add(version_key, _new_version(), None)
+        version = _cache().get(version_key)
+    return version
+
+
+async def _acurrent_version(user_id) -> str:
+    version_key = _version_key(user_id)
+    version = await _cache().aget(version_key)
+    if version is None:
+        await _cache().aadd(version_key, _new_version(), None)
+        version = await _cache().aget(version_key)
+    return version
+
+
+def latest_dataset_version(user_id) -> str:
+    """
+    Return the user's current snapshot version.
+    
+    Read it before loading the user's latest upload and pass it to
+    ``snapshot_for_upload``.
+    """
+    return _current_version(user_id)
+
+
+async def alatest_dataset_version(user_id) -> str:
+    """Async version of ``latest_dataset_version``."""
+    return await _acurrent_version(user_id)
+
+
+def build_snapshot(statistics) -> Dict[str, Any]:
+    """
+    Build the cached representation of a dataset upload.
+    
+    Args:
+        statistics: DatasetStatistics instance with its dataset's
+                    summary_hash and its type_counts loaded
+    
+    Returns:
+        Dict with id, summary_hash, summary (4 headline numbers) and
+        distribution
+    """
+    return _summary_snapshot(statistics.dataset_id, statistics.dataset.summary_hash, statistics.as_summary())
+
+
+def _summary_snapshot(dataset_id, summary_hash, summary) -> Dict[str, Any]:
+    return {
+        'id': dataset_id,
+        'summary_hash': summary_hash,
+        'summary': {
+            'total_equipment': summary['total_equipment'],
+            'average_flowrate': summary['average_flowrate'],
+            'average_pressure': summary['average_pressure'],
+            'average_temperature': summary['average_temperature']
+        },
+        'distribution': summary['equipment_distribution']
+    }
+
+
+def _latest_statistics(user_id):
+    """Queryset of the user's statistics rows, newest first, snapshot fields only."""
+    from ..models import DatasetStatistics
+    
+    return (
+        DatasetStatistics.objects
+        .filter(user_id=user_id)
+        .select_related('dataset')
+        .only(
+            'dataset_id', 'total_equipment', 'average_flowrate',
+            'average_pressure', 'average_temperature', 'dataset__summary_hash'
+        )
+        .prefetch_related('type_counts')
+        .order_by('-uploaded_at', '-dataset_id')
+    )
+
+
+def get_latest_dataset_snapshot(user) -> Optional[Dict[str, Any]]:
+    """
+    Return the snapshot of the user's latest upload, or None if there is none.
+    
+    Served from the cache when possible; on a miss the latest statistics
+    are read with two small queries (statistics row, type counts) and cached
+    under the user's current version.
+    """
+    key = _cache_key(user.pk, _current_version(user.pk))
+    snapshot = _cache().get(key)
+    
+    if snapshot is None:
+        statistics = _latest_statistics(user.pk).first()
+        snapshot = build_snapshot(statistics) if statistics else _NO_DATASET
+        _cache().set(key, snapshot, getattr(settings, 'LATEST_DATASET_CACHE_TIMEOUT', 300))
+    
+    return snapshot if snapshot['id'] is not None else None
+
+
+async def aget_latest_dataset_snapshot(user) -> Optional[Dict[str, Any]]:
+    """
+    Async version of ``get_latest_dataset_snapshot`` for async views.
+    
+    Uses the cache's async API and the async ORM, so the event loop is not
+    blocked on a miss.
+    """
+    key = _cache_key(user.pk, await _acurrent_version(user.pk))
+    snapshot = await _cache().aget(key)
+    
+    if snapshot is None:
+        statistics = await _latest_statistics(user.pk).afirst()
+        snapshot = build_snapshot(statistics) if statistics else _NO_DATASET
+        await _cache().aset(key, snapshot, getattr(settings, 'LATEST_DATASET_CACHE_TIMEOUT', 300))
+    
+    return snapshot if snapshot['id'] is not None else None
+
+
+def _stored_summary(dataset_id):
+    from ..models import DatasetUpload
+    
+    return DatasetUpload.objects.filter(pk=dataset_id).values_list('summary_json', flat=True)
+
+
+def snapshot_for_upload(user_id, upload, version) -> Optional[Dict[str, Any]]:
+    """
+    Return the snapshot of ``upload``, the user's latest upload.
+    
+    Served from the cache under ``version`` when the cached snapshot is of
+    this upload; otherwise built from the upload's stored summary_json with
+    one query and cached under ``version``. As ``version`` was read before
+    ``upload`` was loaded, a snapshot of an upload that has since been
+    superseded is cached under a version nobody reads any more.
+    
+    Args:
+        user_id: Owner of the upload
+        upload: DatasetUpload with id and summary_hash loaded
+        version: ``latest_dataset_version(user_id)``, read before ``upload``
+    
+    Returns:
+        The snapshot, or None if the upload was deleted in the meantime
+    """
+    key = _cache_key(user_id, version)
+    snapshot = _cache().get(key)
+    if snapshot is not None and snapshot['id'] == upload.pk:
+        return snapshot
+    
+    summary = _stored_summary(upload.pk).first()
+    if summary is None:
+        return None
+    snapshot = _summary_snapshot(upload.pk, upload.summary_hash, summary)
+    _cache().set(key, snapshot, getattr(settings, 'LATEST_DATASET_CACHE_TIMEOUT', 300))
+    return snapshot
+
+
+async def asnapshot_for_upload(user_id, upload, version) -> Optional[Dict[str, Any]]:
+    """Async version of ``snapshot_for_upload``."""
+    key = _cache_key(user_id, version)
+    snapshot = await _cache().aget(key)
+    if snapshot is not None and snapshot['id'] == upload.pk:
+        return snapshot
+    
+    summary = await _stored_summary(upload.pk).afirst()
+    if summary is None:
+        return None
+    snapshot = _summary_snapshot(upload.pk, upload.summary_hash, summary)
+    await _cache().aset(key, snapshot, getattr(settings, 'LATEST_DATASET_CACHE_TIMEOUT', 300))
+    return snapshot
+
+
+def invalidate_latest_dataset(user_id) -> None:
+    """Move a user to a new snapshot version after their uploads change."""
+    if user_id is not None:
+        _cache().set(_version_key(user_id), _new_version(), None)
+
+
+async def ainvalidate_latest_dataset(user_id) -> None:
+    """Async version of ``invalidate_latest_dataset``."""
+    if user_id is not None:
+        await _cache().aset(_version_key(user_id), _new_version(), None)
@@ -0,0 +1,192 @@
+"""
+Dataset Ingest Pipeline.
+
+Turns a validated CSV upload into a stored ``DatasetUpload``. The analytics
+summary is computed from the uploaded file before anything is written, so
+an upload costs one INSERT with the summary already in place, followed by
+the model's bulk history pruning - all in one transaction (see
+``DatasetUpload.save()``). Invalid CSVs never touch the database or the
+media directory.
+
+Async views use ``aingest_dataset``, which runs the CPU-bound summary on a
+shared thread pool (``ANALYTICS_EXECUTOR_WORKERS`` threads) so the event
+loop keeps serving other requests meanwhile.
+
+Every upload records its stage timings (``PipelineTimings``): the analytics
+stages plus ``file_storage`` (writing the CSV to the media storage) are
+stored on the upload, and all stages - including ``database``, the INSERT
+transaction itself - are reported to the request metrics.
+
+Memory budget: before the full parse, the summary's peak memory is
+estimated from the first rows (``estimate_summary_memory``). Uploads
+estimated above ``ANALYTICS_MEMORY_BUDGET_BYTES`` are summarized by the
+bounded-memory chunked pass, or rejected when ``ANALYTICS_OVER_BUDGET`` is
+``'reject'``. The estimate, the route taken and - for a sampled fraction of
+uploads (``ANALYTICS_MEMORY_TRACE_RATE``) - the actual peak traced with
+tracemalloc are stored with the stage timings under ``memory``, so the
+estimator can be checked against real uploads.
+"""
+
+import asyncio
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .. import metrics
+from .analytics import (
+    MemoryBudgetExceeded, PipelineTimings, chunk_rows_for_budget, compute_summary_statistics,
+    compute_summary_statistics_chunked, estimate_summary_memory, trace_peak_memory
+)
+from .storage_gc import delete_dataset_files
+
+
+def _csv_source(upload):
+    """Return something pandas can read for an uploaded file."""
+    if hasattr(upload, 'temporary_file_path'):
+        return upload.temporary_file_path()
+    upload.seek(0)
+    return upload.file
+
+
+def summarize_upload(source, timings):
+    """
+    Compute an upload's summary within the analytics memory budget.
+    
+    Estimates the peak memory first (stage ``memory_estimate``), then runs
+    the in-memory or the chunked summary and records the outcome in
+    ``timings.memory``.
+    
+    Raises:
+        MemoryBudgetExceeded: Over budget with ANALYTICS_OVER_BUDGET = 'reject'
+        CSVValidationError: If the CSV is invalid
+    """
+    budget = getattr(settings, 'ANALYTICS_MEMORY_BUDGET_BYTES', None)
+    
+    with timings.stage('memory_estimate'):
+        estimate = estimate_summary_memory(source)
+    estimated = estimate['estimated_bytes']
+    over_budget = budget is not None and (estimated is None or estimated > budget)
+    
+    timings.memory = {
+        'estimated_bytes': estimated,
+        'budget_bytes': budget,
+        'route': 'in_memory',
+        'traced_peak_bytes': None,
+        'concurrent': None,
+    }
+    if over_budget:
+        if getattr(settings, 'ANALYTICS_OVER_BUDGET', 'chunked') == 'reject':
+            timings.memory['route'] = 'rejected'
+            raise MemoryBudgetExceeded(estimated, budget)
+        timings.memory['route'] = 'chunked'
+        timings.memory['chunk_rows'] = chunk_rows_for_budget(estimate, budget)
+    
+    traced = random.random() < getattr(settings, 'ANALYTICS_MEMORY_TRACE_RATE', 0.05)
+    with trace_peak_memory(enabled=traced) as trace:
+        if over_budget:
+            summary = compute_summary_statistics_chunked(source, timings, timings.memory['chunk_rows'])
+        else:
+            summary = compute_summary_statistics(source, timings)
+    if traced:
+        timings.memory['traced_peak_bytes'] = trace.peak_bytes
+        timings.memory['concurrent'] = trace.concurrent
+    return summary
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_analytics_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared analytics thread pool, starting it on first use.
+    
+    Threads rather than processes: small uploads are held in memory, not
+    in a file another process could open, and the point is only to keep
+    the summary off the event loop.
+    """
+    global _executor
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'ANALYTICS_EXECUTOR_WORKERS', None) or os.cpu_count(),
+                    thread_name_prefix='analytics'
+                )
+    
+    return _executor
+
+
+def ingest_dataset(user, upload):
+    """
+    Validate, summarize and store an uploaded CSV file.
+    
+    Args:
+        user: Owner of the upload
+        upload: Django UploadedFile that passed serializer validation
+    
+    Returns:
+        The saved DatasetUpload
+    
+    Raises:
+        CSVValidationError: If the CSV is invalid or over the memory budget
+                            (nothing is stored)
+    """
+    timings = PipelineTimings()
+    try:
+        summary = summarize_upload(_csv_source(upload), timings)
+        return _store_dataset(user, upload, summary, timings)
+    finally:
+        metrics.observe_pipeline(timings)
+
+
+async def aingest_dataset(user, upload):
+    """
+    Async version of ``ingest_dataset`` for async views.
+    
+    The summary is computed on the analytics executor; the transaction then
+    runs through ``sync_to_async`` like any other ORM call.
+    
+    Raises:
+        CSVValidationError: If the CSV is invalid (nothing is stored)
+    """
+    loop = asyncio.get_running_loop()
+    timings = PipelineTimings()
+    try:
+        summary = await loop.run_in_executor(
+            get_analytics_executor(), summarize_upload, _csv_source(upload), timings
+        )
+        return await sync_to_async(_store_dataset)(user, upload, summary, timings)
+    finally:
+        metrics.observe_pipeline(timings)
+
+
+def _store_dataset(user, upload, summary, timings):
+    """Save the upload with its precomputed summary in one transaction."""
+    from ..models import DatasetUpload
+    
+    upload.seek(0)
+    
+    dataset = DatasetUpload(user=user, summary_json=summary)
+    try:
+        # Written before the INSERT (as FileField would), timed on its own
+        with timings.stage('file_storage', nbytes=upload.size):
+            dataset.file.save(upload.name, upload, save=False)
+        dataset.stage_timings = timings.as_dict()
+        
+        # Not part of the stored breakdown - the row is being written
+        with timings.stage('database'), transaction.atomic():
+            dataset.save()
+    except Exception:
+        # The file is written to storage before the INSERT; don't orphan it
+        if dataset.file and dataset.file._committed:
+            delete_dataset_files(dataset.file.storage, [dataset.file.name])
+        raise
+    
+    return dataset
@@ -7,11 +7,20 @@ Generates structured analytical reports with:
 - Summary statistics table
 - Distribution visualization
 - Footer with metadata
+- Optional row appendix with per-type subsections (detailed mode)
+
+A single process-wide generator (see ``get_report_generator``) is shared by
+all callers so that stylesheets, font metrics and table templates are built
+once per worker instead of once per report.
 """
 
 import io
+import itertools
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
+from xml.sax.saxutils import escape
 
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -19,28 +28,175 @@ from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
-    Image, PageBreak
+    Image, PageBreak, LongTable, Flowable
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.pdfbase import pdfmetrics
 
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 
+from .analytics import EquipmentRowPartition
+
+
+# Standard Type 1 fonts used by the report; their metrics are loaded lazily
+# by reportlab, so they are touched once during warm-up.
+REPORT_FONTS = ['Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique']
+
+# Table templates are immutable once built and are shared by every report.
+SUMMARY_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('ALIGN', (0, 0), (-1, 0), 'LEFT'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    
+    # Data rows
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#333333')),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.lightgrey]),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+])
+
+FOOTER_DIVIDER_STYLE = TableStyle([
+    ('LINEABOVE', (0, 0), (-1, 0), 1, colors.grey)
+])
+
+APPENDIX_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f2f2f2')]),
+    ('TOPPADDING', (0, 0), (-1, -1), 2),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+])
+
+APPENDIX_HEADER = ['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature']
+
+APPENDIX_COL_WIDTHS = [2.1*inch, 1.3*inch, 1*inch, 1*inch, 1.1*inch]
+
+# Rows buffered per LongTable in the appendix (a little over one page)
+APPENDIX_ROWS_PER_CHUNK = 60
+
+# Longest cell text in the appendix before truncation
+APPENDIX_MAX_CELL_CHARS = 40
+
+
+def _format_appendix_cell(value: Any) -> str:
+    """Format a single appendix cell as short, fixed-width friendly text."""
+    if isinstance(value, float):
+        return '' if value != value else f"{value:.2f}"  # NaN -> blank
+    text = str(value)
+    if len(text) > APPENDIX_MAX_CELL_CHARS:
+        text = text[:APPENDIX_MAX_CELL_CHARS - 3] + '...'
+    return text
+
+
+class StreamingRowTable(Flowable):
+    """
+    Flowable that pulls table rows from an iterator while the page is laid out.
+    
+    Instead of materialising one huge Table, it always asks to be split and,
+    on each split, builds a ``LongTable`` from as many buffered rows as fit
+    the remaining frame, then puts itself back on the story. At most one
+    chunk of rows is held in memory, however many the iterator produces.
+    """
+    
+    def __init__(
+        self,
+        rows: Iterable[Iterable[Any]],
+        header: List[str],
+        col_widths: List[float],
+        style: TableStyle,
+        rows_per_chunk: int = APPENDIX_ROWS_PER_CHUNK
+    ):
+        super().__init__()
+        self._rows = iter(rows)
+        self._header = header
+        self._col_widths = col_widths
+        self._style = style
+        self._rows_per_chunk = rows_per_chunk
+        self._pending: Optional[List[List[str]]] = None
+    
+    def _next_chunk(self) -> Optional[List[List[str]]]:
+        """Top up the buffered rows to a full chunk and return them."""
+        pending = self._pending or []
+        missing = self._rows_per_chunk - len(pending)
+        if missing > 0:
+            pending.extend(
+                [_format_appendix_cell(value) for value in row]
+                for row in itertools.islice(self._rows, missing)
+            )
+        self._pending = pending or None
+        return self._pending
+    
+    def wrap(self, availWidth, availHeight):
+        if self._next_chunk() is None:
+            return (0, 0)
+        # Claim more than the frame has left so that the frame asks us to split
+        return (availWidth, availHeight + 1)
+    
+    def split(self, availWidth, availHeight):
+        chunk = self._next_chunk()
+        if chunk is None:
+            return []
+        
+        table = LongTable(
+            [self._header] + chunk,
+            colWidths=self._col_widths,
+            repeatRows=1
+        )
+        table.setStyle(self._style)
+        
+        parts = table.split(availWidth, availHeight)
+        if not parts:
+            # Not even the header and one row fit - retry in the next frame
+            return []
+        
+        # Rows that did not fit stay buffered for the next frame, so the
+        # header is only repeated at the top of each page
+        consumed = len(parts[0]._cellvalues) - 1
+        self._pending = chunk[consumed:] or None
+        self.__dict__.pop('_postponed', None)
+        return [parts[0], self]
+    
+    def draw(self):
+        pass
+
 
 class PDFReportGenerator:
     """
     Generate analytical PDF reports from dataset analytics.
     
     Academic-style formatting with clear sections and professional layout.
+    
+    Instances hold only read-only state (styles) after construction, so one
+    instance can safely render reports from several threads at once. Use
+    ``get_report_generator()`` rather than constructing one per report.
     """
     
     def __init__(self):
         """Initialize PDF generator with standard page settings."""
         self.page_width, self.page_height = letter
+        stage_start = time.perf_counter()
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self.styles_seconds = time.perf_counter() - stage_start
     
     def _setup_custom_styles(self):
         """Define custom paragraph styles for the report."""
@@ -92,12 +248,31 @@ class PDFReportGenerator:
                 fontName='Helvetica'
             ))
     
+    def warm_up(self) -> None:
+        """
+        Preload fonts and render a tiny report to prime lazy caches.
+        
+        reportlab loads font metrics and matplotlib builds its font cache on
+        first use; doing that here keeps the cost out of the first request.
+        """
+        for font_name in REPORT_FONTS:
+            pdfmetrics.getFont(font_name)
+        
+        self.generate_report(
+            dataset_filename='warmup.csv',
+            upload_timestamp=datetime.now().isoformat(),
+            summary={'total_equipment': 1},
+            distribution=[{'type': 'Warmup', 'count': 1}]
+        )
+    
     def generate_report(
         self, 
         dataset_filename: str,
         upload_timestamp: str,
         summary: Dict[str, Any],
-        distribution: List[Dict[str, Any]]
+        distribution: List[Dict[str, Any]],
+        appendix: Optional[List[Dict[str, Any]]] = None,
+        timings: Optional[Dict[str, float]] = None
     ) -> io.BytesIO:
         """
         Generate complete PDF report.
@@ -107,10 +282,21 @@ class PDFReportGenerator:
             upload_timestamp: ISO format timestamp
             summary: Summary statistics dictionary
             distribution: Equipment type distribution list
-            
+            appendix: Optional per-type sections for the row appendix. Each
+                      dict holds the type's statistics (see
+                      ``compute_type_statistics``) and a 'rows' iterable that
+                      is consumed lazily while the document is laid out.
+            timings: Optional dict that receives per-stage durations in
+                     seconds ('styles', 'story', 'chart', 'build') for
+                     benchmarking. 'styles' is the generator's stylesheet
+                     setup, which is paid once per generator rather than
+                     per report
+        
         Returns:
             BytesIO buffer containing PDF data
         """
+        stage_start = time.perf_counter()
+        
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
             buffer,
@@ -133,15 +319,34 @@ class PDFReportGenerator:
         # Summary statistics section
         story.extend(self._create_summary_section(summary))
         
+        story_seconds = time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
+        
         # Distribution chart section
         story.extend(self._create_distribution_section(distribution))
         
+        chart_seconds = time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
+        
         # Footer
         story.extend(self._create_footer())
         
+        # Row appendix (detailed mode)
+        if appendix is not None:
+            story.extend(self._create_appendix(appendix))
+        
+        story_seconds += time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
+        
         # Build PDF
         doc.build(story)
         
+        if timings is not None:
+            timings['styles'] = self.styles_seconds
+            timings['story'] = story_seconds
+            timings['chart'] = chart_seconds
+            timings['build'] = time.perf_counter() - stage_start
+        
         buffer.seek(0)
         return buffer
     
@@ -169,7 +374,7 @@ class PDFReportGenerator:
             formatted_date = upload_timestamp
         
         subtitle_text = f"""
-        <b>Dataset:</b> {dataset_filename}<br/>
+        <b>Dataset:</b> {escape(dataset_filename)}<br/>
         <b>Generated:</b> {formatted_date}
         """
         subtitle = Paragraph(subtitle_text, self.styles['CustomSubtitle'])
@@ -219,28 +424,7 @@ class PDFReportGenerator:
         
         # Create table
         table = Table(table_data, colWidths=[3*inch, 2*inch])
-        table.setStyle(TableStyle([
-            # Header row
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('ALIGN', (0, 0), (-1, 0), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            
-            # Data rows
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#333333')),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.lightgrey]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        ]))
+        table.setStyle(SUMMARY_TABLE_STYLE)
         
         elements.append(table)
         elements.append(Spacer(1, 0.3*inch))
@@ -280,7 +464,7 @@ class PDFReportGenerator:
         
         Args:
             distribution: List of {type, count} dictionaries
-            
+        
         Returns:
             BytesIO buffer containing PNG image data
         """
@@ -288,8 +472,9 @@ class PDFReportGenerator:
         types = [item['type'] for item in distribution]
         counts = [item['count'] for item in distribution]
         
-        # Create figure
+        # Create figure (object-oriented API only - no pyplot global state)
         fig = Figure(figsize=(6, 3.5), dpi=100)
+        FigureCanvasAgg(fig)
         ax = fig.add_subplot(111)
         
         # Create bar chart
@@ -324,9 +509,6 @@ class PDFReportGenerator:
         fig.savefig(buffer, format='png', bbox_inches='tight', dpi=100)
         buffer.seek(0)
         
-        # Close figure to free memory
-        plt.close(fig)
-        
         return buffer
     
     def _create_footer(self) -> List:
@@ -338,9 +520,7 @@ class PDFReportGenerator:
         # Divider line
         line_data = [['', '']]
         line = Table(line_data, colWidths=[6*inch])
-        line.setStyle(TableStyle([
-            ('LINEABOVE', (0, 0), (-1, 0), 1, colors.grey)
-        ]))
+        line.setStyle(FOOTER_DIVIDER_STYLE)
         elements.append(line)
         elements.append(Spacer(1, 0.1*inch))
         
@@ -353,6 +533,80 @@ class PDFReportGenerator:
         elements.append(footer)
         
         return elements
+    
+    def _create_appendix(self, sections: List[Dict[str, Any]]) -> List:
+        """Create the row appendix with one subsection per equipment type."""
+        elements = [PageBreak()]
+        
+        heading = Paragraph("Appendix: Equipment Rows", self.styles['SectionHeading'])
+        elements.append(heading)
+        
+        if not sections:
+            elements.append(Paragraph("No equipment rows available.", self.styles['BodyText']))
+            return elements
+        
+        for section in sections:
+            elements.append(Paragraph(
+                # Type names come from the CSV; Paragraph parses markup
+                f"Type: {escape(section['type'])}",
+                self.styles['SectionHeading']
+            ))
+            
+            averages = []
+            for label, key in [
+                ('flowrate', 'average_flowrate'),
+                ('pressure', 'average_pressure'),
+                ('temperature', 'average_temperature')
+            ]:
+                value = section.get(key)
+                averages.append(f"{label} {value:.2f}" if value is not None else f"{label} n/a")
+            
+            elements.append(Paragraph(
+                f"<b>Count:</b> {section['count']} &nbsp; "
+                f"<b>Averages:</b> {', '.join(averages)}",
+                self.styles['BodyText']
+            ))
+            
+            elements.append(StreamingRowTable(
+                section['rows'],
+                APPENDIX_HEADER,
+                APPENDIX_COL_WIDTHS,
+                APPENDIX_TABLE_STYLE
+            ))
+        
+        return elements
+
+
+_report_generator = None
+_report_generator_lock = threading.Lock()
+
+
+def get_report_generator() -> PDFReportGenerator:
+    """
+    Return the process-wide PDF report generator, creating it on first use.
+    
+    Returns:
+        Shared PDFReportGenerator instance
+    """
+    global _report_generator
+    
+    if _report_generator is None:
+        with _report_generator_lock:
+            if _report_generator is None:
+                _report_generator = PDFReportGenerator()
+    
+    return _report_generator
+
+
+def warm_report_generator() -> None:
+    """
+    Build and warm the shared generator.
+    
+    Runs as the report pool's process initializer, so each renderer pays
+    the setup cost when it starts rather than on its first report. Web
+    workers never render and do not need it.
+    """
+    get_report_generator().warm_up()
 
 
 def generate_analytics_report(
@@ -369,14 +623,59 @@ def generate_analytics_report(
         upload_timestamp: ISO format timestamp
         summary: Summary statistics
         distribution: Equipment distribution data
-        
+    
     Returns:
         BytesIO buffer with PDF data
     """
-    generator = PDFReportGenerator()
+    generator = get_report_generator()
     return generator.generate_report(
         dataset_filename,
         upload_timestamp,
         summary,
         distribution
     )
+
+
+def generate_detailed_analytics_report(
+    dataset_filename: str,
+    upload_timestamp: str,
+    summary: Dict[str, Any],
+    distribution: List[Dict[str, Any]],
+    file_path: str
+) -> io.BytesIO:
+    """
+    Generate a PDF report with a full row appendix grouped by equipment type.
+    
+    Rows are read from the stored CSV once, in chunks, and spilled to a
+    temporary file grouped by type (``EquipmentRowPartition``), which also
+    yields the per-type statistics; each section streams its type's rows
+    back while the document is laid out, and the cost does not grow with
+    the number of types. The finished PDF itself is held in memory (and
+    returned to the caller whole), so peak memory still grows with the
+    size of the report.
+    
+    Args:
+        dataset_filename: Original CSV filename
+        upload_timestamp: ISO format timestamp
+        summary: Summary statistics
+        distribution: Equipment distribution data
+        file_path: Absolute path to the stored CSV file
+    
+    Returns:
+        BytesIO buffer with PDF data
+    """
+    with EquipmentRowPartition(file_path) as partition:
+        appendix = []
+        for stats in partition.type_statistics():
+            section = dict(stats)
+            section['rows'] = partition.iter_rows(stats['type'])
+            appendix.append(section)
+        
+        generator = get_report_generator()
+        return generator.generate_report(
+            dataset_filename,
+            upload_timestamp,
+            summary,
+            distribution,
+            appendix=appendix
+        )
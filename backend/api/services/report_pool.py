@@ -0,0 +1,534 @@
+"""
+Isolated Process Pool for PDF Report Rendering.
+
+Reports are rendered in a fixed-size pool of long-lived renderer processes,
+never inside the web worker itself. This keeps matplotlib/reportlab state
+out of request threads, lets several reports render in parallel across CPU
+cores, and stops large renders from stalling the API.
+
+Admission control:
+    At most ``workers + queue_size`` renders may be running or waiting at
+    once. Further submissions raise ``ReportPoolFull`` carrying a suggested
+    ``Retry-After`` so that views can answer 429 instead of piling up work.
+
+Recycling:
+    Each renderer process is replaced after ``max_renders_per_worker``
+    renders to cap memory creep from long-running matplotlib/reportlab use.
+
+Recovery:
+    A renderer that dies (killed, or out of memory on a large detailed
+    report) breaks the whole ``ProcessPoolExecutor``. The pool then starts
+    a fresh executor and resubmits the renders that were in flight, up to
+    ``MAX_RENDER_ATTEMPTS`` times each, so only a job that keeps killing
+    its renderer fails. Failures and timeouts raise
+    ``ReportPoolUnavailable``, which views answer with 503.
+
+Workers are started with the ``spawn`` method and only import the PDF
+generator, never touching the database, so they hold no connections.
+"""
+
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from .pdf_generator import (
+    get_report_generator,
+    generate_detailed_analytics_report,
+    warm_report_generator
+)
+
+
+# Upper bounds (seconds) of the render latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Times a render is submitted when its renderer process dies
+MAX_RENDER_ATTEMPTS = 2
+
+# Recently seen renderer pids remembered per worker slot, to tell new
+# (recycled) renderers from ones that already returned a result
+RECENT_PIDS_PER_WORKER = 4
+
+
+class ReportPoolFull(Exception):
+    """
+    Raised when the render queue is full.
+    
+    Attributes:
+        retry_after: Suggested number of seconds before retrying
+    """
+    
+    def __init__(self, retry_after: int):
+        super().__init__(f"Report queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ReportPoolUnavailable(Exception):
+    """
+    Raised when a render fails because of the pool rather than the report:
+    its renderer process died on every attempt, or it timed out.
+    
+    Attributes:
+        retry_after: Suggested number of seconds before retrying
+    """
+    
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _render_report_job(job: Dict[str, Any]) -> Tuple[int, bytes]:
+    """
+    Render a single report inside a pool worker.
+    
+    Args:
+        job: Dictionary with dataset_filename, upload_timestamp, summary
+             and distribution keys, plus file_path for detailed reports
+             (see ``build_report_job``)
+    
+    Returns:
+        Tuple of (worker pid, raw PDF bytes) - the pid lets the parent
+        count worker recycling
+    """
+    if job.get('file_path'):
+        buffer = generate_detailed_analytics_report(
+            job['dataset_filename'],
+            job['upload_timestamp'],
+            job['summary'],
+            job['distribution'],
+            job['file_path']
+        )
+    else:
+        buffer = get_report_generator().generate_report(
+            job['dataset_filename'],
+            job['upload_timestamp'],
+            job['summary'],
+            job['distribution']
+        )
+    return os.getpid(), buffer.getvalue()
+
+
+def build_report_job(dataset, detailed: bool = False) -> Dict[str, Any]:
+    """
+    Extract the picklable inputs needed to render a dataset's report.
+    
+    Args:
+        dataset: DatasetUpload instance (ideally with statistics and
+                 statistics__type_counts prefetched, see report_datasets())
+        detailed: Include the row appendix streamed from the stored file
+    
+    Returns:
+        Dictionary that can be sent to a pool worker
+    """
+    summary = dataset.statistics.as_summary()
+    return {
+        'dataset_id': dataset.id,
+        'dataset_filename': os.path.basename(dataset.file.name),
+        'upload_timestamp': dataset.uploaded_at.isoformat(),
+        'summary': summary,
+        'distribution': summary.get('equipment_distribution', []),
+        'file_path': dataset.file.path if detailed else None
+    }
+
+
+def report_datasets(user):
+    """
+    A user's uploads, newest first, loaded for build_report_job().
+    
+    Reads the typed statistics tables instead of the summary_json blob.
+    """
+    from ..models import DatasetUpload
+    
+    return (
+        DatasetUpload.objects
+        .filter(user=user)
+        .defer('summary_json', 'stage_timings')
+        .select_related('statistics')
+        .prefetch_related('statistics__type_counts')
+    )
+
+
+class ReportRenderPool:
+    """
+    Bounded pool of renderer processes with metrics.
+    
+    Thread-safe: views in different request threads share one instance.
+    """
+    
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        max_renders_per_worker: Optional[int] = None
+    ):
+        """
+        Args:
+            workers: Number of renderer processes
+            queue_size: Renders allowed to wait for a free worker
+            max_renders_per_worker: Replace a worker after this many renders
+                                    (None disables recycling)
+        """
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.max_renders_per_worker = max_renders_per_worker
+        
+        self._executor_kwargs = {
+            'max_workers': workers,
+            'mp_context': multiprocessing.get_context('spawn'),
+            'initializer': warm_report_generator,
+        }
+        # max_tasks_per_child is only available from Python 3.11
+        if max_renders_per_worker and sys.version_info >= (3, 11):
+            self._executor_kwargs['max_tasks_per_child'] = max_renders_per_worker
+        self._executor = ProcessPoolExecutor(**self._executor_kwargs)
+        
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._retried = 0
+        self._restarts = 0
+        self._recent_pids = OrderedDict()
+        self._renderers_seen = 0
+        self._latency_count = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._latency_buckets = [0] * len(LATENCY_BUCKETS)
+    
+    def submit(self, job: Dict[str, Any], block: bool = False,
+               timeout: Optional[float] = None) -> Future:
+        """
+        Queue a report render.
+        
+        Args:
+            job: Report job created by ``build_report_job``
+            block: Wait for a free slot instead of failing immediately
+            timeout: Maximum seconds to wait when blocking
+        
+        Returns:
+            Future resolving to (worker pid, PDF bytes), or failing with
+            ReportPoolUnavailable if the renderer died on every attempt
+        
+        Raises:
+            ReportPoolFull: If no slot is available
+            ReportPoolUnavailable: If the pool cannot accept work
+        """
+        acquired = self._slots.acquire(timeout=timeout) if block else self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            raise ReportPoolFull(self.retry_after())
+        
+        with self._lock:
+            self._depth += 1
+            self._submitted += 1
+        
+        submitted_at = time.monotonic()
+        # Resolved by _on_render_done, across resubmissions to new executors
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            self._start_render(job, future, submitted_at, attempt=1)
+        except Exception as e:
+            self._release(submitted_at)
+            raise ReportPoolUnavailable(
+                f"Report renderer could not be started: {e}", self.retry_after()
+            ) from e
+        return future
+    
+    def render(self, job: Dict[str, Any], timeout: Optional[float] = None) -> bytes:
+        """
+        Render a report and wait for the PDF bytes.
+        
+        Raises:
+            ReportPoolFull: If the queue is full
+            ReportPoolUnavailable: If the renderer died or rendering took
+                                   longer than ``timeout`` seconds
+        """
+        try:
+            _, pdf_bytes = self.submit(job).result(timeout=timeout)
+        except FuturesTimeoutError:
+            raise ReportPoolUnavailable(
+                f"Report rendering did not finish within {timeout:g}s", self.retry_after()
+            )
+        return pdf_bytes
+    
+    def _start_render(self, job: Dict[str, Any], future: Future, submitted_at: float,
+                      attempt: int) -> None:
+        """Submit a render to the current executor, replacing it if it is broken."""
+        executor = self._executor
+        try:
+            inner = executor.submit(_render_report_job, job)
+        except BrokenProcessPool:
+            executor = self._replace_executor(executor)
+            inner = executor.submit(_render_report_job, job)
+        
+        inner.add_done_callback(
+            lambda f: self._on_render_done(f, executor, job, future, submitted_at, attempt)
+        )
+    
+    def _on_render_done(self, inner: Future, executor: ProcessPoolExecutor, job: Dict[str, Any],
+                        future: Future, submitted_at: float, attempt: int) -> None:
+        error = inner.exception() if not inner.cancelled() else ReportPoolUnavailable(
+            "Report render was cancelled", self.retry_after()
+        )
+        
+        if isinstance(error, BrokenProcessPool):
+            # A renderer died; every render in flight on this executor fails
+            self._replace_executor(executor)
+            if attempt < MAX_RENDER_ATTEMPTS:
+                with self._lock:
+                    self._retried += 1
+                try:
+                    self._start_render(job, future, submitted_at, attempt + 1)
+                    return
+                except Exception:
+                    # The new executor cannot take it either; fail this job
+                    pass
+            error = ReportPoolUnavailable(
+                f"Report renderer terminated abruptly ({attempt} attempts)", self.retry_after()
+            )
+        
+        if error is not None:
+            self._release(submitted_at)
+            future.set_exception(error)
+        else:
+            result = inner.result()
+            self._release(submitted_at, worker_pid=result[0])
+            future.set_result(result)
+    
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Start a new executor in place of a broken one (once, however many callers notice)."""
+        # The broken executor's manager thread terminates its processes itself
+        with self._lock:
+            if self._executor is broken:
+                self._executor = ProcessPoolExecutor(**self._executor_kwargs)
+                self._restarts += 1
+            return self._executor
+    
+    def _release(self, submitted_at: float, worker_pid: Optional[int] = None) -> None:
+        """Free a slot and record the outcome of one render (failed without a worker pid)."""
+        elapsed = time.monotonic() - submitted_at
+        
+        with self._lock:
+            self._depth -= 1
+            if worker_pid is None:
+                self._failed += 1
+            else:
+                self._completed += 1
+                self._note_worker_pid(worker_pid)
+                self._latency_count += 1
+                self._latency_sum += elapsed
+                self._latency_max = max(self._latency_max, elapsed)
+                for index, bound in enumerate(LATENCY_BUCKETS):
+                    if elapsed <= bound:
+                        self._latency_buckets[index] += 1
+        
+        self._slots.release()
+    
+    def _note_worker_pid(self, worker_pid: int) -> None:
+        """Count a renderer the first time it returns a result (call with the lock held)."""
+        if worker_pid in self._recent_pids:
+            self._recent_pids.move_to_end(worker_pid)
+            return
+        self._renderers_seen += 1
+        self._recent_pids[worker_pid] = None
+        if len(self._recent_pids) > self.workers * RECENT_PIDS_PER_WORKER:
+            self._recent_pids.popitem(last=False)
+    
+    def retry_after(self) -> int:
+        """Estimate seconds until a slot frees up, from the mean render latency."""
+        with self._lock:
+            mean = self._latency_sum / self._latency_count if self._latency_count else 1.0
+            waiting = max(self._depth - self.workers, 0) + 1
+        return max(1, math.ceil(mean * waiting / self.workers))
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of pool metrics.
+        
+        ``recycled`` counts renderer processes started to replace earlier
+        ones, derived from the distinct worker pids that returned results
+        (only the most recent pids are kept, so memory stays bounded).
+        ``restarts`` counts executors replaced after a renderer died and
+        ``retried`` the renders resubmitted because of it.
+        Latency buckets are cumulative (Prometheus-style "less or equal").
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'max_renders_per_worker': self.max_renders_per_worker,
+                'depth': self._depth,
+                'queued': max(self._depth - self.workers, 0),
+                'submitted': self._submitted,
+                'rejected': self._rejected,
+                'completed': self._completed,
+                'failed': self._failed,
+                'retried': self._retried,
+                'restarts': self._restarts,
+                'recycled': max(self._renderers_seen - self.workers, 0),
+                'latency_seconds': {
+                    'count': self._latency_count,
+                    'sum': round(self._latency_sum, 6),
+                    'max': round(self._latency_max, 6),
+                    'buckets': {
+                        str(bound): count
+                        for bound, count in zip(LATENCY_BUCKETS, self._latency_buckets)
+                    },
+                },
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all renderer processes."""
+        self._executor.shutdown(wait=wait)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_report_pool() -> ReportRenderPool:
+    """
+    Return the shared report render pool, starting it on first use.
+    
+    Configured by ``REPORT_POOL_WORKERS`` (defaults to CPU count),
+    ``REPORT_POOL_QUEUE_SIZE`` and ``REPORT_POOL_MAX_RENDERS_PER_WORKER``.
+    """
+    global _pool
+    
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ReportRenderPool(
+                    workers=getattr(settings, 'REPORT_POOL_WORKERS', None) or os.cpu_count(),
+                    queue_size=getattr(settings, 'REPORT_POOL_QUEUE_SIZE', 8),
+                    max_renders_per_worker=getattr(settings, 'REPORT_POOL_MAX_RENDERS_PER_WORKER', 50)
+                )
+    
+    return _pool
+
+
+class _ZipStreamBuffer:
+    """
+    Write-only, non-seekable sink for ``zipfile``.
+    
+    zipfile falls back to data descriptors when it cannot seek, which lets
+    each member be flushed to the client as soon as it is written.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_report_zip(
+    jobs: Iterable[Dict[str, Any]],
+    pool: Optional[ReportRenderPool] = None
+) -> Iterator[bytes]:
+    """
+    Render reports in the render pool and stream them as a ZIP archive.
+    
+    Jobs are fed to the pool as slots become free, so a large batch never
+    takes more than the pool's capacity. Each report is added to the
+    archive as soon as its worker finishes, so the client starts receiving
+    data before the whole batch is done. A report that takes longer than
+    ``REPORT_POOL_TIMEOUT`` seconds is abandoned and listed in errors.txt,
+    like a failed one, so a hung renderer cannot stall the stream.
+    
+    Args:
+        jobs: Report jobs created by ``build_report_job``
+        pool: Pool to render in (defaults to the shared report pool)
+    
+    Yields:
+        Chunks of the ZIP archive
+    """
+    pool = pool or get_report_pool()
+    timeout = getattr(settings, 'REPORT_POOL_TIMEOUT', 120)
+    
+    remaining = list(jobs)
+    pending: Dict[Future, Dict[str, Any]] = {}
+    deadlines: Dict[Future, float] = {}
+    
+    sink = _ZipStreamBuffer()
+    errors = []
+    
+    # PDFs are already compressed, so members are stored rather than deflated
+    with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        while remaining or pending:
+            # Fill free slots; block for one only when nothing is in flight
+            while remaining:
+                try:
+                    future = pool.submit(remaining[0], block=not pending, timeout=timeout)
+                except ReportPoolFull as e:
+                    if pending:
+                        break
+                    errors.extend(
+                        f"Dataset {job['dataset_id']}: {str(e)}" for job in remaining
+                    )
+                    remaining = []
+                    break
+                except ReportPoolUnavailable as e:
+                    errors.append(f"Dataset {remaining.pop(0)['dataset_id']}: {str(e)}")
+                    continue
+                pending[future] = remaining.pop(0)
+                if timeout is not None:
+                    deadlines[future] = time.monotonic() + timeout
+            
+            if not pending:
+                break
+            
+            wait_seconds = max(min(deadlines.values()) - time.monotonic(), 0) if deadlines else None
+            done, _ = wait(pending, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+            
+            # Abandon renders past their deadline; their slots free up
+            # whenever the renderer finishes
+            now = time.monotonic()
+            for future in [f for f, deadline in deadlines.items() if deadline <= now and f not in done]:
+                job = pending.pop(future)
+                del deadlines[future]
+                errors.append(
+                    f"Dataset {job['dataset_id']}: Report rendering did not finish within {timeout:g}s"
+                )
+            
+            for future in done:
+                job = pending.pop(future)
+                deadlines.pop(future, None)
+                try:
+                    _, pdf_bytes = future.result()
+                except Exception as e:
+                    errors.append(f"Dataset {job['dataset_id']}: {str(e)}")
+                    continue
+                
+                name = f"report_{job['dataset_id']}_{os.path.splitext(job['dataset_filename'])[0]}.pdf"
+                archive.writestr(name, pdf_bytes)
+                yield sink.drain()
+        
+        if errors:
+            archive.writestr('errors.txt', '\n'.join(errors))
+    
+    yield sink.drain()
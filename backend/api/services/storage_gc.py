@@ -0,0 +1,146 @@
+"""
+Dataset File Garbage Collection.
+
+Reconciles ``media/datasets/`` against ``DatasetUpload`` rows:
+
+- Orphaned files (no row references them) older than a grace period are
+  deleted. The grace period protects uploads whose file has been written
+  but whose transaction has not committed yet.
+- Rows whose file is missing from storage are reported, and optionally
+  deleted.
+
+Work is done in bounded batches: each batch of file names costs one
+``IN`` query, and rows are walked by primary key in pages.
+
+With ``DATASET_FILE_DELETION = 'sweeper'`` request paths never delete files
+themselves (see ``delete_dataset_files``); running the sweeper periodically
+(``python manage.py sweep_dataset_files --interval 600``) reclaims them.
+"""
+
+import posixpath
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Iterator, List
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def delete_dataset_files(storage, names) -> None:
+    """
+    Delete dataset files from storage on a request path.
+    
+    Does nothing when ``DATASET_FILE_DELETION`` is ``'sweeper'``; the files
+    are then reclaimed by the next sweep instead.
+    """
+    if getattr(settings, 'DATASET_FILE_DELETION', 'on_commit') == 'sweeper':
+        return
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            pass
+
+
+def sweep_dataset_storage(
+    grace_seconds: int = None,
+    batch_size: int = None,
+    delete_missing: bool = False,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Reclaim orphaned dataset files and find rows whose file is missing.
+    
+    Args:
+        grace_seconds: Keep unreferenced files younger than this
+                       (default: DATASET_GC_GRACE_SECONDS)
+        batch_size: Names/rows checked per query (default: DATASET_GC_BATCH_SIZE)
+        delete_missing: Also delete rows whose file is missing
+        dry_run: Only report what would be done
+    
+    Returns:
+        Report dict with files_scanned, orphans_deleted, bytes_reclaimed,
+        orphans_in_grace, rows_missing_file and rows_deleted
+    """
+    from ..models import DatasetUpload
+    
+    if grace_seconds is None:
+        grace_seconds = getattr(settings, 'DATASET_GC_GRACE_SECONDS', 3600)
+    if batch_size is None:
+        batch_size = getattr(settings, 'DATASET_GC_BATCH_SIZE', 500)
+    
+    field = DatasetUpload._meta.get_field('file')
+    storage = field.storage
+    directory = field.upload_to.rstrip('/')
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+    
+    report = {
+        'files_scanned': 0,
+        'orphans_deleted': 0,
+        'bytes_reclaimed': 0,
+        'orphans_in_grace': 0,
+        'rows_missing_file': 0,
+        'rows_deleted': 0,
+    }
+    
+    # Files without a row
+    try:
+        _, filenames = storage.listdir(directory)
+    except FileNotFoundError:
+        filenames = []
+    
+    for batch in _batched(filenames, batch_size):
+        names = [posixpath.join(directory, filename) for filename in batch]
+        referenced = set(
+            DatasetUpload.objects.filter(file__in=names).values_list('file', flat=True)
+        )
+        report['files_scanned'] += len(names)
+        
+        for name in names:
+            if name in referenced:
+                continue
+            try:
+                if storage.get_modified_time(name) > cutoff:
+                    report['orphans_in_grace'] += 1
+                    continue
+                size = storage.size(name)
+                if not dry_run:
+                    storage.delete(name)
+            except FileNotFoundError:
+                continue
+            report['orphans_deleted'] += 1
+            report['bytes_reclaimed'] += size
+    
+    # Rows without a file
+    last_pk = 0
+    while True:
+        rows = list(
+            DatasetUpload.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', 'file', 'uploaded_at')[:batch_size]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        
+        missing = [
+            pk for pk, name, uploaded_at in rows
+            if uploaded_at < cutoff and not (name and storage.exists(name))
+        ]
+        report['rows_missing_file'] += len(missing)
+        if missing and delete_missing and not dry_run:
+            for dataset in DatasetUpload.objects.filter(pk__in=missing):
+                dataset.delete()
+                report['rows_deleted'] += 1
+    
+    return report
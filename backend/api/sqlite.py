@@ -0,0 +1,27 @@
+"""
+SQLite connection tuning.
+
+When ``SQLITE_CONCURRENCY_PROFILE`` is enabled, ``ApiConfig.ready()``
+connects ``apply_sqlite_pragmas`` to ``connection_created`` so every new
+SQLite connection runs the ``SQLITE_PRAGMAS`` from settings (WAL journal,
+synchronous=NORMAL, busy_timeout, mmap_size). WAL mode is stored in the
+database file; the other pragmas are per connection, which is why they are
+applied on every connect rather than once.
+"""
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver applying SQLITE_PRAGMAS.
+    
+    Connections to other database vendors are left untouched.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
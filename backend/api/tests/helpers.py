@@ -0,0 +1,67 @@
+"""
+Shared fixtures for the API tests.
+
+``APITestCase`` isolates each test class from the working tree: uploads go
+to a temporary MEDIA_ROOT, admission lock files to a temporary directory,
+and the cache is a fresh in-memory one.
+"""
+
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework import test
+from rest_framework.authtoken.models import Token
+
+from api.services import admission
+
+
+SAMPLE_CSV_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_equipment_data.csv')
+
+with open(SAMPLE_CSV_PATH, 'rb') as _f:
+    SAMPLE_CSV = _f.read()
+
+
+class APITestCase(test.APITestCase):
+    """DRF test case with isolated storage, cache and admission slots."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp_dir = tempfile.mkdtemp(prefix='api_tests_')
+        cls._isolation = override_settings(
+            MEDIA_ROOT=os.path.join(cls._tmp_dir, 'media'),
+            ADMISSION_LOCK_DIR=os.path.join(cls._tmp_dir, 'admission'),
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        )
+        cls._isolation.enable()
+        admission._limiters.clear()
+        super().setUpClass()
+    
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        admission._limiters.clear()
+        cls._isolation.disable()
+        shutil.rmtree(cls._tmp_dir, ignore_errors=True)
+    
+    def setUp(self):
+        caches['default'].clear()
+    
+    def create_user(self, username='tester'):
+        """Create a user and return (user, token); self.client authenticates as them."""
+        user = User.objects.create_user(username, password='test-pass-123')
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return user, token
+    
+    def upload(self, data=SAMPLE_CSV, name='equipment.csv'):
+        """POST a CSV to /api/upload/ and return the response."""
+        return self.client.post(
+            '/api/upload/',
+            {'file': SimpleUploadedFile(name, data, content_type='text/csv')},
+            format='multipart'
+        )
@@ -0,0 +1,47 @@
+"""Tests for the shared admission slots in api.services.admission."""
+
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from api.services.admission import USER_LOCK_BUCKETS, AdmissionLimiter, AdmissionRejected
+
+
+class SharedSlotTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.lock_dir = tempfile.mkdtemp(prefix='admission_tests_')
+        self.addCleanup(shutil.rmtree, self.lock_dir, ignore_errors=True)
+    
+    def limiter(self):
+        # Separate instances lock separate open files, like worker processes
+        return AdmissionLimiter('jobs', max_jobs=4, max_jobs_per_user=2, lock_dir=self.lock_dir)
+    
+    def test_lock_files_bounded_by_buckets(self):
+        limiter = self.limiter()
+        for user_id in range(1, 10 * USER_LOCK_BUCKETS):
+            with limiter.admit(user_id):
+                pass
+        self.assertLessEqual(len(os.listdir(self.lock_dir)), USER_LOCK_BUCKETS * 2 + 4)
+    
+    def test_per_user_limit_shared_between_limiters(self):
+        first, second = self.limiter(), self.limiter()
+        tickets = [first.acquire(7), second.acquire(7)]
+        with self.assertRaises(AdmissionRejected) as rejected:
+            second.acquire(7)
+        self.assertTrue(rejected.exception.per_user)
+        # Another user in another bucket is still admitted
+        second.acquire(8).release()
+        for ticket in tickets:
+            ticket.release()
+        second.acquire(7).release()
+    
+    def test_users_in_one_bucket_share_slots(self):
+        first, second = self.limiter(), self.limiter()
+        tickets = [first.acquire(3), first.acquire(3)]
+        with self.assertRaises(AdmissionRejected):
+            second.acquire(3 + USER_LOCK_BUCKETS)
+        for ticket in tickets:
+            ticket.release()
@@ -0,0 +1,40 @@
+"""Tests for the summary statistics in api.services.analytics."""
+
+import json
+
+from django.test import SimpleTestCase
+
+from api.services.analytics import (
+    compute_summary_statistics,
+    compute_summary_statistics_chunked,
+    get_equipment_distribution,
+)
+
+from .helpers import SAMPLE_CSV_PATH
+
+
+class NativeTypeTests(SimpleTestCase):
+    """Summaries hold builtin ints and floats, never NumPy scalars."""
+    
+    def assertNativeSummary(self, summary):
+        self.assertIs(type(summary['total_equipment']), int)
+        for key in ('average_flowrate', 'average_pressure', 'average_temperature'):
+            self.assertIs(type(summary[key]), float, key)
+        self.assertNativeDistribution(summary['equipment_distribution'])
+        # The standard library encoder rejects NumPy scalars
+        json.dumps(summary)
+    
+    def assertNativeDistribution(self, distribution):
+        self.assertTrue(distribution)
+        for entry in distribution:
+            self.assertIs(type(entry['type']), str)
+            self.assertIs(type(entry['count']), int)
+    
+    def test_summary_statistics(self):
+        self.assertNativeSummary(compute_summary_statistics(SAMPLE_CSV_PATH))
+    
+    def test_chunked_summary_statistics(self):
+        self.assertNativeSummary(compute_summary_statistics_chunked(SAMPLE_CSV_PATH, chunk_size=7))
+    
+    def test_equipment_distribution(self):
+        self.assertNativeDistribution(get_equipment_distribution(SAMPLE_CSV_PATH))
@@ -0,0 +1,62 @@
+"""Tests for GET /api/dashboard/."""
+
+from unittest import mock
+
+from api.models import DatasetUpload
+from api.services.dataset_cache import invalidate_latest_dataset
+
+from .helpers import APITestCase
+
+
+class DashboardTests(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.user, _ = self.create_user()
+    
+    def test_no_datasets(self):
+        self.assertEqual(self.client.get('/api/dashboard/').status_code, 404)
+    
+    def test_matches_summary_and_distribution(self):
+        self.upload()
+        dashboard = self.client.get('/api/dashboard/').json()
+        
+        summary = self.client.get('/api/summary/').json()
+        for field, value in dashboard['summary'].items():
+            self.assertEqual(value, summary[field])
+        self.assertEqual(dashboard['distribution'], self.client.get('/api/distribution/').json()['distribution'])
+        self.assertEqual(len(dashboard['history']), 1)
+    
+    def test_query_budget(self):
+        self.upload()
+        self.client.get('/api/summary/')  # Warm the token cache
+        invalidate_latest_dataset(self.user.pk)
+        
+        # History page + stored summary on a cold snapshot cache
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/dashboard/').status_code, 200)
+        
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/api/dashboard/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+    
+    def test_new_upload_replaces_cached_snapshot(self):
+        self.upload()
+        self.client.get('/api/dashboard/')
+        data = b'Equipment Name,Type,Flowrate,Pressure,Temperature\nP-1,Valve,1,2,3\n'
+        self.upload(data)
+        
+        dashboard = self.client.get('/api/dashboard/').json()
+        self.assertEqual(dashboard['summary']['total_equipment'], 1)
+        self.assertEqual(dashboard['distribution'], [{'type': 'Valve', 'count': 1}])
+    
+    def test_latest_deleted_after_history_read(self):
+        self.upload()
+        empty = DatasetUpload.objects.none().values_list('summary_json', flat=True)
+        with mock.patch('api.services.dataset_cache._stored_summary', return_value=empty):
+            response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 404)
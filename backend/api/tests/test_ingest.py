@@ -0,0 +1,60 @@
+"""
+Query-count tests for upload ingestion.
+
+Pins the statements one upload costs (see benchmarks/bench_upload.py for
+timings), so a change to ingest_dataset, DatasetStatistics.store or
+retention pruning that adds queries fails here.
+"""
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from api.models import DatasetStatistics, DatasetUpload
+from api.services.ingest import ingest_dataset
+
+from .helpers import SAMPLE_CSV, APITestCase
+
+
+# SAVEPOINT, INSERT upload/statistics/type counts, SELECT of the user's
+# retention policy, SELECT of uploads beyond the limit, RELEASE SAVEPOINT
+# (tests run inside a transaction, so the ingest transaction is a savepoint)
+INGEST_QUERIES = 7
+
+# Pruning adds the deletion collector's SELECTs (statistics, type counts)
+# and one DELETE each for type counts, statistics and uploads
+PRUNE_QUERIES = 5
+
+
+def csv_file(index=0):
+    """The sample CSV plus one row, so each upload has a distinct summary."""
+    data = SAMPLE_CSV + f'Extra-{index},Pump,1,2,3\n'.encode()
+    return SimpleUploadedFile(f'equipment-{index}.csv', data, content_type='text/csv')
+
+
+@override_settings(MAX_DATASET_HISTORY=2)
+class IngestQueryCountTests(APITestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.user, _ = self.create_user()
+    
+    def test_ingest_without_pruning(self):
+        with self.assertNumQueries(INGEST_QUERIES):
+            dataset = ingest_dataset(self.user, csv_file())
+        
+        self.assertEqual(dataset.statistics.total_equipment, dataset.summary_json['total_equipment'])
+    
+    def test_ingest_with_pruning(self):
+        for index in range(2):
+            ingest_dataset(self.user, csv_file(index))
+        
+        with self.assertNumQueries(INGEST_QUERIES + PRUNE_QUERIES):
+            ingest_dataset(self.user, csv_file(2))
+        self.assertEqual(DatasetUpload.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(DatasetStatistics.objects.filter(user=self.user).count(), 2)
+    
+    def test_upload_view(self):
+        self.client.get('/api/history/')  # Warm the token cache
+        
+        with self.assertNumQueries(INGEST_QUERIES):
+            self.assertEqual(self.upload().status_code, 201)
@@ -0,0 +1,69 @@
+"""Tests for the report render pool bookkeeping and batch ZIP streaming."""
+
+import io
+import time
+import zipfile
+from concurrent.futures import Future
+
+from django.test import SimpleTestCase, override_settings
+
+from api.services.report_pool import ReportRenderPool, stream_report_zip
+
+
+class FakePool:
+    """Stands in for ReportRenderPool; renders listed in ``hung`` never finish."""
+    
+    def __init__(self, hung=()):
+        self.hung = set(hung)
+    
+    def submit(self, job, block=False, timeout=None):
+        future = Future()
+        if job['dataset_id'] not in self.hung:
+            future.set_result((0, b'%PDF-' + str(job['dataset_id']).encode()))
+        return future
+
+
+def job(dataset_id):
+    return {'dataset_id': dataset_id, 'dataset_filename': f'data_{dataset_id}.csv'}
+
+
+class StreamReportZipTests(SimpleTestCase):
+    
+    @override_settings(REPORT_POOL_TIMEOUT=0.2)
+    def test_hung_render_is_abandoned_after_timeout(self):
+        start = time.monotonic()
+        body = b''.join(stream_report_zip([job(1), job(2), job(3)], pool=FakePool(hung={2})))
+        
+        self.assertLess(time.monotonic() - start, 5)
+        archive = zipfile.ZipFile(io.BytesIO(body))
+        self.assertEqual(
+            sorted(archive.namelist()),
+            ['errors.txt', 'report_1_data_1.pdf', 'report_3_data_3.pdf']
+        )
+        self.assertIn(b'Dataset 2: Report rendering did not finish within 0.2s', archive.read('errors.txt'))
+
+
+class PoolMetricsTests(SimpleTestCase):
+    
+    def setUp(self):
+        self.pool = ReportRenderPool(workers=2, queue_size=0)
+        self.addCleanup(self.pool.shutdown)
+    
+    def complete(self, worker_pid):
+        self.pool._slots.acquire()
+        with self.pool._lock:
+            self.pool._depth += 1
+        self.pool._release(time.monotonic(), worker_pid=worker_pid)
+    
+    def test_recycled_counts_new_renderers_with_bounded_memory(self):
+        for _ in range(3):
+            self.complete(100)
+            self.complete(101)
+        self.assertEqual(self.pool.metrics()['recycled'], 0)
+        
+        for pid in range(1000, 1100):
+            self.complete(pid)
+        metrics = self.pool.metrics()
+        self.assertEqual(metrics['recycled'], 100)
+        self.assertEqual(metrics['completed'], 106)
+        self.assertLessEqual(len(self.pool._recent_pids), 8)
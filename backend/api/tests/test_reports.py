@@ -0,0 +1,60 @@
+"""Tests for PDF report generation (api.services.pdf_generator)."""
+
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from api.services.analytics import EquipmentRowPartition, compute_summary_statistics, compute_type_statistics
+from api.services.pdf_generator import PDFReportGenerator, generate_detailed_analytics_report
+
+
+ROWS = [
+    ('P-1', 'Pump', '10', '2.5', '80'),
+    ('V-1', 'Valve<DN50> & <b>co', '4', '1.5', '60'),
+    ('P-2', 'Pump', '12', '3.5', '90'),
+    ('H-1', 'Heat "Exchanger"', '7', '1.0', '120'),
+    ('V-2', 'Valve<DN50> & <b>co', '6', '2.0', '70'),
+]
+
+
+class DetailedReportTests(SimpleTestCase):
+    
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as f:
+            f.write('Equipment Name,Type,Flowrate,Pressure,Temperature\n')
+            f.writelines(','.join(row) + '\n' for row in ROWS)
+        self.addCleanup(os.remove, self.path)
+    
+    def test_partition_statistics_match_separate_pass(self):
+        with EquipmentRowPartition(self.path, chunk_size=2) as partition:
+            self.assertEqual(partition.type_statistics(), compute_type_statistics(self.path, chunk_size=2))
+            self.assertEqual(
+                [row[0] for row in partition.iter_rows('Valve<DN50> & <b>co')],
+                ['V-1', 'V-2']
+            )
+    
+    def test_markup_in_type_names(self):
+        summary = compute_summary_statistics(self.path)
+        buffer = generate_detailed_analytics_report(
+            'rows<1> & more.csv',
+            '2024-01-01T00:00:00',
+            summary,
+            summary['equipment_distribution'],
+            self.path
+        )
+        self.assertTrue(buffer.getvalue().startswith(b'%PDF'))
+    
+    def test_stage_timings(self):
+        summary = compute_summary_statistics(self.path)
+        timings = {}
+        PDFReportGenerator().generate_report(
+            'equipment.csv',
+            '2024-01-01T00:00:00',
+            summary,
+            summary['equipment_distribution'],
+            timings=timings
+        )
+        self.assertEqual(set(timings), {'styles', 'story', 'chart', 'build'})
+        self.assertGreater(timings['styles'], 0)
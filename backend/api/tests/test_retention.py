@@ -0,0 +1,48 @@
+"""Tests for upload history retention (DatasetUpload.prune_history)."""
+
+from django.core.exceptions import ValidationError
+from django.test import override_settings
+
+from api.models import DatasetStatistics, DatasetUpload, EquipmentTypeCount, RetentionPolicy
+
+from .helpers import SAMPLE_CSV, APITestCase
+
+
+def variant(index):
+    """The sample CSV plus one row, so each upload has a distinct summary."""
+    return SAMPLE_CSV + f'Extra-{index},Pump,1,2,3\n'.encode()
+
+
+class RetentionTests(APITestCase):
+    
+    @override_settings(MAX_DATASET_HISTORY=2)
+    def test_keeps_newest_uploads_without_orphans(self):
+        user, _ = self.create_user()
+        ids = [self.upload(variant(i)).json()['dataset']['id'] for i in range(4)]
+        
+        kept = set(DatasetUpload.objects.filter(user=user).values_list('pk', flat=True))
+        self.assertEqual(kept, set(ids[-2:]))
+        self.assertEqual(set(DatasetStatistics.objects.values_list('dataset_id', flat=True)), kept)
+        self.assertEqual(set(EquipmentTypeCount.objects.values_list('statistics_id', flat=True)), kept)
+    
+    @override_settings(MAX_DATASET_HISTORY=0)
+    def test_zero_limit_keeps_the_new_upload(self):
+        user, _ = self.create_user()
+        self.upload(variant(0))
+        response = self.upload(variant(1))
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(DatasetUpload.objects.filter(user=user).values_list('pk', flat=True)),
+            [response.json()['dataset']['id']]
+        )
+    
+    def test_policy_overrides_default_and_rejects_zero(self):
+        user, _ = self.create_user()
+        RetentionPolicy.objects.create(user=user, max_uploads=1)
+        for i in range(3):
+            self.upload(variant(i))
+        self.assertEqual(DatasetUpload.objects.filter(user=user).count(), 1)
+        
+        with self.assertRaises(ValidationError):
+            RetentionPolicy(user=user, max_uploads=0).full_clean()
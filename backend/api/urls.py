@@ -2,11 +2,20 @@
 URL routing for API endpoints.
 
 All endpoints are prefixed with /api/ by the main urls.py
+
+With API_ASYNC_VIEWS enabled (ASGI deployments) the data endpoints are
+served by the async views in api.async_views.
 """
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if getattr(settings, 'API_ASYNC_VIEWS', False):
+    from . import async_views as data_views
+else:
+    data_views = views
+
 urlpatterns = [
     # Authentication endpoints
     path('auth/register/', views.register_user, name='register'),
@@ -14,11 +23,17 @@ urlpatterns = [
     path('auth/logout/', views.logout_user, name='logout'),
     
     # Data handling endpoints
-    path('upload/', views.upload_dataset, name='upload'),
-    path('summary/', views.get_summary, name='summary'),
-    path('distribution/', views.get_distribution, name='distribution'),
-    path('history/', views.get_history, name='history'),
+    path('upload/', data_views.upload_dataset, name='upload'),
+    path('summary/', data_views.get_summary, name='summary'),
+    path('distribution/', data_views.get_distribution, name='distribution'),
+    path('history/', data_views.get_history, name='history'),
+    path('dashboard/', data_views.get_dashboard, name='dashboard'),
     
     # Report generation
     path('report/pdf/', views.generate_pdf_report, name='pdf_report'),
+    path('report/batch/', views.generate_batch_report, name='batch_report'),
+    path('report/pool/', views.get_report_pool_metrics, name='report_pool_metrics'),
+    
+    # Operations
+    path('metrics/', views.get_metrics, name='metrics'),
 ]
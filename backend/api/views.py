@@ -15,15 +15,26 @@ Endpoints:
         - GET /api/summary/
         - GET /api/distribution/
         - GET /api/history/
+        - GET /api/dashboard/
+    
+    Reports:
+        - GET /api/report/pdf/
+        - POST /api/report/batch/
+        - GET /api/report/pool/
+    
+    Operations:
+        - GET /api/metrics/
 """
 
 import os
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.authtoken.models import Token
 
 from .models import DatasetUpload
@@ -36,12 +47,67 @@ from .serializers import (
     HistorySerializer
 )
 from .services.analytics import (
-    compute_summary_statistics,
     get_equipment_distribution,
     CSVValidationError
 )
-from .services.pdf_generator import generate_analytics_report
-from django.http import HttpResponse
+from .services.ingest import ingest_dataset
+from .services.admission import AdmissionRejected, AdmittedStream, get_admission_limiter
+from .services.dataset_cache import get_latest_dataset_snapshot, latest_dataset_version, snapshot_for_upload
+from .services.report_pool import (
+    build_report_job,
+    get_report_pool,
+    report_datasets,
+    stream_report_zip,
+    ReportPoolFull,
+    ReportPoolUnavailable
+)
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
+
+from . import metrics
+from .etags import latest_dataset_etag, history_etag, pdf_report_etag, dashboard_etag
+from .pagination import HistoryKeysetPagination
+
+
+def _is_true(value) -> bool:
+    """Interpret a query/body flag such as "true", "1" or True."""
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def _report_queue_full_response(error: ReportPoolFull) -> Response:
+    """Build the 429 response returned when the report render queue is full."""
+    return Response({
+        'error': 'Report queue is full',
+        'details': f'Too many reports are being generated, retry in {error.retry_after} seconds'
+    }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={
+        'Retry-After': str(error.retry_after)
+    })
+
+
+def _report_unavailable_response(error: ReportPoolUnavailable) -> Response:
+    """Build the 503 response returned when the render pool fails or times out."""
+    return Response({
+        'error': 'Report service unavailable',
+        'details': f'{error}, retry in {error.retry_after} seconds'
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={
+        'Retry-After': str(error.retry_after)
+    })
+
+
+def _admission_rejected_response(error: AdmissionRejected) -> Response:
+    """Build the 429 response returned when a job is not admitted."""
+    if error.per_user:
+        details = f'You already have jobs running, retry in {error.retry_after} seconds'
+    else:
+        details = f'The server is busy, retry in {error.retry_after} seconds'
+    return Response({
+        'error': 'Too many concurrent jobs',
+        'details': details
+    }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={
+        'Retry-After': str(error.retry_after)
+    })
 
 
 # ================================
@@ -194,26 +260,35 @@ def upload_dataset(request):
         - Pressure (numeric)
         - Temperature (numeric)
     
+    Analytics jobs are admission-controlled: over the concurrency limits
+    the request is rejected before the CSV is parsed.
+    
     Returns:
         201: Upload successful with computed summary
         400: Validation errors or invalid CSV format
+        429: Too many concurrent uploads (see Retry-After header)
     """
+    try:
+        ticket = get_admission_limiter('analytics').acquire(request.user.id)
+    except AdmissionRejected as e:
+        return _admission_rejected_response(e)
+    
+    try:
+        return _upload_dataset(request)
+    finally:
+        ticket.release()
+
+
+def _upload_dataset(request):
+    """Validate and ingest an upload once it has been admitted."""
     serializer = DatasetUploadSerializer(data=request.data)
     
     if serializer.is_valid():
         try:
-            # Save the upload (this will handle 5-upload limit automatically)
-            dataset = serializer.save(user=request.user)
-            
-            # Get file path
-            file_path = dataset.file.path
-            
-            # Compute analytics using service layer
-            summary = compute_summary_statistics(file_path)
-            
-            # Store summary in model
-            dataset.summary_json = summary
-            dataset.save()
+            # Summarize, then store with one INSERT (this also handles the
+            # upload history limit) in a single transaction
+            dataset = ingest_dataset(request.user, serializer.validated_data['file'])
+            summary = dataset.summary_json
             
             return Response({
                 'message': 'Dataset uploaded successfully',
@@ -223,24 +298,14 @@ def upload_dataset(request):
                     'summary': summary
                 }
             }, status=status.HTTP_201_CREATED)
-            
+        
         except CSVValidationError as e:
-            # Delete the uploaded file if validation fails
-            if hasattr(dataset, 'file') and dataset.file:
-                dataset.file.delete()
-                dataset.delete()
-            
             return Response({
                 'error': 'CSV validation failed',
                 'details': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         
         except Exception as e:
-            # Clean up on unexpected errors
-            if 'dataset' in locals() and hasattr(dataset, 'file'):
-                dataset.file.delete()
-                dataset.delete()
-            
             return Response({
                 'error': 'Upload failed',
                 'details': str(e)
@@ -254,6 +319,7 @@ def upload_dataset(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=latest_dataset_etag)
 def get_summary(request):
     """
     Get analytics summary from the most recent dataset.
@@ -263,27 +329,26 @@ def get_summary(request):
     Headers:
         - Authorization: Token <token>
     
+    Supports conditional GET: responses carry an ETag and a matching
+    If-None-Match is answered with 304.
+    
     Returns:
         200: Summary statistics
+        304: Not modified
         404: No datasets found
     """
     try:
-        # Get the most recent dataset for this user
-        dataset = DatasetUpload.objects.filter(user=request.user).first()
+        # Get the most recent dataset for this user (cached per user)
+        latest = get_latest_dataset_snapshot(request.user)
         
-        if not dataset:
+        if not latest:
             return Response({
                 'error': 'No datasets found',
                 'details': 'Please upload a dataset first'
             }, status=status.HTTP_404_NOT_FOUND)
         
         # Return stored summary
-        return Response({
-            'total_equipment': dataset.summary_json.get('total_equipment', 0),
-            'average_flowrate': dataset.summary_json.get('average_flowrate', 0),
-            'average_pressure': dataset.summary_json.get('average_pressure', 0),
-            'average_temperature': dataset.summary_json.get('average_temperature', 0)
-        }, status=status.HTTP_200_OK)
+        return Response(latest['summary'], status=status.HTTP_200_OK)
     
     except Exception as e:
         return Response({
@@ -294,6 +359,7 @@ def get_summary(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=latest_dataset_etag)
 def get_distribution(request):
     """
     Get equipment type distribution from the most recent dataset.
@@ -303,25 +369,26 @@ def get_distribution(request):
     Headers:
         - Authorization: Token <token>
     
+    Supports conditional GET (ETag / If-None-Match).
+    
     Returns:
         200: Equipment type distribution
+        304: Not modified
         404: No datasets found
     """
     try:
-        # Get the most recent dataset for this user
-        dataset = DatasetUpload.objects.filter(user=request.user).first()
+        # Get the most recent dataset for this user (cached per user)
+        latest = get_latest_dataset_snapshot(request.user)
         
-        if not dataset:
+        if not latest:
             return Response({
                 'error': 'No datasets found',
                 'details': 'Please upload a dataset first'
             }, status=status.HTTP_404_NOT_FOUND)
         
         # Return equipment distribution from stored summary
-        distribution = dataset.summary_json.get('equipment_distribution', [])
-        
         return Response({
-            'distribution': distribution
+            'distribution': latest['distribution']
         }, status=status.HTTP_200_OK)
     
     except Exception as e:
@@ -335,25 +402,49 @@ def get_distribution(request):
 @permission_classes([IsAuthenticated])
 def get_history(request):
     """
-    Get upload history (last 5 uploads).
+    Get upload history, newest first, one page at a time.
     
     Endpoint: GET /api/history/
     
     Headers:
         - Authorization: Token <token>
     
+    Query parameters:
+        - cursor: next_cursor from the previous page (omit for the first page)
+        - page_size: Uploads per page (default HISTORY_PAGE_SIZE)
+    
+    Uses keyset pagination on (uploaded_at, id), so every page costs one
+    indexed query regardless of how long the history is. Supports
+    conditional GET (ETag / If-None-Match).
+    
     Returns:
-        200: List of past uploads
+        200: {history: [...], next_cursor: str or null}
+        304: Not modified
+        400: Invalid cursor or page_size
     """
     try:
-        # Get all datasets for this user (already limited to 5 by model)
-        datasets = DatasetUpload.objects.filter(user=request.user)
+        paginator = HistoryKeysetPagination()
+        page = paginator.paginate_queryset(
+            DatasetUpload.objects
+            .filter(user=request.user)
+            .only('id', 'file', 'uploaded_at'),
+            request
+        )
         
-        serializer = HistorySerializer(datasets, many=True)
+        etag = quote_etag(history_etag(page, paginator.next_cursor))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
         
+        response = paginator.get_paginated_response(HistorySerializer(page, many=True).data)
+        response['ETag'] = etag
+        return response
+    
+    except ValidationError as e:
         return Response({
-            'history': serializer.data
-        }, status=status.HTTP_200_OK)
+            'error': 'Invalid request',
+            'details': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
     
     except Exception as e:
         return Response({
@@ -364,6 +455,75 @@ def get_history(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+def get_dashboard(request):
+    """
+    Get summary, distribution and history in a single response.
+    
+    Endpoint: GET /api/dashboard/
+    
+    Headers:
+        - Authorization: Token <token>
+    
+    Replaces the three round trips to /summary/, /distribution/ and
+    /history/. Uses at most two queries: one for the first history page
+    and one for the latest upload's stored summary_json (skipped when the
+    per-user dataset cache holds it). The ETag is derived from the history
+    rows, so a matching If-None-Match is answered with 304 after the first
+    query. Further
+    history pages come from /history/?cursor=<history_next_cursor>.
+    
+    Returns:
+        200: {summary, distribution, history, history_next_cursor}
+        304: Not modified
+        404: No datasets found
+    """
+    try:
+        # Read before the history, so a snapshot cached below can never
+        # outlive an upload that commits in between
+        version = latest_dataset_version(request.user.pk)
+        paginator = HistoryKeysetPagination()
+        history = paginator.paginate(
+            DatasetUpload.objects
+            .filter(user=request.user)
+            .only('id', 'file', 'uploaded_at', 'summary_hash')
+        )
+        
+        if not history:
+            return Response({
+                'error': 'No datasets found',
+                'details': 'Please upload a dataset first'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        etag = quote_etag(dashboard_etag(history, paginator.next_cursor))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        latest = snapshot_for_upload(request.user.pk, history[0], version)
+        if latest is None:
+            # The latest upload was deleted after the history was read
+            return Response({
+                'error': 'No datasets found',
+                'details': 'Please upload a dataset first'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'summary': latest['summary'],
+            'distribution': latest['distribution'],
+            'history': HistorySerializer(history, many=True).data,
+            'history_next_cursor': paginator.next_cursor
+        }, status=status.HTTP_200_OK, headers={'ETag': etag})
+    
+    except Exception as e:
+        return Response({
+            'error': 'Failed to retrieve dashboard',
+            'details': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@condition(etag_func=pdf_report_etag)
 def generate_pdf_report(request):
     """
     Generate and download PDF analytical report.
@@ -373,14 +533,26 @@ def generate_pdf_report(request):
     Headers:
         - Authorization: Token <token>
     
+    Query parameters:
+        - detailed (optional): "true" to append every equipment row,
+          grouped by type, streamed from the stored dataset
+    
+    The report is rendered in the isolated report process pool. Supports
+    conditional GET (ETag / If-None-Match), so unchanged reports are not
+    re-rendered.
+    
     Returns:
         200: PDF file download
+        304: Not modified
         404: No datasets found
+        429: Report queue is full or too many of the user's reports are
+             rendering (see Retry-After header)
+        503: Renderer died or rendering timed out (see Retry-After header)
         400: PDF generation error
     """
     try:
         # Get the most recent dataset for this user
-        dataset = DatasetUpload.objects.filter(user=request.user).first()
+        dataset = report_datasets(request.user).first()
         
         if not dataset:
             return Response({
@@ -388,33 +560,165 @@ def generate_pdf_report(request):
                 'details': 'Please upload a dataset first'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Extract filename from uploaded file path
-        import os
-        dataset_filename = os.path.basename(dataset.file.name)
-        
-        # Get summary and distribution data
-        summary = dataset.summary_json
-        distribution = summary.get('equipment_distribution', [])
-        
-        # Generate PDF
-        pdf_buffer = generate_analytics_report(
-            dataset_filename=dataset_filename,
-            upload_timestamp=dataset.uploaded_at.isoformat(),
-            summary=summary,
-            distribution=distribution
+        job = build_report_job(
+            dataset,
+            detailed=_is_true(request.query_params.get('detailed'))
         )
         
+        # Generate PDF in the report pool
+        with get_admission_limiter('reports').admit(request.user.id):
+            pdf_bytes = get_report_pool().render(
+                job,
+                timeout=getattr(settings, 'REPORT_POOL_TIMEOUT', 120)
+            )
+        
         # Create HTTP response with PDF
         response = HttpResponse(
-            pdf_buffer.getvalue(),
+            pdf_bytes,
             content_type='application/pdf'
         )
         response['Content-Disposition'] = f'attachment; filename="equipment_analytics_report.pdf"'
         
         return response
     
+    except AdmissionRejected as e:
+        return _admission_rejected_response(e)
+    
+    except ReportPoolFull as e:
+        return _report_queue_full_response(e)
+    
+    except ReportPoolUnavailable as e:
+        return _report_unavailable_response(e)
+    
     except Exception as e:
         return Response({
             'error': 'Failed to generate PDF report',
             'details': str(e)
         }, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def generate_batch_report(request):
+    """
+    Generate PDF reports for several datasets and download them as a ZIP.
+    
+    Endpoint: POST /api/report/batch/
+    
+    Headers:
+        - Authorization: Token <token>
+    
+    Request body:
+        - dataset_ids (list of int, optional): Datasets to include.
+          Defaults to the user's whole upload history.
+        - detailed (bool, optional): Include row appendices
+    
+    Reports are rendered in parallel in the report process pool and each
+    one is streamed into the archive as soon as it finishes.
+    
+    Returns:
+        200: ZIP archive streamed as reports complete
+        400: Invalid dataset_ids
+        404: No matching datasets found
+        429: Report queue is full or too many of the user's reports are
+             rendering (see Retry-After header)
+    """
+    dataset_ids = request.data.get('dataset_ids')
+    
+    datasets = report_datasets(request.user)
+    
+    if dataset_ids is not None:
+        if not isinstance(dataset_ids, list):
+            return Response({
+                'error': 'Invalid request',
+                'details': 'dataset_ids must be a list of dataset ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            dataset_ids = [int(dataset_id) for dataset_id in dataset_ids]
+        except (TypeError, ValueError):
+            return Response({
+                'error': 'Invalid request',
+                'details': 'dataset_ids must contain only integers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        datasets = datasets.filter(id__in=dataset_ids)
+    
+    # Collect job inputs now - the response body is produced after the view returns
+    detailed = _is_true(request.data.get('detailed'))
+    jobs = [build_report_job(dataset, detailed=detailed) for dataset in datasets]
+    
+    if not jobs:
+        return Response({
+            'error': 'No datasets found',
+            'details': 'Please upload a dataset first'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    # Admission check - the batch itself is fed to the pool as slots free up
+    pool = get_report_pool()
+    if pool.metrics()['depth'] >= pool.capacity:
+        return _report_queue_full_response(ReportPoolFull(pool.retry_after()))
+    
+    try:
+        ticket = get_admission_limiter('reports').acquire(request.user.id)
+    except AdmissionRejected as e:
+        return _admission_rejected_response(e)
+    
+    # The slot is held until the archive has been streamed
+    response = StreamingHttpResponse(
+        AdmittedStream(stream_report_zip(jobs, pool=pool), ticket),
+        content_type='application/zip'
+    )
+    response['Content-Disposition'] = 'attachment; filename="equipment_analytics_reports.zip"'
+    
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_report_pool_metrics(request):
+    """
+    Report render pool metrics for operators.
+    
+    Endpoint: GET /api/report/pool/
+    
+    Headers:
+        - Authorization: Token <token> (staff user)
+    
+    Returns:
+        200: Pool depth, render counts, recycle count and latency histogram
+    """
+    return Response(get_report_pool().metrics(), status=status.HTTP_200_OK)
+
+
+# ================================
+# OPERATIONS ENDPOINTS
+# ================================
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_metrics(request):
+    """
+    Request metrics in the Prometheus text format.
+    
+    Endpoint: GET /api/metrics/
+    
+    Headers:
+        - Authorization: Token <token> (staff user)
+    
+    Latency histograms, status counts, in-flight gauges and response sizes
+    per URL name, aggregated over all worker processes when
+    METRICS_MULTIPROC_DIR is set (see api.metrics).
+    
+    Returns:
+        200: Metrics in text/plain; version=0.0.4
+        503: prometheus_client is not installed
+    """
+    if not metrics.metrics_enabled():
+        return Response({
+            'error': 'Metrics unavailable',
+            'details': 'Install prometheus-client to record request metrics'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    body, content_type = metrics.render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -5,6 +5,7 @@ Production-quality configuration with token-based authentication,
 CORS support for both React web and PyQt5 desktop frontends.
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -38,14 +39,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',  # First, so request latency includes all other middleware
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS must be before CommonMiddleware
+    'api.middleware.CompressionMiddleware',  # Before anything else that reads or writes the body
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProfilingMiddleware',  # Last, so a profile covers the view
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -76,6 +80,32 @@ DATABASES = {
     }
 }
 
+# Opt-in SQLite concurrency profile: SQLITE_PRAGMAS are applied to every new
+# connection (api.sqlite, via connection_created) and connections persist
+# across requests. Recommended when several workers upload concurrently.
+SQLITE_CONCURRENCY_PROFILE = False
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',  # Readers no longer block the writer (and vice versa)
+    'synchronous': 'NORMAL',  # fsync at checkpoints only; safe with WAL
+    'busy_timeout': 5000,  # Milliseconds to wait for a lock before "database is locked"
+    'mmap_size': 268435456,  # Map up to 256 MB of the database file
+}
+if SQLITE_CONCURRENCY_PROFILE:
+    DATABASES['default']['CONN_MAX_AGE'] = 600
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Cache - file-based so that every worker process on the host shares entries
+# and sees invalidations immediately, without running an external service
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -112,13 +142,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.renderers.FastJSONRenderer',  # orjson when installed, else DRF's JSONRenderer
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -127,6 +157,10 @@ REST_FRAMEWORK = {
     ],
 }
 
+# MessagePack responses (Accept: application/msgpack) when msgpack is installed
+if importlib.util.find_spec('msgpack'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('api.renderers.MessagePackRenderer')
+
 # CORS Configuration - Allow both web and desktop clients
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React development server
@@ -142,4 +176,57 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 
 # Application-specific settings
-MAX_DATASET_HISTORY = 5  # Only keep last 5 uploads
+MAX_DATASET_HISTORY = 5  # Uploads kept per user, at least 1 (None = unlimited); per-user override: RetentionPolicy
+HISTORY_PAGE_SIZE = 50  # Uploads per /api/history/ page
+HISTORY_MAX_PAGE_SIZE = 500  # Largest page_size a client may request
+
+# Dataset file garbage collection (python manage.py sweep_dataset_files)
+DATASET_FILE_DELETION = 'on_commit'  # 'on_commit' or 'sweeper' (requests never delete files)
+DATASET_GC_GRACE_SECONDS = 3600  # Unreferenced files younger than this are kept
+DATASET_GC_BATCH_SIZE = 500  # Files/rows checked per database query
+
+# Serve the data endpoints with the async views (api.async_views). Enable when
+# running under an ASGI server: uvicorn backend.asgi:application
+API_ASYNC_VIEWS = False
+ANALYTICS_EXECUTOR_WORKERS = None  # Threads computing upload summaries for async views; None = one per CPU core
+
+# Response compression (api.middleware.CompressionMiddleware)
+API_COMPRESSION_MIN_BYTES = 1024  # Smaller responses are sent uncompressed
+API_COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']  # Server preference; zstd/br need zstandard/brotli
+API_COMPRESSION_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 6}  # Fast levels suited to dynamic responses
+
+# Admission control (api.services.admission). Limits are shared by every worker
+# process on the host; requests over a limit get 429 with Retry-After
+ANALYTICS_MAX_CONCURRENT_JOBS = 2  # Uploads computing summaries at once; None = unlimited
+ANALYTICS_MAX_JOBS_PER_USER = 1  # Uploads one user may have in progress
+REPORT_MAX_CONCURRENT_JOBS = None  # PDF/batch report requests at once; None = bounded by the render pool only
+REPORT_MAX_JOBS_PER_USER = 2  # Report requests one user may have in progress
+ADMISSION_LOCK_DIR = BASE_DIR / 'admission'  # Slot lock files; None = limits per worker process
+
+# Upload memory budget (api.services.ingest). The summary's peak memory is
+# estimated from the first rows of each upload before the full parse
+ANALYTICS_MEMORY_BUDGET_BYTES = 256 * 1024 * 1024  # Largest estimated peak summarized in memory; None = no limit
+ANALYTICS_OVER_BUDGET = 'chunked'  # 'chunked' (bounded-memory pass) or 'reject' (400)
+ANALYTICS_MEMORY_TRACE_RATE = 0.05  # Fraction of uploads whose actual peak is traced; tracemalloc slows the summary
+
+# Request metrics served at /api/metrics/ (api.metrics, needs prometheus_client).
+# With several worker processes, point this at a directory shared by all of them
+METRICS_MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+# On-demand profiling for staff (api.profiling): send "X-Profile: 1" or ?profile=1
+PROFILING_DIR = BASE_DIR / 'profiles'  # Where profiles are written; None disables profiling
+PROFILING_PROFILER = 'auto'  # 'auto' (pyinstrument if installed), 'cprofile' or 'sampling'
+
+# PDF report render pool (isolated renderer processes)
+REPORT_POOL_WORKERS = None  # None = one per CPU core
+REPORT_POOL_QUEUE_SIZE = 8  # Renders allowed to wait; beyond this requests get 429
+REPORT_POOL_MAX_RENDERS_PER_WORKER = 50  # Recycle a renderer after this many reports
+REPORT_POOL_TIMEOUT = 120  # Seconds a request waits for its report
+
+# Per-user cache of the latest upload's summary and distribution
+LATEST_DATASET_CACHE_ALIAS = 'default'
+LATEST_DATASET_CACHE_TIMEOUT = 300  # Seconds; entries are also invalidated on upload/delete
+
+# Cached token -> user resolution (api.authentication.CachedTokenAuthentication)
+AUTH_TOKEN_CACHE_ALIAS = 'default'
+AUTH_TOKEN_CACHE_TIMEOUT = 300  # Seconds; entries are also invalidated on logout/user changes
@@ -0,0 +1,283 @@
+"""
+Upload Analytics Benchmark Suite
+
+Times ``validate_csv_format`` and ``compute_summary_statistics`` on synthetic
+equipment CSVs (benchmarks/datagen.py) from 1k rows up to 10M, in three
+scenarios:
+
+- clean:   every cell valid
+- nan:     --nan-rate of the numeric cells empty
+- invalid: --invalid-rate of the numeric cells non-numeric
+
+Validation rejects both the nan and the invalid files (a numeric column may
+only be empty as a whole), so those cases measure how fast a bad upload
+fails.
+
+For each case it reports the median time of --repeat runs, the peak Python
+heap (tracemalloc, in a separate run; NumPy and pandas allocations are
+included) and the per-stage split of the summary run. Generated CSVs are
+deterministic for a given --seed and are kept in --data-dir when given, so
+large files are only written once.
+
+benchmarks/baselines/analytics.json holds a recorded baseline for the
+default cases. Re-record it (--output) when the benchmark machine changes
+or a slowdown is intended.
+
+Usage (from the backend directory):
+    python benchmarks/bench_analytics.py [--rows 1000 10000 100000 1000000]
+        [--scenarios clean nan invalid] [--types 10] [--repeat 3] [--data-dir /tmp/csvs]
+    
+    # Record a baseline
+    python benchmarks/bench_analytics.py --output benchmarks/baselines/analytics.json
+    
+    # Compare against the stored baseline and exit non-zero on regressions
+    python benchmarks/bench_analytics.py --compare --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import numpy as np
+import pandas as pd
+
+from api.services.analytics import (
+    CSVValidationError, PipelineTimings, compute_summary_statistics, validate_csv_format
+)
+from benchmarks.datagen import write_equipment_csv
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'analytics.json')
+
+DEFAULT_ROWS = [1000, 10000, 100000, 1000000]
+
+SCENARIOS = ['clean', 'nan', 'invalid']
+
+# Metrics compared between runs (lower is better for all of them)
+COMPARED_METRICS = ['validate_ms', 'summary_ms', 'validate_peak_bytes', 'summary_peak_bytes']
+
+# Increases smaller than these are noise, whatever the relative change
+MIN_TIME_DELTA_MS = 2.0
+MIN_MEMORY_DELTA_BYTES = 1024 * 1024
+
+
+def case_rates(scenario, args):
+    """(nan_rate, invalid_rate) of a scenario."""
+    if scenario == 'nan':
+        return args.nan_rate, 0.0
+    if scenario == 'invalid':
+        return 0.0, args.invalid_rate
+    return 0.0, 0.0
+
+
+def case_csv(scenario, rows, args, data_dir):
+    """Path of the case's CSV, generating it unless it already exists."""
+    nan_rate, invalid_rate = case_rates(scenario, args)
+    path = os.path.join(
+        data_dir,
+        f'equipment_{rows}_t{args.types}_n{nan_rate:g}_i{invalid_rate:g}_s{args.seed}.csv'
+    )
+    if not os.path.exists(path):
+        write_equipment_csv(
+            path + '.tmp', rows, type_cardinality=args.types, seed=args.seed,
+            nan_rate=nan_rate, invalid_rate=invalid_rate
+        )
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def run_validate(df):
+    """Run validation; returns False when the data is rejected."""
+    try:
+        validate_csv_format(df)
+    except CSVValidationError:
+        return False
+    return True
+
+
+def run_summary(path, timings=None):
+    try:
+        compute_summary_statistics(path, timings=timings)
+    except CSVValidationError:
+        return False
+    return True
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def peak_bytes(func):
+    # Separate traced run, since tracing distorts timings
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_case(scenario, rows, args, data_dir):
+    """Benchmark one scenario and size; returns a result dict."""
+    path = case_csv(scenario, rows, args, data_dir)
+    df = pd.read_csv(path)
+    
+    accepted = run_validate(df)
+    validate_ms = median_ms(lambda: run_validate(df), args.repeat)
+    validate_peak = peak_bytes(lambda: run_validate(df))
+    del df
+    
+    summary_ms = median_ms(lambda: run_summary(path), args.repeat)
+    summary_peak = peak_bytes(lambda: run_summary(path))
+    
+    timings = PipelineTimings()
+    run_summary(path, timings)
+    
+    return {
+        'scenario': scenario,
+        'rows': rows,
+        'file_bytes': os.path.getsize(path),
+        'accepted': accepted,
+        'validate_ms': validate_ms,
+        'summary_ms': summary_ms,
+        'validate_peak_bytes': validate_peak,
+        'summary_peak_bytes': summary_peak,
+        'stages_ms': {entry['stage']: round(entry['seconds'] * 1000, 3) for entry in timings.stages},
+    }
+
+
+def compare_results(current, baseline, threshold):
+    """
+    Compare two result lists and return a list of regression descriptions.
+    
+    A metric regresses when it exceeds the baseline by more than `threshold`
+    (a fraction, e.g. 0.25 for 25%) and by more than the noise floor
+    (MIN_TIME_DELTA_MS / MIN_MEMORY_DELTA_BYTES).
+    """
+    baseline_by_case = {(row['scenario'], row['rows']): row for row in baseline['results']}
+    regressions = []
+    
+    for row in current['results']:
+        base = baseline_by_case.get((row['scenario'], row['rows']))
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            floor = MIN_MEMORY_DELTA_BYTES if metric.endswith('_bytes') else MIN_TIME_DELTA_MS
+            change = (new - old) / old
+            if change > threshold and new - old > floor:
+                regressions.append(
+                    f"{row['scenario']} rows={row['rows']} {metric}: {old} -> {new} (+{change:.0%})"
+                )
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS,
+                        help='CSV sizes to benchmark (up to 10000000)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--types', type=int, default=10, help='Equipment type cardinality')
+    parser.add_argument('--nan-rate', type=float, default=0.05,
+                        help='Fraction of empty numeric cells in the nan scenario')
+    parser.add_argument('--invalid-rate', type=float, default=0.01,
+                        help='Fraction of non-numeric cells in the invalid scenario')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per case (median is reported)')
+    parser.add_argument('--data-dir', help='Keep generated CSVs here between runs')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE,
+                        help=f'Baseline JSON file to compare against (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative increase before flagging a regression')
+    args = parser.parse_args()
+    
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='bench_analytics_')
+    os.makedirs(data_dir, exist_ok=True)
+    
+    results = {
+        'benchmark': 'analytics',
+        'created_at': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+        },
+        'config': {
+            'types': args.types,
+            'nan_rate': args.nan_rate,
+            'invalid_rate': args.invalid_rate,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'results': [],
+    }
+    
+    print(f"{'scenario':<8} {'rows':>9} {'MB':>7} {'valid':>6} {'validate':>9} {'summary':>9} "
+          f"{'val. MB':>8} {'sum. MB':>8} {'read_csv':>9} {'coerce':>8} {'aggr.':>8}")
+    try:
+        for rows in args.rows:
+            for scenario in args.scenarios:
+                row = run_case(scenario, rows, args, data_dir)
+                results['results'].append(row)
+                stages = row['stages_ms']
+                print(
+                    f"{row['scenario']:<8} {row['rows']:>9} {row['file_bytes'] / 2**20:>7.1f} "
+                    f"{'yes' if row['accepted'] else 'no':>6} {row['validate_ms']:>9.1f} "
+                    f"{row['summary_ms']:>9.1f} {row['validate_peak_bytes'] / 2**20:>8.1f} "
+                    f"{row['summary_peak_bytes'] / 2**20:>8.1f} {stages.get('read_csv', 0):>9.1f} "
+                    f"{stages.get('coercion', 0):>8.1f} {stages.get('aggregation', 0):>8.1f}"
+                )
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    print("(times in ms, median of --repeat runs; MB = peak traced heap)")
+    
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions above {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+ASGI vs WSGI Read Concurrency Benchmark
+
+Serves the API from a separate server process, either:
+
+- wsgi: the sync views on a thread-pool WSGI server (--server-threads
+        threads, like a threaded production worker)
+- asgi: the async views (API_ASYNC_VIEWS) on uvicorn, one process
+
+and drives it with the same client counts for each: pollers hammering
+/api/summary/, /api/history/ and /api/dashboard/ back to back, plus
+optional slow clients that trickle each request's headers over a couple of
+seconds (like pollers on a poor network). Under WSGI every slow client
+holds a server thread until its request is complete; under ASGI it only
+holds a socket. Reports poller throughput and latency, errors, and how
+many slow requests completed.
+
+Both servers use the same throwaway SQLite database, media directory and
+file-based cache, created in a temporary directory; db.sqlite3, media/
+and cache/ are not touched. Requires uvicorn (pip install uvicorn).
+
+Usage (from the backend directory):
+    python benchmarks/bench_asgi.py [--clients 8 32 128] [--slow-clients 16]
+        [--duration 10] [--server-threads 16] [--servers wsgi asgi]
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import requests
+from django.conf import settings
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+READ_PATHS = ['/api/summary/', '/api/history/', '/api/dashboard/']
+
+
+def configure(workdir, async_views=False):
+    """
+    Point this process at the benchmark's database, media and cache.
+    
+    Must run before the first database or cache access and before the URL
+    configuration is loaded (it decides between sync and async views).
+    """
+    settings.DATABASES['default']['NAME'] = os.path.join(workdir, 'db.sqlite3')
+    settings.MEDIA_ROOT = os.path.join(workdir, 'media')
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(workdir, 'cache'),
+        }
+    }
+    settings.API_ASYNC_VIEWS = async_views
+
+
+def serve(args):
+    """Server process entry point (--serve wsgi|asgi)."""
+    configure(args.workdir, async_views=args.serve == 'asgi')
+    
+    if args.serve == 'asgi':
+        import uvicorn
+        from backend.asgi import application
+        
+        # Building the application configures logging; silence the
+        # per-request warnings after that
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        uvicorn.run(
+            application, host='127.0.0.1', port=args.port,
+            log_level='error', access_log=False, lifespan='off'
+        )
+    else:
+        from wsgiref.simple_server import make_server
+        from backend.wsgi import application
+        from benchmarks.bench_sqlite_concurrency import PooledWSGIServer, QuietHandler
+        
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        server = make_server(
+            '127.0.0.1', args.port, application,
+            server_class=lambda *a, **kw: PooledWSGIServer(*a, threads=args.server_threads, **kw),
+            handler_class=QuietHandler
+        )
+        server.serve_forever()
+
+
+def prepare_database(workdir, users):
+    """Migrate the benchmark database and create users with one upload each."""
+    from django.contrib.auth.models import User
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.core.management import call_command
+    from django.db import connections
+    from rest_framework.authtoken.models import Token
+    from api.services.ingest import ingest_dataset
+    
+    configure(workdir)
+    call_command('migrate', verbosity=0)
+    
+    with open(SAMPLE_CSV, 'rb') as f:
+        csv_data = f.read()
+    
+    tokens = []
+    for index in range(users):
+        user = User.objects.create_user(f'poller_{index}', password='PollPass123')
+        tokens.append(Token.objects.create(user=user).key)
+        ingest_dataset(user, SimpleUploadedFile('poll.csv', csv_data, content_type='text/csv'))
+    
+    connections.close_all()
+    return tokens
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, workdir, server_threads):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, os.path.abspath(__file__),
+        '--serve', kind, '--workdir', workdir, '--port', str(port),
+        '--server-threads', str(server_threads)
+    ])
+    
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/api/summary/', timeout=5)
+            return process, port
+        except requests.ConnectionError:
+            if process.poll() is not None:
+                raise RuntimeError(f'{kind} server exited with code {process.returncode}')
+            time.sleep(0.2)
+    
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+def poller_loop(port, token, deadline, results):
+    session = requests.Session()
+    session.headers['Authorization'] = f'Token {token}'
+    paths = itertools.cycle(READ_PATHS)
+    
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = session.get(f'http://127.0.0.1:{port}{next(paths)}', timeout=60).status_code == 200
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        with results['lock']:
+            results['latency'].append(elapsed)
+            results['counts']['ok' if ok else 'error'] += 1
+
+
+def slow_client_loop(port, token, deadline, trickle_seconds, results):
+    """Send each request's headers a few bytes at a time, then read the response."""
+    request = (
+        f"GET /api/summary/ HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Authorization: Token {token}\r\nConnection: close\r\n\r\n"
+    ).encode('ascii')
+    chunks = [request[index:index + 8] for index in range(0, len(request), 8)]
+    
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=60) as sock:
+                for chunk in chunks:
+                    sock.sendall(chunk)
+                    time.sleep(trickle_seconds / len(chunks))
+                response = b''
+                while data := sock.recv(65536):
+                    response += data
+            ok = response.startswith(b'HTTP/1.1 200') or response.startswith(b'HTTP/1.0 200')
+        except OSError:
+            ok = False
+        
+        with results['lock']:
+            results['counts']['slow_ok' if ok else 'slow_error'] += 1
+
+
+def run_load(port, tokens, clients, slow_clients, args):
+    results = {'lock': threading.Lock(), 'counts': Counter(), 'latency': []}
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=poller_loop, args=(port, tokens[index % len(tokens)], deadline, results))
+        for index in range(clients)
+    ] + [
+        threading.Thread(target=slow_client_loop, args=(
+            port, tokens[index % len(tokens)], deadline, args.trickle, results
+        ))
+        for index in range(slow_clients)
+    ]
+    
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latency = sorted(results['latency']) or [0]
+    counts = results['counts']
+    return {
+        'rps': counts['ok'] / elapsed,
+        'p50': statistics.median(latency),
+        'p95': latency[max(int(len(latency) * 0.95) - 1, 0)],
+        'errors': counts['error'],
+        'slow_ok': counts['slow_ok'],
+        'slow_error': counts['slow_error'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, nargs='+', default=[8, 32, 128])
+    parser.add_argument('--slow-clients', type=int, default=16)
+    parser.add_argument('--trickle', type=float, default=2.0,
+                        help='Seconds a slow client takes to send its request headers')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--server-threads', type=int, default=16)
+    parser.add_argument('--servers', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    parser.add_argument('--users', type=int, default=8)
+    # Internal: run as the server process
+    parser.add_argument('--serve', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve(args)
+        return
+    
+    if 'asgi' in args.servers:
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            sys.exit('uvicorn is required for the ASGI server: pip install uvicorn')
+    
+    workdir = tempfile.mkdtemp(prefix='bench_asgi_')
+    try:
+        tokens = prepare_database(workdir, args.users)
+        
+        print(f"{args.duration:.0f}s per run, {args.slow_clients} slow clients "
+              f"({args.trickle:.1f}s to send headers), WSGI threads {args.server_threads}")
+        print(f"{'server':<6} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'errors':>7} {'slow done':>10} {'slow err':>9}")
+        
+        for kind in args.servers:
+            process, port = start_server(kind, workdir, args.server_threads)
+            try:
+                for clients in args.clients:
+                    result = run_load(port, tokens, clients, args.slow_clients, args)
+                    print(
+                        f"{kind:<6} {clients:>7} {result['rps']:>8.1f} {result['p50']:>8.1f} "
+                        f"{result['p95']:>8.1f} {result['errors']:>7} {result['slow_ok']:>10} "
+                        f"{result['slow_error']:>9}"
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Token Authentication Overhead Benchmark
+
+Measures the cost of resolving an ``Authorization: Token`` header with DRF's
+TokenAuthentication and with CachedTokenAuthentication: microseconds and
+database queries per authentication, plus queries for a full
+GET /api/summary/ request with the configured authentication class.
+
+Runs in-process against a throwaway database (no server needed).
+
+Usage (from the backend directory):
+    python benchmarks/bench_auth.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.test import APIRequestFactory
+
+from api.authentication import CachedTokenAuthentication
+from benchmarks.django_env import benchmark_environment, create_authenticated_client, upload_csv
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+
+def bench_authenticator(authenticator, request, iterations):
+    """Return (per-call microseconds, steady-state queries per call)."""
+    authenticator.authenticate(request)
+    with CaptureQueriesContext(connection) as captured:
+        authenticator.authenticate(request)
+    queries = len(captured.captured_queries)
+    
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        authenticator.authenticate(request)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+    
+    with benchmark_environment():
+        _, token, client = create_authenticated_client()
+        upload_csv(client, SAMPLE_CSV)
+        request = APIRequestFactory().get('/api/summary/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        
+        print(f"Iterations: {args.iterations}")
+        for label, authenticator in [
+            ('TokenAuthentication', TokenAuthentication()),
+            ('CachedTokenAuthentication', CachedTokenAuthentication()),
+        ]:
+            cache.clear()
+            timings, queries = bench_authenticator(authenticator, request, args.iterations)
+            print(
+                f"{label:<27} mean {statistics.mean(timings):8.1f} us   "
+                f"p50 {statistics.median(timings):8.1f} us   queries/auth {queries}"
+            )
+        
+        client.get('/api/summary/')
+        with CaptureQueriesContext(connection) as captured:
+            client.get('/api/summary/')
+        print(f"\nGET /api/summary/ (warm caches): {len(captured.captured_queries)} queries")
+
+
+if __name__ == '__main__':
+    main()
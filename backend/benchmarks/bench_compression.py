@@ -0,0 +1,120 @@
+"""
+Response Compression Benchmark
+
+Fetches typical API responses in-process (history pages, dashboard,
+summary) in JSON and MessagePack, adds row and histogram payloads rendered
+the same way, and compresses each body with every encoding the server
+supports at the configured API_COMPRESSION_LEVELS. Reports bytes on the
+wire and the CPU time compression costs per response. Bodies smaller than
+API_COMPRESSION_MIN_BYTES are shown as sent uncompressed.
+
+Runs in-process against a throwaway database (no server needed).
+
+Usage (from the backend directory):
+    python benchmarks/bench_compression.py [--history 500] [--rows 20000] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+
+from api.middleware import available_encodings, compress_bytes
+from api.models import RetentionPolicy
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+from benchmarks.bench_history import fill_history
+from benchmarks.bench_json_render import rows_payload
+from benchmarks.bench_msgpack import histogram_payload
+from benchmarks.django_env import benchmark_environment, create_authenticated_client, upload_csv
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+
+def cpu_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings)
+
+
+def collect_bodies(args):
+    """Return [(label, body)] for the endpoints and payloads measured."""
+    formats = [('json', 'application/json')]
+    if msgpack is not None:
+        formats.append(('msgpack', 'application/msgpack'))
+    
+    bodies = []
+    user, _, client = create_authenticated_client()
+    RetentionPolicy.objects.create(user=user, max_uploads=None)
+    fill_history(user, args.history)
+    upload_csv(client, SAMPLE_CSV)
+    
+    endpoints = [
+        ('summary', '/api/summary/'),
+        ('dashboard', '/api/dashboard/'),
+        (f'history[{args.history}]', f'/api/history/?page_size={args.history}'),
+    ]
+    for label, path in endpoints:
+        for name, media_type in formats:
+            response = client.get(path, HTTP_ACCEPT=media_type)
+            assert response.status_code == 200, response.content
+            bodies.append((f'{label} {name}', response.content))
+    
+    payloads = [('rows', rows_payload(args.rows)), ('histograms', histogram_payload(args.rows))]
+    renderers = {'json': FastJSONRenderer(), 'msgpack': MessagePackRenderer()}
+    for label, payload in payloads:
+        for name, _ in formats:
+            bodies.append((f'{label} {name}', renderers[name].render(payload)))
+    
+    return bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--history', type=int, default=500, help='History page size requested')
+    parser.add_argument('--rows', type=int, default=20000, help='Rows / samples in the synthetic payloads')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    encodings = available_encodings()
+    min_bytes = getattr(settings, 'API_COMPRESSION_MIN_BYTES', 1024)
+    
+    with benchmark_environment():
+        bodies = collect_bodies(args)
+    
+    print(f"encodings {', '.join(encodings)}; levels {getattr(settings, 'API_COMPRESSION_LEVELS', {})}; "
+          f"threshold {min_bytes} B; CPU ms = median of {args.repeat}")
+    header = f"{'response':<24} {'identity':>10}"
+    for encoding in encodings:
+        header += f" {encoding + ' bytes':>11} {'ratio':>6} {'cpu ms':>7}"
+    print(header)
+    
+    for label, body in bodies:
+        line = f"{label:<24} {len(body):>10,}"
+        for encoding in encodings:
+            if len(body) < min_bytes:
+                line += f" {'(skipped)':>11} {'':>6} {'':>7}"
+                continue
+            compressed = compress_bytes(body, encoding)
+            cost = cpu_ms(lambda: compress_bytes(body, encoding), args.repeat)
+            line += f" {len(compressed):>11,} {len(body) / len(compressed):>5.1f}x {cost:>7.2f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
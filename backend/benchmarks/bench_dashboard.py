@@ -0,0 +1,108 @@
+"""
+Dashboard Endpoint Latency Benchmark
+
+Compares the old dashboard refresh (GET /summary/, /distribution/ and
+/history/ one after another) with the single GET /dashboard/ call, reporting
+latency and database queries per refresh.
+
+By default the API is driven in-process against a throwaway database, which
+excludes network round trips. Pass --base-url (and --token) to measure
+against a running server over HTTP instead.
+
+Usage (from the backend directory):
+    python benchmarks/bench_dashboard.py [--iterations 200]
+    python benchmarks/bench_dashboard.py --base-url http://127.0.0.1:8000/api --token <token>
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.django_env import benchmark_environment, create_authenticated_client, upload_csv
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+THREE_CALL_PATHS = ['/summary/', '/distribution/', '/history/']
+DASHBOARD_PATHS = ['/dashboard/']
+
+
+def _report(label, timings, queries=None):
+    line = (
+        f"{label:<22} mean {statistics.mean(timings):7.2f} ms   "
+        f"p50 {statistics.median(timings):7.2f} ms   "
+        f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f} ms"
+    )
+    if queries is not None:
+        line += f"   queries/refresh {queries}"
+    print(line)
+
+
+def bench_in_process(iterations, uploads):
+    with benchmark_environment():
+        _, _, client = create_authenticated_client()
+        for _ in range(uploads):
+            upload_csv(client, SAMPLE_CSV)
+        
+        for label, paths in [('three calls', THREE_CALL_PATHS), ('dashboard', DASHBOARD_PATHS)]:
+            with CaptureQueriesContext(connection) as captured:
+                for path in paths:
+                    assert client.get(f'/api{path}').status_code == 200
+            queries = len(captured.captured_queries)
+            
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                for path in paths:
+                    client.get(f'/api{path}')
+                timings.append((time.perf_counter() - start) * 1000)
+            _report(label, timings, queries)
+
+
+def bench_http(iterations, base_url, token):
+    import requests
+    
+    session = requests.Session()
+    session.headers['Authorization'] = f'Token {token}'
+    
+    for label, paths in [('three calls', THREE_CALL_PATHS), ('dashboard', DASHBOARD_PATHS)]:
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            for path in paths:
+                session.get(f'{base_url}{path}').raise_for_status()
+            timings.append((time.perf_counter() - start) * 1000)
+        _report(label, timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--uploads', type=int, default=5, help='Uploads in the history (in-process only)')
+    parser.add_argument('--base-url', help='Benchmark a running server instead')
+    parser.add_argument('--token', help='Auth token for --base-url')
+    args = parser.parse_args()
+    
+    print(f"Iterations: {args.iterations}")
+    if args.base_url:
+        bench_http(args.iterations, args.base_url.rstrip('/'), args.token)
+    else:
+        bench_in_process(args.iterations, args.uploads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Detailed PDF Report Memory Benchmark
+
+Generates synthetic datasets of increasing size and type cardinality and
+renders the detailed report (row appendix) for each, recording wall time,
+peak Python heap (tracemalloc, measured in a second run since tracing slows
+rendering down) and output size. Peak heap should stay roughly flat apart
+from the PDF output itself, which necessarily grows with the number of
+pages.
+
+"rows (s)" is the time to partition the rows by type and read every
+section back, without layout. It should grow with rows only, not with
+the number of types.
+
+Usage (from the backend directory):
+    python benchmarks/bench_detailed_report.py [--sizes 1000 10000 100000] [--types 5 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from api.services.analytics import EquipmentRowPartition, compute_summary_statistics
+from api.services.pdf_generator import generate_detailed_analytics_report, warm_report_generator
+from benchmarks.datagen import write_equipment_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--types', type=int, nargs='+', default=[5, 200],
+                        help='Equipment type cardinalities to benchmark')
+    args = parser.parse_args()
+    
+    warm_report_generator()
+    
+    print(f"{'types':>6} {'rows':>10} {'rows (s)':>9} {'time (s)':>10} {'peak heap (MB)':>15} "
+          f"{'pdf (MB)':>10} {'heap - pdf (MB)':>16}")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for types in args.types:
+            for rows in args.sizes:
+                path = write_equipment_csv(
+                    os.path.join(tmp_dir, f'equipment_{rows}_{types}.csv'),
+                    rows,
+                    type_cardinality=types
+                )
+                summary = compute_summary_statistics(path)
+                
+                def render():
+                    return generate_detailed_analytics_report(
+                        os.path.basename(path),
+                        datetime.now().isoformat(),
+                        summary,
+                        summary['equipment_distribution'],
+                        path
+                    )
+                
+                start = time.perf_counter()
+                with EquipmentRowPartition(path) as partition:
+                    for stats in partition.type_statistics():
+                        for _ in partition.iter_rows(stats['type']):
+                            pass
+                rows_elapsed = time.perf_counter() - start
+                
+                start = time.perf_counter()
+                buffer = render()
+                elapsed = time.perf_counter() - start
+                
+                tracemalloc.start()
+                render()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                
+                pdf_mb = len(buffer.getvalue()) / 1024 / 1024
+                peak_mb = peak / 1024 / 1024
+                print(f"{types:>6} {rows:>10} {rows_elapsed:>9.2f} {elapsed:>10.2f} {peak_mb:>15.1f} "
+                      f"{pdf_mb:>10.1f} {peak_mb - pdf_mb:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+History Pagination Benchmark
+
+Fills one user's history with N uploads (bulk inserted, no files) and times
+GET /api/history/ for the first page, a page from the middle and the last
+page, following keyset cursors. For comparison it also times fetching the
+same pages with OFFSET, which gets slower the deeper the page is. Response
+time for keyset pages should stay flat as the history grows.
+
+Runs in-process against a throwaway database (no server needed).
+
+Usage (from the backend directory):
+    python benchmarks/bench_history.py [--sizes 1000 10000 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.utils import timezone
+
+from api.models import DatasetUpload
+from api.pagination import HistoryKeysetPagination
+from benchmarks.django_env import benchmark_environment, create_authenticated_client
+
+
+def fill_history(user, rows):
+    """Bulk insert ``rows`` uploads with distinct, increasing timestamps."""
+    DatasetUpload.objects.filter(user=user).delete()
+    start = timezone.now() - timedelta(seconds=rows)
+    
+    # auto_now_add would give every row the same timestamp
+    field = DatasetUpload._meta.get_field('uploaded_at')
+    field.auto_now_add = False
+    try:
+        DatasetUpload.objects.bulk_create(
+            (
+                DatasetUpload(
+                    user=user,
+                    file=f'datasets/bench_{index}.csv',
+                    uploaded_at=start + timedelta(seconds=index)
+                )
+                for index in range(rows)
+            ),
+            batch_size=5000
+        )
+    finally:
+        field.auto_now_add = True
+
+
+def time_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    page_size = getattr(settings, 'HISTORY_PAGE_SIZE', 50)
+    
+    with benchmark_environment():
+        user, _, client = create_authenticated_client()
+        client.get('/api/history/')
+        
+        print(f"page_size {page_size}, median of {args.repeat} requests")
+        print(f"{'uploads':>8} {'page':>7} {'API (keyset)':>13} {'keyset query':>13} {'OFFSET query':>13}")
+        
+        for size in args.sizes:
+            fill_history(user, size)
+            queryset = DatasetUpload.objects.filter(user=user).only('id', 'file', 'uploaded_at')
+            ordered = queryset.order_by('-uploaded_at', '-id')
+            
+            for label, depth in [('first', 0), ('middle', size // 2), ('last', size - page_size)]:
+                depth = max(depth, 0)
+                params = {}
+                cursor = None
+                if depth:
+                    anchor = ordered[depth - 1]
+                    params['cursor'] = HistoryKeysetPagination.encode_cursor(anchor)
+                    cursor = HistoryKeysetPagination.decode_cursor(params['cursor'])
+                
+                def keyset():
+                    response = client.get('/api/history/', params)
+                    assert response.status_code == 200, response.content
+                
+                def keyset_query():
+                    HistoryKeysetPagination().paginate(queryset, cursor=cursor, page_size=page_size)
+                
+                def offset():
+                    list(ordered[depth:depth + page_size])
+                
+                print(
+                    f"{size:>8} {label:>7} {time_ms(keyset, args.repeat):>11.2f}ms "
+                    f"{time_ms(keyset_query, args.repeat):>11.2f}ms "
+                    f"{time_ms(offset, args.repeat):>11.2f}ms"
+                )
+
+
+if __name__ == '__main__':
+    main()
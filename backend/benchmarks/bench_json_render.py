@@ -0,0 +1,147 @@
+"""
+JSON Rendering Benchmark
+
+Encodes large API-shaped payloads with DRF's stock JSONRenderer and with
+FastJSONRenderer (orjson) and reports time per render and throughput in
+MB/s. Payloads:
+
+- history:   a maximum-size /history/ page (HISTORY_MAX_PAGE_SIZE rows
+             with datetimes, as the views hand them to the renderer)
+- per_type:  per-type statistics for many equipment types, with NumPy
+             counts and averages as produced by pandas
+- rows:      a page of equipment rows with NumPy float columns
+- summary:   a summary with a large type distribution (datagen.make_summary)
+
+Also checks that both renderers produce the same JSON for every payload.
+No database or server needed.
+
+Usage (from the backend directory):
+    python benchmarks/bench_json_render.py [--rows 20000] [--types 2000] [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+from benchmarks.datagen import equipment_type_names, make_summary
+
+
+def history_payload(rows):
+    start = timezone.now() - timedelta(days=1)
+    return {
+        'history': [
+            {
+                'id': index,
+                'file': f'/media/datasets/upload_{index}.csv',
+                'uploaded_at': start + timedelta(seconds=index, microseconds=index)
+            }
+            for index in range(rows)
+        ],
+        'next_cursor': 'MjAyNi0xMC0xOVQwNjo1ODowMHwxMjM0NQ=='
+    }
+
+
+def per_type_payload(types):
+    rng = np.random.default_rng(0)
+    counts = rng.integers(1, 10_000, size=types)
+    averages = rng.normal(100, 15, size=(types, 3)).round(2)
+    return {
+        'statistics': [
+            {
+                'type': name,
+                'count': counts[index],
+                'average_flowrate': averages[index, 0],
+                'average_pressure': averages[index, 1],
+                'average_temperature': averages[index, 2]
+            }
+            for index, name in enumerate(equipment_type_names(types))
+        ]
+    }
+
+
+def rows_payload(rows):
+    rng = np.random.default_rng(1)
+    values = rng.normal(100, 15, size=(rows, 3)).round(3)
+    types = equipment_type_names(5)
+    return {
+        'rows': [
+            {
+                'equipment_name': f'EQ-{index:06d}',
+                'type': types[index % len(types)],
+                'flowrate': values[index, 0],
+                'pressure': values[index, 1],
+                'temperature': values[index, 2]
+            }
+            for index in range(rows)
+        ]
+    }
+
+
+def time_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--types', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    if orjson is None:
+        print("orjson is not installed: FastJSONRenderer falls back to DRF's renderer")
+    
+    payloads = {
+        'history': history_payload(getattr(settings, 'HISTORY_MAX_PAGE_SIZE', 500)),
+        'per_type': per_type_payload(args.types),
+        'rows': rows_payload(args.rows),
+        'summary': make_summary(args.types),
+    }
+    renderers = {'drf': JSONRenderer(), 'fast': FastJSONRenderer()}
+    
+    print(f"median of {args.repeat} renders")
+    print(f"{'payload':<9} {'size':>9} {'drf':>10} {'fast':>10} {'drf MB/s':>9} {'fast MB/s':>10} {'speedup':>8}")
+    
+    for name, payload in payloads.items():
+        outputs = {key: renderer.render(payload) for key, renderer in renderers.items()}
+        if json.loads(outputs['drf']) != json.loads(outputs['fast']):
+            sys.exit(f'{name}: renderers produced different JSON')
+        
+        size_mb = len(outputs['fast']) / 1e6
+        timings = {
+            key: time_ms(lambda renderer=renderer: renderer.render(payload), args.repeat)
+            for key, renderer in renderers.items()
+        }
+        print(
+            f"{name:<9} {size_mb:>7.2f}MB {timings['drf']:>8.2f}ms {timings['fast']:>8.2f}ms "
+            f"{size_mb / timings['drf'] * 1000:>9.1f} {size_mb / timings['fast'] * 1000:>10.1f} "
+            f"{timings['drf'] / timings['fast']:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
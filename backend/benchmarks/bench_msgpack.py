@@ -0,0 +1,131 @@
+"""
+MessagePack vs JSON Payload Benchmark
+
+Renders realistic API responses with the JSON renderer and with
+MessagePackRenderer, then decodes them the way the desktop client does
+(``api_client.decode_response``). Reports body size and client decode time
+for each format. Payloads:
+
+- dashboard:  /dashboard/ response (summary, distribution, 50 history rows)
+- history:    a maximum-size /history/ page
+- per_type:   per-type statistics for many equipment types (NumPy scalars)
+- rows:       a page of equipment rows (NumPy float columns)
+- histograms: per-column histogram bins/counts plus a raw value sample,
+              as NumPy arrays
+
+No database or server needed. Requires msgpack (pip install msgpack).
+
+Usage (from the backend directory):
+    python benchmarks/bench_msgpack.py [--rows 20000] [--types 2000] [--samples 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add backend and desktop app to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'desktop-app'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import numpy as np
+import requests
+from django.conf import settings
+
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+from api_client import decode_response
+from benchmarks.bench_json_render import history_payload, per_type_payload, rows_payload
+from benchmarks.datagen import make_summary
+
+
+def dashboard_payload():
+    summary = make_summary(6)
+    history = history_payload(getattr(settings, 'HISTORY_PAGE_SIZE', 50))
+    # As serialized by HistorySerializer: timestamps are already strings
+    for row in history['history']:
+        row['uploaded_at'] = row['uploaded_at'].isoformat()
+    return {
+        'summary': {key: value for key, value in summary.items() if key != 'equipment_distribution'},
+        'distribution': summary['equipment_distribution'],
+        'history': history['history'],
+        'history_next_cursor': history['next_cursor']
+    }
+
+
+def histogram_payload(samples):
+    rng = np.random.default_rng(2)
+    values = rng.normal(100, 15, size=(samples, 3))
+    histograms = {}
+    for index, column in enumerate(['flowrate', 'pressure', 'temperature']):
+        counts, edges = np.histogram(values[:, index], bins=100)
+        histograms[column] = {'bins': edges, 'counts': counts}
+    return {'histograms': histograms, 'sample': values[:, 0]}
+
+
+def as_response(body, media_type):
+    response = requests.Response()
+    response._content = body
+    response.status_code = 200
+    response.headers['Content-Type'] = media_type
+    return response
+
+
+def time_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--types', type=int, default=2000)
+    parser.add_argument('--samples', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    if msgpack is None:
+        sys.exit('msgpack is required: pip install msgpack')
+    
+    payloads = {
+        'dashboard': dashboard_payload(),
+        'history': history_payload(getattr(settings, 'HISTORY_MAX_PAGE_SIZE', 500)),
+        'per_type': per_type_payload(args.types),
+        'rows': rows_payload(args.rows),
+        'histograms': histogram_payload(args.samples),
+    }
+    renderers = {
+        'json': (FastJSONRenderer(), 'application/json'),
+        'msgpack': (MessagePackRenderer(), 'application/msgpack'),
+    }
+    
+    print(f"client decode time, median of {args.repeat}")
+    print(f"{'payload':<10} {'json size':>10} {'msgpack':>10} {'ratio':>6} "
+          f"{'json decode':>12} {'msgpack':>9} {'speedup':>8}")
+    
+    for name, payload in payloads.items():
+        sizes, timings = {}, {}
+        for key, (renderer, media_type) in renderers.items():
+            response = as_response(renderer.render(payload), media_type)
+            sizes[key] = len(response.content)
+            timings[key] = time_ms(lambda response=response: decode_response(response), args.repeat)
+        
+        print(
+            f"{name:<10} {sizes['json'] / 1024:>8.1f}KB {sizes['msgpack'] / 1024:>8.1f}KB "
+            f"{sizes['msgpack'] / sizes['json']:>6.2f} {timings['json']:>10.2f}ms "
+            f"{timings['msgpack']:>7.2f}ms {timings['json'] / timings['msgpack']:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
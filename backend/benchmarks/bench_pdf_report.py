@@ -0,0 +1,180 @@
+"""
+PDF Report Generation Benchmark Suite
+
+Runs without a server. For synthetic summaries with an increasing number of
+equipment types it times each report stage - styles (generator setup),
+story build, chart and ``doc.build`` - and records peak Python heap and
+output size. Results are written as JSON so that runs can be compared.
+
+Usage (from the backend directory):
+    # Record a baseline
+    python benchmarks/bench_pdf_report.py --output pdf_baseline.json
+    
+    # Later: compare against it and exit non-zero on regressions
+    python benchmarks/bench_pdf_report.py --output pdf_current.json \\
+        --compare pdf_baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import matplotlib
+import reportlab
+
+from api.services.pdf_generator import PDFReportGenerator, warm_report_generator
+from benchmarks.datagen import make_summary
+
+
+DEFAULT_TYPE_COUNTS = [1, 10, 100, 1000, 5000]
+
+# Metrics compared between runs (lower is better for all of them)
+COMPARED_METRICS = [
+    'styles_ms', 'story_ms', 'chart_ms', 'build_ms', 'total_ms',
+    'peak_memory_bytes', 'output_bytes'
+]
+
+
+def run_case(type_count, repeat):
+    """Benchmark one synthetic summary size; returns a result dict."""
+    summary = make_summary(type_count)
+    distribution = summary['equipment_distribution']
+    timestamp = datetime(2026, 1, 1).isoformat()
+    
+    samples = {'styles_ms': [], 'story_ms': [], 'chart_ms': [], 'build_ms': [], 'total_ms': []}
+    output_bytes = 0
+    
+    for _ in range(repeat):
+        timings = {}
+        start = time.perf_counter()
+        # A fresh generator, so that the 'styles' stage is paid every time
+        buffer = PDFReportGenerator().generate_report(
+            f'synthetic_{type_count}.csv', timestamp, summary, distribution,
+            timings=timings
+        )
+        total_seconds = time.perf_counter() - start
+        output_bytes = len(buffer.getvalue())
+        
+        samples['styles_ms'].append(timings['styles'] * 1000)
+        samples['story_ms'].append(timings['story'] * 1000)
+        samples['chart_ms'].append(timings['chart'] * 1000)
+        samples['build_ms'].append(timings['build'] * 1000)
+        samples['total_ms'].append(total_seconds * 1000)
+    
+    # Peak heap in a separate traced run, since tracing distorts timings
+    tracemalloc.start()
+    PDFReportGenerator().generate_report(
+        f'synthetic_{type_count}.csv', timestamp, summary, distribution
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    result = {'types': type_count}
+    for metric, values in samples.items():
+        result[metric] = round(statistics.median(values), 3)
+    result['peak_memory_bytes'] = peak
+    result['output_bytes'] = output_bytes
+    return result
+
+
+def compare_results(current, baseline, threshold):
+    """
+    Compare two result lists and return a list of regression descriptions.
+    
+    A metric regresses when it exceeds the baseline by more than `threshold`
+    (a fraction, e.g. 0.25 for 25%).
+    """
+    baseline_by_types = {row['types']: row for row in baseline['results']}
+    regressions = []
+    
+    for row in current['results']:
+        base = baseline_by_types.get(row['types'])
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > threshold:
+                regressions.append(
+                    f"types={row['types']} {metric}: {old} -> {new} (+{change:.0%})"
+                )
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--types', type=int, nargs='+', default=DEFAULT_TYPE_COUNTS,
+                        help='Equipment type counts to benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per case (median is reported)')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative increase before flagging a regression')
+    args = parser.parse_args()
+    
+    # One-off font and cache loading is not part of any case
+    warm_report_generator()
+    
+    results = {
+        'benchmark': 'pdf_report',
+        'created_at': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'reportlab': reportlab.Version,
+            'matplotlib': matplotlib.__version__,
+        },
+        'results': [],
+    }
+    
+    header = f"{'types':>6} {'styles':>9} {'story':>9} {'chart':>9} {'build':>9} {'total':>9} {'peak MB':>8} {'PDF KB':>8}"
+    print(header)
+    
+    for type_count in args.types:
+        row = run_case(type_count, args.repeat)
+        results['results'].append(row)
+        print(
+            f"{row['types']:>6} {row['styles_ms']:>9.1f} {row['story_ms']:>9.1f} "
+            f"{row['chart_ms']:>9.1f} {row['build_ms']:>9.1f} {row['total_ms']:>9.1f} "
+            f"{row['peak_memory_bytes'] / 1024 / 1024:>8.1f} {row['output_bytes'] / 1024:>8.1f}"
+        )
+    print("(times in ms, median of --repeat runs)")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions above {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == '__main__':
+    main()
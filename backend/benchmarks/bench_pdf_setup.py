@@ -0,0 +1,93 @@
+"""
+PDF Generator Setup vs Per-Report Cost Micro-Benchmark
+
+Separates the one-off cost of building a PDFReportGenerator (stylesheet,
+custom styles, font metrics) from the cost of rendering each report with a
+shared, already-warm generator.
+
+Usage (from the backend directory):
+    python benchmarks/bench_pdf_setup.py [--iterations 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from api.services.pdf_generator import PDFReportGenerator
+
+
+SAMPLE_SUMMARY = {
+    'total_equipment': 10,
+    'average_flowrate': 125.45,
+    'average_pressure': 850.30,
+    'average_temperature': 75.20,
+    'equipment_distribution': [
+        {'type': 'Pump', 'count': 4},
+        {'type': 'Valve', 'count': 3},
+        {'type': 'Compressor', 'count': 3}
+    ]
+}
+
+
+def _time_ms(func, iterations):
+    """Run func `iterations` times and return the timings in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _print_row(label, timings):
+    print(
+        f"{label:<32} mean {statistics.mean(timings):8.2f} ms   "
+        f"median {statistics.median(timings):8.2f} ms   "
+        f"min {min(timings):8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+    
+    def render(generator):
+        generator.generate_report(
+            dataset_filename='sample_equipment_data.csv',
+            upload_timestamp=datetime.now().isoformat(),
+            summary=SAMPLE_SUMMARY,
+            distribution=SAMPLE_SUMMARY['equipment_distribution']
+        )
+    
+    # First construction and warm-up include one-off font/cache loading
+    start = time.perf_counter()
+    shared = PDFReportGenerator()
+    shared.warm_up()
+    cold_ms = (time.perf_counter() - start) * 1000
+    
+    setup = _time_ms(PDFReportGenerator, args.iterations)
+    per_report = _time_ms(lambda: render(shared), args.iterations)
+    fresh_each_time = _time_ms(lambda: render(PDFReportGenerator()), args.iterations)
+    
+    print(f"Iterations: {args.iterations}")
+    print(f"{'Cold start (construct + warm-up)':<32} {cold_ms:8.2f} ms")
+    _print_row('Setup (construct generator)', setup)
+    _print_row('Per report (shared generator)', per_report)
+    _print_row('Per report (new generator)', fresh_each_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Read-Heavy Load Benchmark
+
+Simulates polling clients: several users each upload a dataset, then a
+random mix of read requests (summary, distribution, history, dashboard) is
+replayed with the per-user latest-dataset cache disabled and enabled. For
+each run it reports database queries per request and request latency.
+
+Runs in-process against a throwaway database (no server needed).
+
+Usage (from the backend directory):
+    python benchmarks/bench_read_load.py [--users 20] [--requests 2000] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from benchmarks.django_env import benchmark_environment, create_authenticated_client, upload_csv
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+READ_PATHS = ['/api/summary/', '/api/distribution/', '/api/history/', '/api/dashboard/']
+
+
+def replay(clients, plan):
+    """Replay (client index, path) pairs; return per-path query counts and latencies."""
+    queries = Counter()
+    requests = Counter()
+    latencies = []
+    
+    for client_index, path in plan:
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = clients[client_index].get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (path, response.status_code)
+        queries[path] += len(captured.captured_queries)
+        requests[path] += 1
+    
+    return queries, requests, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    
+    with benchmark_environment():
+        clients = []
+        for _ in range(args.users):
+            _, _, client = create_authenticated_client()
+            upload_csv(client, SAMPLE_CSV)
+            clients.append(client)
+        
+        plan = [
+            (rng.randrange(args.users), rng.choice(READ_PATHS))
+            for _ in range(args.requests)
+        ]
+        
+        for label, timeout in [('cache off', 0), ('cache on', 300)]:
+            cache.clear()
+            with override_settings(LATEST_DATASET_CACHE_TIMEOUT=timeout):
+                queries, requests, latencies = replay(clients, plan)
+            
+            total_queries = sum(queries.values())
+            print(f"\n{label}: {args.requests} requests, {args.users} users")
+            print(f"  queries/request  {total_queries / args.requests:6.2f}")
+            print(f"  latency mean     {statistics.mean(latencies):6.2f} ms   p50 {statistics.median(latencies):6.2f} ms")
+            for path in READ_PATHS:
+                print(f"    {path:<22} {queries[path] / max(requests[path], 1):5.2f} queries/request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Batch Report Export Scaling Benchmark
+
+Renders the same batch of reports into a ZIP archive with process pools of
+increasing size and reports wall time and speed-up relative to one worker,
+to check that batch export scales with the number of cores.
+
+Usage (from the backend directory):
+    python benchmarks/bench_report_batch.py [--reports 16] [--max-workers 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from api.services.report_pool import ReportRenderPool, stream_report_zip
+
+
+def make_jobs(count):
+    """Build `count` synthetic report jobs."""
+    distribution = [
+        {'type': f'Type {index}', 'count': 10 + index}
+        for index in range(8)
+    ]
+    summary = {
+        'total_equipment': sum(item['count'] for item in distribution),
+        'average_flowrate': 125.45,
+        'average_pressure': 850.30,
+        'average_temperature': 75.20,
+        'equipment_distribution': distribution
+    }
+    return [
+        {
+            'dataset_id': index,
+            'dataset_filename': f'dataset_{index}.csv',
+            'upload_timestamp': datetime.now().isoformat(),
+            'summary': summary,
+            'distribution': distribution
+        }
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--reports', type=int, default=16)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    
+    jobs = make_jobs(args.reports)
+    
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+    
+    print(f"Reports per batch: {args.reports}")
+    baseline = None
+    
+    for workers in worker_counts:
+        pool = ReportRenderPool(workers=workers, queue_size=workers)
+        
+        # Start and warm every worker before timing
+        list(stream_report_zip(make_jobs(workers), pool=pool))
+        
+        start = time.perf_counter()
+        size = sum(len(chunk) for chunk in stream_report_zip(jobs, pool=pool))
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        
+        baseline = baseline or elapsed
+        print(
+            f"workers {workers:3d}   wall {elapsed:7.2f} s   "
+            f"speed-up {baseline / elapsed:5.2f}x   zip {size / 1024:8.1f} KB"
+        )
+
+
+if __name__ == '__main__':
+    main()
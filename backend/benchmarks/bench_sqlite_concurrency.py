@@ -0,0 +1,222 @@
+"""
+SQLite Concurrency Load Test
+
+Serves the API from a thread-pool WSGI server (like a threaded production
+worker) against a fresh SQLite database file, then runs concurrent uploader
+and reader clients over HTTP for a fixed time. Reports throughput, latency,
+"database is locked" error rate and database connections opened, for:
+
+- default:     Django's stock SQLite setup (rollback journal, a new
+               connection per request)
+- concurrency: the SQLITE_CONCURRENCY_PROFILE (WAL, synchronous=NORMAL,
+               busy_timeout, mmap_size, persistent connections)
+
+Each profile gets its own database file and media directory, which are
+deleted afterwards; db.sqlite3 and media/ are not touched.
+
+Usage (from the backend directory):
+    python benchmarks/bench_sqlite_concurrency.py [--uploaders 8] [--readers 16]
+        [--duration 15] [--server-threads 16] [--profiles default concurrency]
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import requests
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from api.sqlite import apply_sqlite_pragmas
+from benchmarks.django_env import BENCHMARK_CACHES
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+PROFILES = {
+    'default': {'pragmas': False, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'concurrency': {'pragmas': True, 'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+}
+
+
+class PooledWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server handling requests on a fixed pool of threads."""
+    
+    def __init__(self, *args, threads=16, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(threads)
+    
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def is_lock_error(response):
+    return response.status_code >= 400 and b'database is locked' in response.content
+
+
+def client_loop(base_url, token, kind, deadline, results, csv_data):
+    session = requests.Session()
+    session.headers['Authorization'] = f'Token {token}'
+    readers = itertools.cycle(['/summary/', '/history/', '/dashboard/'])
+    
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if kind == 'upload':
+            response = session.post(f'{base_url}/upload/', files={'file': ('load.csv', csv_data, 'text/csv')})
+            ok = response.status_code == 201
+        else:
+            response = session.get(f'{base_url}{next(readers)}')
+            ok = response.status_code in (200, 404)
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        with results['lock']:
+            results['latency'][kind].append(elapsed)
+            if ok:
+                results['counts'][f'{kind}_ok'] += 1
+            elif is_lock_error(response):
+                results['counts'][f'{kind}_locked'] += 1
+            else:
+                results['counts'][f'{kind}_failed'] += 1
+
+
+def run_profile(name, args, application, csv_data):
+    profile = PROFILES[name]
+    workdir = tempfile.mkdtemp(prefix=f'bench_sqlite_{name}_')
+    db_settings = connections['default'].settings_dict
+    original = {key: db_settings.get(key) for key in ('NAME', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+    
+    opened = itertools.count()
+    opened_count = [0]
+    
+    def count_connection(sender, connection, **kwargs):
+        opened_count[0] = next(opened) + 1
+    
+    connections.close_all()
+    db_settings.update(
+        NAME=os.path.join(workdir, 'db.sqlite3'),
+        CONN_MAX_AGE=profile['CONN_MAX_AGE'],
+        CONN_HEALTH_CHECKS=profile['CONN_HEALTH_CHECKS']
+    )
+    if profile['pragmas']:
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='api_sqlite_pragmas')
+    else:
+        connection_created.disconnect(dispatch_uid='api_sqlite_pragmas')
+    
+    try:
+        with override_settings(MEDIA_ROOT=os.path.join(workdir, 'media'), CACHES=BENCHMARK_CACHES):
+            call_command('migrate', verbosity=0)
+            
+            from django.contrib.auth.models import User
+            from rest_framework.authtoken.models import Token
+            tokens = []
+            for index in range(args.uploaders):
+                user = User.objects.create_user(f'load_{index}', password='LoadPass123')
+                tokens.append(Token.objects.create(user=user).key)
+            connections.close_all()
+            
+            connection_created.connect(count_connection)
+            server = make_server(
+                '127.0.0.1', 0, application,
+                server_class=lambda *a, **kw: PooledWSGIServer(*a, threads=args.server_threads, **kw),
+                handler_class=QuietHandler
+            )
+            server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+            server_thread.start()
+            base_url = f'http://127.0.0.1:{server.server_port}/api'
+            
+            # Each uploader writes to its own account; readers poll the
+            # uploaders' accounts, like dashboards watching for new data
+            results = {'lock': threading.Lock(), 'counts': Counter(), 'latency': {'upload': [], 'read': []}}
+            deadline = time.perf_counter() + args.duration
+            clients = [
+                threading.Thread(target=client_loop, args=(
+                    base_url, tokens[index % len(tokens)], 'upload' if index < args.uploaders else 'read',
+                    deadline, results, csv_data
+                ))
+                for index in range(args.uploaders + args.readers)
+            ]
+            started = time.perf_counter()
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+            elapsed = time.perf_counter() - started
+            
+            server.shutdown()
+            server.server_close()
+            connection_created.disconnect(count_connection)
+    finally:
+        connection_created.disconnect(dispatch_uid='api_sqlite_pragmas')
+        connections.close_all()
+        db_settings.update(original)
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    counts = results['counts']
+    print(f"\n{name} profile ({args.uploaders} uploaders, {args.readers} readers, {elapsed:.1f}s)")
+    for kind in ('upload', 'read'):
+        total = counts[f'{kind}_ok'] + counts[f'{kind}_locked'] + counts[f'{kind}_failed']
+        latency = results['latency'][kind] or [0]
+        print(
+            f"  {kind:<7} {counts[f'{kind}_ok'] / elapsed:7.1f} ok/s   "
+            f"locked {counts[f'{kind}_locked']:>5} ({counts[f'{kind}_locked'] / max(total, 1):6.1%})   "
+            f"other errors {counts[f'{kind}_failed']:>4}   "
+            f"p50 {statistics.median(latency):7.1f} ms   p95 {sorted(latency)[int(len(latency) * 0.95) - 1 if len(latency) > 1 else 0]:7.1f} ms"
+        )
+    print(f"  database connections opened: {opened_count[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--uploaders', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--server-threads', type=int, default=16)
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=['default', 'concurrency'])
+    args = parser.parse_args()
+    
+    # Building the application configures logging; after that, silence the
+    # per-request warnings (404s before the first upload, lock errors)
+    application = get_wsgi_application()
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    
+    with open(SAMPLE_CSV, 'rb') as f:
+        csv_data = f.read()
+    
+    for name in args.profiles:
+        run_profile(name, args, application, csv_data)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Upload Ingest Query Budget Check
+
+Uploads the sample CSV repeatedly for one user (past the history limit, so
+retention pruning runs) and reports the database queries and time per
+upload. Exits with status 1 if any upload exceeds the pinned query budget,
+if more than MAX_DATASET_HISTORY uploads remain, or if pruned files are left
+in storage - so it can be used as a regression check.
+
+Runs in-process against a throwaway database (no server needed). The same
+counts are pinned by api/tests/test_ingest.py, which ``manage.py test``
+runs; keep QUERY_BUDGET in step with it.
+
+Usage (from the backend directory):
+    python benchmarks/bench_upload.py [--uploads 12] [--max-queries 12]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import DatasetUpload
+from benchmarks.django_env import benchmark_environment, create_authenticated_client, upload_csv
+
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), '..', 'sample_equipment_data.csv')
+
+# BEGIN, INSERT upload/statistics/type counts, SELECT of the user's retention
+# policy, SELECT of uploads beyond the limit, cascade collection (upload ids,
+# statistics ids), three bulk DELETEs (type counts, statistics, uploads), COMMIT
+QUERY_BUDGET = 12
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--uploads', type=int, default=12)
+    parser.add_argument('--max-queries', type=int, default=QUERY_BUDGET)
+    args = parser.parse_args()
+    
+    failures = []
+    
+    with benchmark_environment():
+        user, _, client = create_authenticated_client()
+        keep = getattr(settings, 'MAX_DATASET_HISTORY', 5)
+        
+        # Resolve the token once so only ingest queries are counted
+        client.get('/api/history/')
+        
+        timings = []
+        for index in range(args.uploads):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = upload_csv(client, SAMPLE_CSV)
+                timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 201, response.content
+            
+            queries = [query['sql'].split()[0] for query in captured.captured_queries]
+            print(f"upload {index + 1:>3}: {len(queries)} queries ({', '.join(queries)})")
+            if len(queries) > args.max_queries:
+                failures.append(f"upload {index + 1} ran {len(queries)} queries (budget {args.max_queries})")
+        
+        print(f"\nmean {statistics.mean(timings):.2f} ms per upload")
+        
+        remaining = DatasetUpload.objects.filter(user=user).count()
+        if remaining != min(args.uploads, keep):
+            failures.append(f"{remaining} uploads kept, expected {min(args.uploads, keep)}")
+        
+        stored = set(os.listdir(os.path.join(settings.MEDIA_ROOT, 'datasets')))
+        expected = {
+            os.path.basename(name)
+            for name in DatasetUpload.objects.filter(user=user).values_list('file', flat=True)
+        }
+        if stored != expected:
+            failures.append(f"{len(stored - expected)} pruned files left in storage")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
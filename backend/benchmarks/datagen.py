@@ -0,0 +1,118 @@
+"""
+Synthetic Equipment Data Generator
+
+Writes deterministic equipment CSVs in the format expected by the analytics
+service, for benchmarks and load tests. Rows are written incrementally, so
+very large files can be produced without holding them in memory.
+"""
+
+import csv
+import random
+from typing import Any, Dict, List
+
+
+EQUIPMENT_TYPES = [
+    'Pump', 'Valve', 'Compressor', 'Heat Exchanger', 'Reactor',
+    'Condenser', 'Boiler', 'Turbine', 'Mixer', 'Separator'
+]
+
+
+def equipment_type_names(cardinality: int) -> List[str]:
+    """Return `cardinality` distinct equipment type names."""
+    if cardinality <= len(EQUIPMENT_TYPES):
+        return EQUIPMENT_TYPES[:cardinality]
+    return [f'Type {index:05d}' for index in range(cardinality)]
+
+
+# Non-numeric cell values written at `invalid_rate`
+INVALID_VALUES = ['abc', '#REF!', '12..5', 'high']
+
+
+def _damage(value, rng: random.Random, nan_rate: float, invalid_rate: float):
+    draw = rng.random()
+    if draw < nan_rate:
+        return ''
+    if draw < nan_rate + invalid_rate:
+        return rng.choice(INVALID_VALUES)
+    return value
+
+
+def write_equipment_csv(
+    path: str,
+    rows: int,
+    type_cardinality: int = 5,
+    seed: int = 0,
+    nan_rate: float = 0.0,
+    invalid_rate: float = 0.0
+) -> str:
+    """
+    Write a synthetic equipment CSV.
+    
+    Args:
+        path: Destination file path
+        rows: Number of data rows
+        type_cardinality: Number of distinct equipment types
+        seed: Random seed - the same arguments always produce the same file
+        nan_rate: Fraction of numeric cells left empty (read as NaN)
+        invalid_rate: Fraction of numeric cells holding non-numeric text,
+                      which validation rejects
+    
+    Returns:
+        The path written
+    """
+    rng = random.Random(seed)
+    types = equipment_type_names(type_cardinality)
+    damaged = nan_rate > 0 or invalid_rate > 0
+    
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Equipment Name', 'Type', 'Flowrate', 'Pressure', 'Temperature'])
+        
+        for index in range(rows):
+            equipment_type = rng.choice(types)
+            values = [
+                round(rng.uniform(50, 300), 2),
+                round(rng.uniform(1, 20), 2),
+                round(rng.uniform(20, 200), 2)
+            ]
+            if damaged:
+                values = [_damage(value, rng, nan_rate, invalid_rate) for value in values]
+            writer.writerow([f'{equipment_type}-{index:07d}', equipment_type, *values])
+    
+    return path
+
+
+def make_summary(type_cardinality: int, total: int = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Build a synthetic summary dict as produced by ``compute_summary_statistics``.
+    
+    Args:
+        type_cardinality: Number of entries in equipment_distribution
+        total: Total equipment count (defaults to 20 per type)
+        seed: Random seed
+    
+    Returns:
+        Summary dictionary including equipment_distribution
+    """
+    rng = random.Random(seed)
+    types = equipment_type_names(type_cardinality)
+    total = total or 20 * type_cardinality
+    
+    # Random split of `total` into one positive count per type
+    weights = [rng.random() + 0.1 for _ in types]
+    scale = total / sum(weights)
+    counts = [max(1, int(weight * scale)) for weight in weights]
+    
+    distribution = sorted(
+        ({'type': name, 'count': count} for name, count in zip(types, counts)),
+        key=lambda item: item['count'],
+        reverse=True
+    )
+    
+    return {
+        'total_equipment': sum(counts),
+        'average_flowrate': round(rng.uniform(50, 300), 2),
+        'average_pressure': round(rng.uniform(1, 20), 2),
+        'average_temperature': round(rng.uniform(20, 200), 2),
+        'equipment_distribution': distribution
+    }
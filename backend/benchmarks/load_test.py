@@ -0,0 +1,385 @@
+"""
+Whole-API Load Test
+
+Simulates N users against a local server. Each user registers (or logs
+in if the account exists), uploads a synthetic CSV, then until the run ends
+picks one of these actions, with a random think time between them:
+
+- upload:    POST /api/upload/ with one of --csv-files synthetic CSVs of --rows rows
+- dashboard: GET /api/dashboard/, revalidating with If-None-Match like the
+             desktop client
+- report:    GET /api/report/pdf/, also revalidated
+
+Users that get 429 wait for Retry-After like the desktop client does.
+Reports throughput and p50/p95/p99 latency per endpoint, error and 429
+rates, and the server's resident memory over time. RSS is the server
+process plus its children (report renderers), read from /proc, so it is
+Linux only.
+
+The seed fixes usernames, CSV contents and every user's sequence of actions
+and think times, so two runs with the same seed send the same requests.
+Timings and interleaving naturally differ.
+
+By default the server is started here, in a subprocess with a throwaway
+database, media directory and cache. db.sqlite3 and media/ are not
+touched. Pass --url to load an already running server, and --server-pid
+to sample its memory.
+
+Usage (from the backend directory):
+    python benchmarks/load_test.py [--users 20] [--duration 60] [--rows 5000]
+        [--mix upload=1,dashboard=6,report=1] [--think 1.0] [--seed 1]
+        [--server wsgi|asgi] [--server-threads 16] [--output load.json]
+    python benchmarks/load_test.py --url http://127.0.0.1:8000/api --server-pid 1234
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import signal
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+# Add backend to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Set Django settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+import django
+django.setup()
+
+import requests
+
+from benchmarks.datagen import write_equipment_csv
+
+
+ENDPOINTS = ['register', 'login', 'upload', 'dashboard', 'report']
+
+PASSWORD = 'LoadTest!Pass123'
+
+
+def parse_mix(value):
+    """Parse 'upload=1,dashboard=6,report=1' into action weights."""
+    mix = {}
+    for item in value.split(','):
+        action, _, weight = item.partition('=')
+        if action not in ('upload', 'dashboard', 'report'):
+            raise argparse.ArgumentTypeError(f'unknown action: {action}')
+        mix[action] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)]
+
+
+def _read_rss(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _children(pid):
+    children = []
+    try:
+        for task in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{task}/children') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _descendants(pid):
+    found, pending = [], _children(pid)
+    while pending:
+        child = pending.pop()
+        found.append(child)
+        pending.extend(_children(child))
+    return found
+
+
+def stop_process_tree(process):
+    """Terminate the server and its report renderers, which would otherwise linger."""
+    children = _descendants(process.pid)
+    process.terminate()
+    process.wait()
+    for child in children:
+        try:
+            os.kill(child, signal.SIGTERM)
+        except OSError:
+            pass
+
+
+def process_tree_rss(pid):
+    """Resident memory (bytes) of a process and all its descendants, or None."""
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            total += _read_rss(current)
+        except OSError:
+            if current == pid:
+                return None
+            continue
+        pending.extend(_children(current))
+    return total
+
+
+class Results:
+    """Latencies and outcomes per endpoint, shared by the user threads."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.rss = []
+    
+    def record(self, endpoint, elapsed_ms, outcome):
+        with self.lock:
+            self.latency[endpoint].append(elapsed_ms)
+            self.outcomes[endpoint][outcome] += 1
+
+
+class SimulatedUser:
+    """One user: authenticate, upload once, then a seeded random mix of actions."""
+    
+    def __init__(self, index, base_url, csv_files, results, args):
+        self.base_url = base_url
+        self.csv_files = csv_files
+        self.results = results
+        self.args = args
+        self.username = f'load_{args.seed}_{index}'
+        self.rng = random.Random(args.seed * 1_000_003 + index)
+        self.session = requests.Session()
+        self.etags = {}
+        self.deadline = None
+    
+    def _request(self, endpoint, method, path, ok=(200,), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', timeout=120, **kwargs)
+        except requests.RequestException:
+            self.results.record(endpoint, (time.perf_counter() - start) * 1000, 'error')
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        if response.status_code in ok:
+            outcome = 'ok'
+        elif response.status_code == 429:
+            outcome = 'throttled'
+        else:
+            outcome = 'error'
+        self.results.record(endpoint, elapsed, outcome)
+        
+        if response.status_code == 429:
+            # Back off like the desktop client, without outliving the run
+            delay = float(response.headers.get('Retry-After', 1))
+            time.sleep(max(min(delay * (1 + self.rng.random() * 0.5), self.deadline - time.monotonic()), 0))
+        return response
+    
+    def authenticate(self):
+        response = self._request('register', 'POST', '/auth/register/', ok=(201,), json={
+            'username': self.username,
+            'email': f'{self.username}@example.com',
+            'password': PASSWORD,
+            'password_confirm': PASSWORD
+        })
+        if response is None or response.status_code != 201:
+            # Existing account (e.g. a second run against the same server)
+            response = self._request('login', 'POST', '/auth/login/', json={
+                'username': self.username,
+                'password': PASSWORD
+            })
+        if response is None or response.status_code not in (200, 201):
+            return False
+        self.session.headers['Authorization'] = f"Token {response.json()['token']}"
+        return True
+    
+    def upload(self):
+        path = self.csv_files[self.rng.randrange(len(self.csv_files))]
+        with open(path, 'rb') as f:
+            self._request('upload', 'POST', '/upload/', ok=(201,), files={
+                'file': (os.path.basename(path), f, 'text/csv')
+            })
+    
+    def conditional_get(self, endpoint, path):
+        headers = {'If-None-Match': self.etags[path]} if path in self.etags else {}
+        response = self._request(endpoint, 'GET', path, ok=(200, 304), headers=headers)
+        if response is not None and response.status_code == 200 and response.headers.get('ETag'):
+            self.etags[path] = response.headers['ETag']
+    
+    def run(self, start_at, deadline):
+        self.deadline = deadline
+        time.sleep(max(start_at - time.monotonic(), 0))
+        if not self.authenticate():
+            return
+        self.upload()
+        
+        actions = list(self.args.mix)
+        weights = [self.args.mix[action] for action in actions]
+        while time.monotonic() < deadline:
+            action = self.rng.choices(actions, weights)[0]
+            think = self.rng.expovariate(1 / self.args.think) if self.args.think > 0 else 0
+            if action == 'upload':
+                self.upload()
+            elif action == 'dashboard':
+                self.conditional_get('dashboard', '/dashboard/')
+            else:
+                self.conditional_get('report', '/report/pdf/')
+            time.sleep(max(min(think, deadline - time.monotonic()), 0))
+
+
+def sample_rss(pid, interval, stop, results, started):
+    while not stop.is_set():
+        rss = process_tree_rss(pid)
+        if rss is not None:
+            with results.lock:
+                results.rss.append((round(time.monotonic() - started, 2), rss))
+        stop.wait(interval)
+
+
+def summarize(results, elapsed):
+    summary = {}
+    for endpoint in ENDPOINTS:
+        latency = sorted(results.latency.get(endpoint, []))
+        if not latency:
+            continue
+        outcomes = results.outcomes[endpoint]
+        count = len(latency)
+        summary[endpoint] = {
+            'requests': count,
+            'rps': round(count / elapsed, 2),
+            'p50_ms': round(percentile(latency, 50), 1),
+            'p95_ms': round(percentile(latency, 95), 1),
+            'p99_ms': round(percentile(latency, 99), 1),
+            'mean_ms': round(statistics.fmean(latency), 1),
+            'error_rate': round(outcomes['error'] / count, 4),
+            'throttled_rate': round(outcomes['throttled'] / count, 4),
+        }
+    return summary
+
+
+def start_local_server(args, workdir):
+    """Migrate a throwaway database and serve it from a subprocess."""
+    from django.core.management import call_command
+    from django.db import connections
+    from benchmarks.bench_asgi import configure, start_server
+    
+    configure(workdir)
+    call_command('migrate', verbosity=0)
+    connections.close_all()
+    process, port = start_server(args.server, workdir, args.server_threads)
+    return process, f'http://127.0.0.1:{port}/api'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=60, help='Seconds of load after ramp-up starts')
+    parser.add_argument('--ramp', type=float, default=5, help='Seconds over which users start')
+    parser.add_argument('--rows', type=int, default=5000, help='Rows per synthetic CSV')
+    parser.add_argument('--types', type=int, default=10, help='Equipment types per CSV')
+    parser.add_argument('--csv-files', type=int, default=4, help='Distinct CSVs users pick from')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('upload=1,dashboard=6,report=1'))
+    parser.add_argument('--think', type=float, default=1.0, help='Mean think time between actions (s)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi')
+    parser.add_argument('--server-threads', type=int, default=16)
+    parser.add_argument('--url', help='Load an already running server (API base URL)')
+    parser.add_argument('--server-pid', type=int, help='PID of the --url server, for RSS sampling')
+    parser.add_argument('--rss-interval', type=float, default=1.0)
+    parser.add_argument('--output', help='Write the configuration, results and RSS samples as JSON')
+    args = parser.parse_args()
+    
+    workdir = tempfile.mkdtemp(prefix='load_test_')
+    process = None
+    try:
+        csv_files = [
+            write_equipment_csv(
+                os.path.join(workdir, f'load_{index}.csv'), args.rows,
+                type_cardinality=args.types, seed=args.seed * 1000 + index
+            )
+            for index in range(args.csv_files)
+        ]
+        
+        if args.url:
+            base_url, pid = args.url.rstrip('/'), args.server_pid
+        else:
+            process, base_url = start_local_server(args, workdir)
+            pid = process.pid
+        
+        results = Results()
+        started = time.monotonic()
+        deadline = started + args.duration
+        users = [SimulatedUser(index, base_url, csv_files, results, args) for index in range(args.users)]
+        threads = [
+            threading.Thread(target=user.run, args=(started + args.ramp * index / args.users, deadline))
+            for index, user in enumerate(users)
+        ]
+        
+        stop = threading.Event()
+        sampler = None
+        if pid:
+            sampler = threading.Thread(target=sample_rss, args=(pid, args.rss_interval, stop, results, started))
+            sampler.start()
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        stop.set()
+        if sampler:
+            sampler.join()
+    finally:
+        if process is not None:
+            stop_process_tree(process)
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    summary = summarize(results, elapsed)
+    mix = ', '.join(f'{action}={weight:g}' for action, weight in args.mix.items())
+    print(f"{args.users} users, {elapsed:.0f}s, {args.rows} rows/CSV, mix {mix}, "
+          f"think {args.think:g}s, seed {args.seed}, server {args.url or args.server}")
+    print(f"{'endpoint':<10} {'requests':>8} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7} {'429s':>7}")
+    for endpoint, row in summary.items():
+        print(
+            f"{endpoint:<10} {row['requests']:>8} {row['rps']:>7.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['error_rate']:>7.1%} "
+            f"{row['throttled_rate']:>7.1%}"
+        )
+    
+    if results.rss:
+        values = [rss / 2**20 for _, rss in results.rss]
+        step = max(len(values) // 12, 1)
+        timeline = ' '.join(f'{value:.0f}' for value in values[::step])
+        print(f"server RSS MB: start {values[0]:.0f}, peak {max(values):.0f}, end {values[-1]:.0f}")
+        print(f"  every {step * args.rss_interval:g}s: {timeline}")
+    
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key != 'output'}
+        with open(args.output, 'w') as f:
+            json.dump({
+                'config': config,
+                'elapsed_seconds': round(elapsed, 2),
+                'endpoints': summary,
+                'rss_bytes': results.rss,
+            }, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,113 @@ API Client for PyQt5 Desktop Application
 
 Centralized backend communication module.
 Handles authentication and all data operations.
+
+When msgpack is installed, responses are requested as MessagePack
+(``Accept: application/msgpack``), which is smaller and faster to decode
+than JSON; servers without MessagePack support answer with JSON.
+
+Requests the server rejects as busy (429/503) are retried after the
+``Retry-After`` delay plus random jitter, so clients turned away together do
+not all come back at the same moment.
 """
 
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
+from urllib.parse import urlencode
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+# Status codes meaning "busy, try again later"
+RETRY_STATUS_CODES = (429, 503)
+
+# Backoff (seconds) when a busy response has no Retry-After header:
+# a random delay up to RETRY_BACKOFF_BASE * 2**attempt, capped
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 30.0
+
+# Extra random delay added to Retry-After, as a fraction of it
+RETRY_JITTER = 0.5
+
+# Extension type the backend uses for numeric arrays: a packed
+# [dtype, shape, data] list with little-endian, C-ordered array bytes
+NUMPY_ARRAY_EXT = 1
+
+
+def _msgpack_ext_hook(code: int, payload: bytes):
+    """Decode backend extension values (numeric arrays)."""
+    if code != NUMPY_ARRAY_EXT:
+        return msgpack.ExtType(code, payload)
+    
+    dtype, shape, data = msgpack.unpackb(payload)
+    if np is not None:
+        return np.frombuffer(data, dtype=dtype).reshape(shape)
+    
+    # Without NumPy: nested lists (dtype is e.g. "<f8", "<i4", "|u1")
+    if sys.byteorder != 'little' and dtype[0] == '<':
+        raise ValueError(f'Cannot decode little-endian array on a {sys.byteorder}-endian host')
+    kind, size = dtype[1], int(dtype[2:])
+    formats = {'f': {4: 'f', 8: 'd'}, 'i': {1: 'b', 2: 'h', 4: 'i', 8: 'q'},
+               'u': {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}, 'b': {1: '?'}}
+    return memoryview(data).cast(formats[kind][size], shape).tolist()
+
+
+def decode_response(response: requests.Response) -> Any:
+    """
+    Decode an API response body, JSON or MessagePack.
+    
+    Raises:
+        ValueError: If the body is not valid JSON/MessagePack
+    """
+    content_type = response.headers.get('Content-Type', '')
+    if content_type.startswith(MSGPACK_MEDIA_TYPE) and msgpack is not None:
+        return msgpack.unpackb(response.content, ext_hook=_msgpack_ext_hook, strict_map_key=False)
+    return response.json()
+
+
+def retry_delay(response: requests.Response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a busy (429/503) response.
+    
+    Honors Retry-After (seconds or an HTTP date) and adds up to
+    RETRY_JITTER of it at random. Without the header, uses exponential
+    backoff with full jitter.
+    
+    Args:
+        response: The rejected response
+        attempt: Number of retries already made (0 for the first)
+    """
+    retry_after = response.headers.get('Retry-After')
+    seconds = None
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                seconds = None
+    
+    if seconds is None:
+        return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** attempt))
+    seconds = max(seconds, 0.0)
+    return seconds + random.uniform(0, seconds * RETRY_JITTER)
 
 
 class APIClient:
@@ -14,26 +117,112 @@ class APIClient:
     Client for IIT Bombay Analytics Backend API.
     
     Thread-safe for use with PyQt5 threading.
+    
+    GET responses that carry an ETag are cached per URL; later requests send
+    If-None-Match and reuse the cached copy when the server answers 304.
+    
+    Uploads, data requests and report downloads answered with 429/503 are
+    retried up to ``max_retries`` times (see ``retry_delay``). Retries sleep
+    in the calling thread, so GUI code calls the client from worker threads.
     """
     
-    def __init__(self, base_url: str = "http://localhost:8000/api"):
+    def __init__(self, base_url: str = "http://localhost:8000/api",
+                 use_msgpack: bool = True, max_retries: int = 4,
+                 max_retry_wait: float = 60.0):
         """
         Initialize API client.
         
         Args:
             base_url: Backend API base URL
+            use_msgpack: Request MessagePack responses (if msgpack is installed)
+            max_retries: Retries of a busy (429/503) response before giving up
+            max_retry_wait: Give up instead of waiting longer than this
+                            many seconds for one retry
         """
         self.base_url = base_url
+        self.use_msgpack = use_msgpack and msgpack is not None
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
         self.token: Optional[str] = None
         self.username: Optional[str] = None
+        self._response_cache: Dict[str, requests.Response] = {}
+        self._dashboard_supported: Optional[bool] = None
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get request headers with authentication token."""
+    def _get_headers(self, authenticated: bool = True) -> Dict[str, str]:
+        """Get request headers (Accept, and the authentication token)."""
         headers = {}
-        if self.token:
+        if self.use_msgpack:
+            # DRF ranks media types by specificity, not q, so the JSON
+            # fallback for servers without MessagePack must be less specific
+            headers['Accept'] = f'{MSGPACK_MEDIA_TYPE}, application/*;q=0.9'
+        if authenticated and self.token:
             headers['Authorization'] = f'Token {self.token}'
         return headers
     
+    def _send(self, method: str, url: str,
+              on_retry: Optional[Callable[[int, float], None]] = None,
+              rewind: Optional[Callable[[], None]] = None,
+              **kwargs) -> requests.Response:
+        """
+        Send a request, retrying while the server answers 429/503.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            on_retry: Called with (retry number, delay in seconds) before
+                      each wait
+            rewind: Called before each retry to reset a file body
+            **kwargs: Passed to ``requests.request``
+            
+        Returns:
+            The first response that is not a busy response, or the last
+            busy response when retries run out
+        """
+        for attempt in range(self.max_retries + 1):
+            response = requests.request(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            
+            delay = retry_delay(response, attempt)
+            if delay > self.max_retry_wait:
+                return response
+            if on_retry is not None:
+                on_retry(attempt + 1, delay)
+            time.sleep(delay)
+            if rewind is not None:
+                rewind()
+        
+        return response
+    
+    def _conditional_get(self, url: str,
+                         on_retry: Optional[Callable[[int, float], None]] = None) -> requests.Response:
+        """
+        GET a URL, revalidating any cached copy with its ETag.
+        
+        Args:
+            url: Absolute URL to fetch
+            on_retry: Passed to ``_send``
+            
+        Returns:
+            The fresh response, or the cached one if the server answered 304
+        """
+        headers = self._get_headers()
+        cached = self._response_cache.get(url)
+        if cached is not None:
+            headers['If-None-Match'] = cached.headers['ETag']
+        
+        response = self._send('GET', url, headers=headers, on_retry=on_retry)
+        
+        if response.status_code == 304 and cached is not None:
+            return cached
+        
+        if response.status_code == 200 and response.headers.get('ETag'):
+            self._response_cache[url] = response
+        else:
+            self._response_cache.pop(url, None)
+        
+        return response
+    
     # ================================
     # Authentication Methods
     # ================================
@@ -53,15 +242,16 @@ class APIClient:
             requests.HTTPError: If login fails
         """
         url = f"{self.base_url}/auth/login/"
-        response = requests.post(url, json={
+        response = requests.post(url, headers=self._get_headers(authenticated=False), json={
             'username': username,
             'password': password
         })
         
         if response.status_code == 200:
-            data = response.json()
+            data = decode_response(response)
             self.token = data['token']
             self.username = data['user']['username']
+            self._response_cache.clear()
             return data
         else:
             response.raise_for_status()
@@ -82,7 +272,8 @@ class APIClient:
         if response.status_code == 200:
             self.token = None
             self.username = None
-            return response.json()
+            self._response_cache.clear()
+            return decode_response(response)
         else:
             response.raise_for_status()
     
@@ -104,7 +295,7 @@ class APIClient:
             requests.HTTPError: If registration fails
         """
         url = f"{self.base_url}/auth/register/"
-        response = requests.post(url, json={
+        response = requests.post(url, headers=self._get_headers(authenticated=False), json={
             'username': username,
             'email': email,
             'password': password,
@@ -112,9 +303,10 @@ class APIClient:
         })
         
         if response.status_code == 201:
-            data = response.json()
+            data = decode_response(response)
             self.token = data['token']
             self.username = data['user']['username']
+            self._response_cache.clear()
             return data
         else:
             response.raise_for_status()
@@ -123,12 +315,15 @@ class APIClient:
     # Data Methods
     # ================================
     
-    def upload_csv(self, file_path: str) -> Dict[str, Any]:
+    def upload_csv(self, file_path: str,
+                   on_retry: Optional[Callable[[int, float], None]] = None) -> Dict[str, Any]:
         """
         Upload CSV file to backend.
         
         Args:
             file_path: Path to CSV file
+            on_retry: Called with (retry number, delay in seconds) when the
+                      server is busy and the upload will be retried
             
         Returns:
             Response data with upload confirmation and summary
@@ -140,14 +335,17 @@ class APIClient:
         
         with open(file_path, 'rb') as f:
             files = {'file': f}
-            response = requests.post(
+            response = self._send(
+                'POST',
                 url, 
                 files=files, 
-                headers=self._get_headers()
+                headers=self._get_headers(),
+                on_retry=on_retry,
+                rewind=lambda: f.seek(0)
             )
         
         if response.status_code == 201:
-            return response.json()
+            return decode_response(response)
         else:
             response.raise_for_status()
     
@@ -162,10 +360,10 @@ class APIClient:
             requests.HTTPError: If request fails
         """
         url = f"{self.base_url}/summary/"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._conditional_get(url)
         
         if response.status_code == 200:
-            return response.json()
+            return decode_response(response)
         else:
             response.raise_for_status()
     
@@ -180,17 +378,17 @@ class APIClient:
             requests.HTTPError: If request fails
         """
         url = f"{self.base_url}/distribution/"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._conditional_get(url)
         
         if response.status_code == 200:
-            data = response.json()
+            data = decode_response(response)
             return data.get('distribution', [])
         else:
             response.raise_for_status()
     
     def get_history(self) -> List[Dict[str, Any]]:
         """
-        Get upload history.
+        Get the first page of upload history (newest first).
         
         Returns:
             List of past uploads
@@ -198,21 +396,100 @@ class APIClient:
         Raises:
             requests.HTTPError: If request fails
         """
+        return self.get_history_page()['history']
+    
+    def get_history_page(self, cursor: Optional[str] = None,
+                         page_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get one page of upload history.
+        
+        Args:
+            cursor: next_cursor from the previous page (None for the first page)
+            page_size: Uploads per page (server default if None)
+            
+        Returns:
+            Dict with 'history' (list of uploads) and 'next_cursor'
+            (None when there are no more pages)
+            
+        Raises:
+            requests.HTTPError: If request fails
+        """
+        params = {}
+        if cursor:
+            params['cursor'] = cursor
+        if page_size:
+            params['page_size'] = page_size
+        
         url = f"{self.base_url}/history/"
-        response = requests.get(url, headers=self._get_headers())
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        response = self._conditional_get(url)
         
         if response.status_code == 200:
-            data = response.json()
-            return data.get('history', [])
+            data = decode_response(response)
+            return {
+                'history': data.get('history', []),
+                'next_cursor': data.get('next_cursor')
+            }
         else:
             response.raise_for_status()
     
-    def download_report(self, save_path: str) -> bool:
+    def get_dashboard(self) -> Dict[str, Any]:
+        """
+        Get summary, distribution and history together.
+        
+        Uses the combined /dashboard/ endpoint (one round trip) when the
+        server supports it, otherwise falls back to three separate requests.
+        
+        Returns:
+            Dict with 'summary', 'distribution', 'history' (first page) and
+            'history_next_cursor' keys
+            
+        Raises:
+            requests.HTTPError: If request fails
+        """
+        if self._dashboard_supported is not False:
+            url = f"{self.base_url}/dashboard/"
+            response = self._conditional_get(url)
+            
+            if response.status_code == 200:
+                self._dashboard_supported = True
+                dashboard = decode_response(response)
+                dashboard.setdefault('history_next_cursor', None)
+                return dashboard
+            
+            # A JSON 404 means "no datasets"; anything else means an older
+            # server without the endpoint
+            if response.status_code == 404 and not self._is_api_error(response):
+                self._dashboard_supported = False
+            else:
+                response.raise_for_status()
+        
+        history = self.get_history_page()
+        return {
+            'summary': self.get_summary(),
+            'distribution': self.get_distribution(),
+            'history': history['history'],
+            'history_next_cursor': history['next_cursor']
+        }
+    
+    @staticmethod
+    def _is_api_error(response: requests.Response) -> bool:
+        """Check whether a response is a JSON error produced by the API."""
+        try:
+            return 'error' in decode_response(response)
+        except ValueError:
+            return False
+    
+    def download_report(self, save_path: str,
+                        on_retry: Optional[Callable[[int, float], None]] = None) -> bool:
         """
         Download PDF analytics report.
         
         Args:
             save_path: Path where the PDF should be saved
+            on_retry: Called with (retry number, delay in seconds) when the
+                      server is busy and the download will be retried
             
         Returns:
             True if successful
@@ -221,7 +498,7 @@ class APIClient:
             requests.HTTPError: If request fails
         """
         url = f"{self.base_url}/report/pdf/"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._conditional_get(url, on_retry=on_retry)
         
         if response.status_code == 200:
             with open(save_path, 'wb') as f:
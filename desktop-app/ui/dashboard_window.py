@@ -18,18 +18,26 @@ from matplotlib.figure import Figure
 import requests
 from datetime import datetime
 
+from api_client import decode_response
+
 
 class UploadWorker(QThread):
     """
     Background worker for CSV upload to prevent UI freezing.
     
+    If the server is busy (429/503) the upload is retried after its
+    Retry-After delay plus jitter (see ``APIClient.upload_csv``).
+    
     Signals:
         upload_complete: Emitted when upload succeeds
         upload_error: Emitted when upload fails with error message
+        upload_retrying: Emitted with (retry number, delay in seconds)
+                         before waiting to retry a busy response
     """
     
     upload_complete = pyqtSignal()
     upload_error = pyqtSignal(str)
+    upload_retrying = pyqtSignal(int, float)
     
     def __init__(self, api_client, file_path):
         super().__init__()
@@ -39,13 +47,13 @@ class UploadWorker(QThread):
     def run(self):
         """Execute upload in background thread."""
         try:
-            self.api_client.upload_csv(self.file_path)
+            self.api_client.upload_csv(self.file_path, on_retry=self.upload_retrying.emit)
             self.upload_complete.emit()
         except requests.HTTPError as e:
             error_msg = 'Upload failed'
             if e.response is not None:
                 try:
-                    error_data = e.response.json()
+                    error_data = decode_response(e.response)
                     error_msg = error_data.get('error', error_data.get('details', error_msg))
                 except:
                     error_msg = f'Upload failed: {e.response.status_code}'
@@ -54,6 +62,109 @@ class UploadWorker(QThread):
             self.upload_error.emit(f'Upload error: {str(e)}')
 
 
+class DashboardWorker(QThread):
+    """
+    Background worker that loads summary, distribution and history.
+    
+    Signals:
+        dashboard_loaded: Emitted with the dashboard dict (see
+                          ``APIClient.get_dashboard``)
+        dashboard_empty: Emitted when the user has no datasets yet
+        dashboard_error: Emitted when the request fails with error message
+    """
+    
+    dashboard_loaded = pyqtSignal(dict)
+    dashboard_empty = pyqtSignal()
+    dashboard_error = pyqtSignal(str)
+    
+    def __init__(self, api_client):
+        super().__init__()
+        self.api_client = api_client
+    
+    def run(self):
+        """Fetch the dashboard in background thread."""
+        try:
+            self.dashboard_loaded.emit(self.api_client.get_dashboard())
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                self.dashboard_empty.emit()
+            else:
+                self.dashboard_error.emit(f'Failed to load data: {str(e)}')
+        except Exception as e:
+            self.dashboard_error.emit(f'Failed to load data: {str(e)}')
+
+
+class ReportDownloadWorker(QThread):
+    """
+    Background worker that downloads the PDF report.
+    
+    Like ``UploadWorker``, waits out busy (429/503) responses without
+    freezing the UI.
+    
+    Signals:
+        download_complete: Emitted with the saved file path
+        download_error: Emitted when the download fails with error message
+        download_retrying: Emitted with (retry number, delay in seconds)
+                           before waiting to retry a busy response
+    """
+    
+    download_complete = pyqtSignal(str)
+    download_error = pyqtSignal(str)
+    download_retrying = pyqtSignal(int, float)
+    
+    def __init__(self, api_client, file_path):
+        super().__init__()
+        self.api_client = api_client
+        self.file_path = file_path
+    
+    def run(self):
+        """Download the report in background thread."""
+        try:
+            self.api_client.download_report(self.file_path, on_retry=self.download_retrying.emit)
+            self.download_complete.emit(self.file_path)
+        except requests.HTTPError as e:
+            error_msg = 'Download failed'
+            if e.response is not None:
+                if e.response.status_code == 404:
+                    error_msg = 'No data available. Please upload a dataset first.'
+                else:
+                    try:
+                        error_data = decode_response(e.response)
+                        error_msg = error_data.get('error', error_data.get('details', error_msg))
+                    except:
+                        error_msg = f'Download failed: {e.response.status_code}'
+            self.download_error.emit(str(error_msg))
+        except Exception as e:
+            self.download_error.emit(f'Failed to download report: {str(e)}')
+
+
+class HistoryPageWorker(QThread):
+    """
+    Background worker that fetches the next page of upload history.
+    
+    Signals:
+        page_loaded: Emitted with {'history': [...], 'next_cursor': ...}
+        page_error: Emitted when the request fails with error message
+    """
+    
+    page_loaded = pyqtSignal(dict)
+    page_error = pyqtSignal(str)
+    
+    def __init__(self, api_client, cursor):
+        super().__init__()
+        self.api_client = api_client
+        self.cursor = cursor
+        self.failed = False
+    
+    def run(self):
+        """Fetch the page in background thread."""
+        try:
+            self.page_loaded.emit(self.api_client.get_history_page(self.cursor))
+        except Exception as e:
+            self.failed = True
+            self.page_error.emit(f'Failed to load history: {str(e)}')
+
+
 class DashboardWindow(QMainWindow):
     """
     Main dashboard window with analytics and visualization.
@@ -71,6 +182,11 @@ class DashboardWindow(QMainWindow):
         self.api_client = api_client
         self.username = username
         self.upload_worker = None
+        self.dashboard_worker = None
+        self.dashboard_reload_pending = False
+        self.report_worker = None
+        self.history_worker = None
+        self.history_next_cursor = None
         self.init_ui()
         self.load_data()
     
@@ -132,9 +248,9 @@ class DashboardWindow(QMainWindow):
         header.addWidget(user_label)
         
         # Download report button
-        download_btn = QPushButton('Download Report (PDF)')
-        download_btn.clicked.connect(self.download_report)
-        download_btn.setStyleSheet("""
+        self.download_btn = QPushButton('Download Report (PDF)')
+        self.download_btn.clicked.connect(self.download_report)
+        self.download_btn.setStyleSheet("""
             QPushButton {
                 background-color: #2196F3;
                 color: white;
@@ -147,7 +263,7 @@ class DashboardWindow(QMainWindow):
                 background-color: #1976D2;
             }
         """)
-        header.addWidget(download_btn)
+        header.addWidget(self.download_btn)
         
         logout_btn = QPushButton('Logout')
         logout_btn.clicked.connect(self.handle_logout)
@@ -224,7 +340,7 @@ class DashboardWindow(QMainWindow):
         layout.addWidget(summary_group)
         
         # History section
-        history_group = QGroupBox('Upload History (Last 5)')
+        history_group = QGroupBox('Upload History')
         history_layout = QVBoxLayout()
         
         self.history_table = QTableWidget()
@@ -232,6 +348,8 @@ class DashboardWindow(QMainWindow):
         self.history_table.setHorizontalHeaderLabels(['Upload ID', 'Uploaded At'])
         self.history_table.horizontalHeader().setStretchLastSection(True)
         self.history_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Fetch older uploads page by page as the table is scrolled
+        self.history_table.verticalScrollBar().valueChanged.connect(self.on_history_scrolled)
         history_layout.addWidget(self.history_table)
         
         history_group.setLayout(history_layout)
@@ -286,6 +404,7 @@ class DashboardWindow(QMainWindow):
         self.upload_worker = UploadWorker(self.api_client, self.selected_file_path)
         self.upload_worker.upload_complete.connect(self.on_upload_success)
         self.upload_worker.upload_error.connect(self.on_upload_error)
+        self.upload_worker.upload_retrying.connect(self.on_upload_retrying)
         self.upload_worker.start()
     
     def on_upload_success(self):
@@ -298,6 +417,13 @@ class DashboardWindow(QMainWindow):
         
         QMessageBox.information(self, 'Success', 'Dataset uploaded successfully!')
     
+    def on_upload_retrying(self, attempt, delay):
+        """Show that a busy server is making the upload wait."""
+        self.statusBar().showMessage(
+            f'Server busy, retrying upload in {delay:.0f}s (attempt {attempt + 1})',
+            int(delay * 1000) + 1000
+        )
+    
     def on_upload_error(self, error_msg):
         """Handle upload error."""
         self.upload_btn.setEnabled(True)
@@ -306,24 +432,37 @@ class DashboardWindow(QMainWindow):
         QMessageBox.critical(self, 'Upload Error', error_msg)
     
     def load_data(self):
-        """Load all dashboard data from backend."""
-        try:
-            # Load summary
-            summary = self.api_client.get_summary()
-            self.display_summary(summary)
-            
-            # Load distribution
-            distribution = self.api_client.get_distribution()
-            self.display_distribution(distribution)
-            
-            # Load history
-            history = self.api_client.get_history()
-            self.display_history(history)
-            
-        except requests.HTTPError as e:
-            # Silently handle "no datasets" error
-            if e.response is not None and e.response.status_code == 404:
-                self.clear_displays()
+        """Load all dashboard data from backend in a worker thread."""
+        if self.dashboard_worker is not None:
+            # Reload once the running request finishes, so new data is shown
+            self.dashboard_reload_pending = True
+            return
+        
+        # Summary, distribution and history in one round trip
+        self.dashboard_worker = DashboardWorker(self.api_client)
+        self.dashboard_worker.dashboard_loaded.connect(self.on_dashboard_loaded)
+        self.dashboard_worker.dashboard_empty.connect(self.clear_displays)
+        self.dashboard_worker.dashboard_error.connect(self.on_dashboard_error)
+        self.dashboard_worker.finished.connect(self.on_dashboard_worker_finished)
+        self.dashboard_worker.start()
+    
+    def on_dashboard_loaded(self, dashboard):
+        """Display a fetched dashboard."""
+        self.display_summary(dashboard['summary'])
+        self.display_distribution(dashboard['distribution'])
+        self.display_history(dashboard['history'], dashboard.get('history_next_cursor'))
+    
+    def on_dashboard_error(self, error_msg):
+        """Report a failed dashboard request."""
+        self.statusBar().showMessage(error_msg, 5000)
+    
+    def on_dashboard_worker_finished(self):
+        """Drop the dashboard worker once its thread has stopped."""
+        self.dashboard_worker.deleteLater()
+        self.dashboard_worker = None
+        if self.dashboard_reload_pending:
+            self.dashboard_reload_pending = False
+            self.load_data()
     
     def display_summary(self, summary):
         """Display summary statistics in table."""
@@ -365,11 +504,21 @@ class DashboardWindow(QMainWindow):
         self.figure.tight_layout()
         self.canvas.draw()
     
-    def display_history(self, history):
-        """Display upload history in table."""
-        self.history_table.setRowCount(len(history))
+    def display_history(self, history, next_cursor=None, append=False):
+        """
+        Display upload history in table.
         
-        for row, item in enumerate(history):
+        Args:
+            history: Uploads to show, newest first
+            next_cursor: Cursor for the next (older) page, if any
+            append: Add rows below the existing ones instead of replacing them
+        """
+        first_row = self.history_table.rowCount() if append else 0
+        self.history_table.setRowCount(first_row + len(history))
+        self.history_next_cursor = next_cursor
+        
+        for offset, item in enumerate(history):
+            row = first_row + offset
             upload_id = str(item.get('id', ''))
             uploaded_at = item.get('uploaded_at', '')
             
@@ -382,49 +531,104 @@ class DashboardWindow(QMainWindow):
             
             self.history_table.setItem(row, 0, QTableWidgetItem(upload_id))
             self.history_table.setItem(row, 1, QTableWidgetItem(uploaded_at))
+        
+        # Keep loading while the table is not yet scrollable
+        self.on_history_scrolled(self.history_table.verticalScrollBar().value())
+    
+    def on_history_scrolled(self, value):
+        """Load the next history page when the table is scrolled to the bottom."""
+        scroll_bar = self.history_table.verticalScrollBar()
+        if (
+            self.history_next_cursor
+            and self.history_worker is None
+            and value >= scroll_bar.maximum() - 1
+        ):
+            self.history_worker = HistoryPageWorker(self.api_client, self.history_next_cursor)
+            self.history_worker.page_loaded.connect(self.on_history_page_loaded)
+            self.history_worker.page_error.connect(self.on_history_page_error)
+            self.history_worker.finished.connect(self.on_history_worker_finished)
+            self.history_worker.start()
+    
+    def on_history_page_loaded(self, page):
+        """Append a fetched history page."""
+        if self.history_worker.cursor != self.history_next_cursor:
+            return  # The table was reloaded while this page was in flight
+        self.display_history(page['history'], page.get('next_cursor'), append=True)
+    
+    def on_history_page_error(self, error_msg):
+        """Stop paging after a failed history request."""
+        self.statusBar().showMessage(error_msg, 5000)
+    
+    def on_history_worker_finished(self):
+        """
+        Drop the history worker once its thread has stopped.
+        
+        The reference is kept until ``finished`` so the QThread is never
+        destroyed while ``run()`` is still returning. Paging resumes unless
+        the request failed (the next scroll retries it).
+        """
+        worker, self.history_worker = self.history_worker, None
+        worker.deleteLater()
+        if not worker.failed:
+            self.on_history_scrolled(self.history_table.verticalScrollBar().value())
     
     def clear_displays(self):
         """Clear all displays when no data available."""
         self.summary_table.setRowCount(0)
         self.history_table.setRowCount(0)
+        self.history_next_cursor = None
         self.figure.clear()
         self.canvas.draw()
     
     def download_report(self):
         """Handle PDF report download."""
-        try:
-            # Ask user where to save
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                'Save PDF Report',
-                'equipment_analytics_report.pdf',
-                'PDF Files (*.pdf)'
-            )
-            
-            if file_path:
-                # Download report
-                self.api_client.download_report(file_path)
-                QMessageBox.information(
-                    self, 
-                    'Success', 
-                    f'Report downloaded successfully to:\n{file_path}'
-                )
+        if self.report_worker is not None:
+            return
         
-        except requests.HTTPError as e:
-            error_msg = 'Download failed'
-            if e.response is not None:
-                if e.response.status_code == 404:
-                    error_msg = 'No data available. Please upload a dataset first.'
-                else:
-                    try:
-                        error_data = e.response.json()
-                        error_msg = error_data.get('error', error_data.get('details', error_msg))
-                    except:
-                        error_msg = f'Download failed: {e.response.status_code}'
-            QMessageBox.critical(self, 'Download Error', error_msg)
+        # Ask user where to save
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            'Save PDF Report',
+            'equipment_analytics_report.pdf',
+            'PDF Files (*.pdf)'
+        )
         
-        except Exception as e:
-            QMessageBox.critical(self, 'Download Error', f'Failed to download report: {str(e)}')
+        if file_path:
+            # Download report in a worker thread
+            self.download_btn.setEnabled(False)
+            self.download_btn.setText('Downloading...')
+            self.report_worker = ReportDownloadWorker(self.api_client, file_path)
+            self.report_worker.download_complete.connect(self.on_download_success)
+            self.report_worker.download_error.connect(self.on_download_error)
+            self.report_worker.download_retrying.connect(self.on_download_retrying)
+            self.report_worker.finished.connect(self.on_report_worker_finished)
+            self.report_worker.start()
+    
+    def on_download_success(self, file_path):
+        """Handle successful report download."""
+        QMessageBox.information(
+            self, 
+            'Success', 
+            f'Report downloaded successfully to:\n{file_path}'
+        )
+    
+    def on_download_retrying(self, attempt, delay):
+        """Show that a busy server is making the download wait."""
+        self.statusBar().showMessage(
+            f'Server busy, retrying report download in {delay:.0f}s (attempt {attempt + 1})',
+            int(delay * 1000) + 1000
+        )
+    
+    def on_download_error(self, error_msg):
+        """Handle report download error."""
+        QMessageBox.critical(self, 'Download Error', error_msg)
+    
+    def on_report_worker_finished(self):
+        """Drop the download worker once its thread has stopped."""
+        self.report_worker.deleteLater()
+        self.report_worker = None
+        self.download_btn.setEnabled(True)
+        self.download_btn.setText('Download Report (PDF)')
     
     def handle_logout(self):
         """Handle logout button click."""
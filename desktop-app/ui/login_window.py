@@ -12,6 +12,8 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 import requests
 
+from api_client import decode_response
+
 
 class LoginWindow(QWidget):
     """
@@ -164,7 +166,7 @@ class LoginWindow(QWidget):
             error_msg = 'Login failed'
             if e.response is not None:
                 try:
-                    error_data = e.response.json()
+                    error_data = decode_response(e.response)
                     error_msg = error_data.get('error', error_data.get('details', error_msg))
                 except:
                     error_msg = f'Login failed: {e.response.status_code}'